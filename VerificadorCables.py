@@ -1,15 +1,395 @@
 import os
 import re
+import shutil
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, filedialog
 import pandas as pd
-from datetime import datetime
-from collections import defaultdict
+from datetime import datetime, timedelta
+from collections import defaultdict, OrderedDict
+import csv
 import json
 import sqlite3
+import socket
+import threading
+import time
+import argparse
+import queue
+import struct
+import tempfile
+import multiprocessing
+from typing import NamedTuple
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, TimeoutError as TiempoAgotadoError
+import http.client
+import http.server
+from urllib.parse import urlparse, parse_qs
+
+# Almacenamiento compartido entre estaciones (servidor local de verificaciones)
+PUERTO_SERVIDOR_DEFECTO = 8765
+TAM_LOTE_ENVIO = 100 # Registros por POST al servidor
+INTERVALO_ENVIO_SEG = 5 # Espera entre intentos de envío de la cola pendiente
+
+# API HTTP local de verificación (MES / control de línea)
+PUERTO_API_DEFECTO = 8766
+HILOS_API = 4 # Verificaciones simultáneas como máximo
+MAX_PENDIENTES_API = 32 # Solicitudes admitidas (en curso + en espera); el resto recibe 503
+MAX_LOTE_API = 500 # Series por solicitud de lote
+TIMEOUT_API_SEG = 60
+
+# Reproducción de turnos (generador de carga a partir del historial)
+HORAS_TURNO_REPRODUCCION = 8 # Por defecto: las últimas 8 horas del historial
+
+# Exportación masiva de registros
+FORMATOS_EXPORTACION = ('csv', 'xlsx', 'jsonl')
+COLUMNAS_EXPORTACION = ("id", "entry_date", "serial_number", "ot_number", "overall_status",
+                        "ilrl_status", "ilrl_date", "geo_status", "geo_date",
+                        "ilrl_details_json", "geo_details_json")
+TAM_BLOQUE_EXPORTACION = 1000 # Filas leídas del cursor por bloque
+
+# Vista de registros: la base filtra, ordena y recorta; la vista solo pinta una página
+LIMITE_VISTA_REGISTROS = 1000
+ESTADOS_FILTRO_REGISTROS = ("Todos", "APROBADO", "RECHAZADO", "NO ENCONTRADO")
+# Columna de la vista -> columnas del ORDER BY (todas cubiertas por un índice, con desempate estable)
+ORDEN_REGISTROS = {
+    "ID": ("id",),
+    "Fecha Entrada": ("entry_date", "id"),
+    "Número Serie": ("serial_number", "id"),
+    "Número OT": ("ot_number", "entry_date"),
+    "Estado General": ("overall_status", "entry_date"),
+}
+
+# Turnos de producción (nombre, hora de inicio). El turno nocturno cruza la medianoche
+# y se contabiliza en el día en que empezó.
+TURNOS = (('1', 6), ('2', 14), ('3', 22))
+# Diseño fijo de los libros de las estaciones: 12 filas de encabezado y columnas fijas
+FILAS_ENCABEZADO = 12
+COLUMNAS_ILRL = (7, 8, 9, 10, 11, 12) # Resultados (7-10) y fechas (9-12)
+COLUMNAS_GEO = (0, 3, 4, 6) # Serie-punta, fecha, hora, resultado
+NS_XLSX = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_RELACIONES = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PAQUETE = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+FORMATOS_FECHA_INTEGRADOS = set(range(14, 23)) | {45, 46, 47} # numFmtId de fecha/hora predefinidos por Excel
+# Exportaciones de estación aceptadas, en orden de preferencia: si una corrida está en CSV y en xlsx se lee el CSV
+EXTENSIONES_ESTACION = ('.csv', '.tsv', '.xlsx')
+DELIMITADORES_CSV = ",;\t"
+CODIFICACIONES_CSV = ('utf-8-sig', 'cp1252') # Exportaciones en UTF-8 (con o sin BOM) o ANSI de Windows
+# Formatos de fecha reconocidos en las celdas de texto de los CSV (se convierten a datetime como en el xlsx)
+FORMATOS_FECHA_CSV = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d",
+                      "%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y")
+
+# Espejo local de las carpetas compartidas
+INTERVALO_ESPEJO_SEG = 60 # Espera entre pasadas de sincronización
+MAX_OTS_ESPEJO = 20 # OTs recientes cuyas carpetas ILRL se mantienen espejadas
+
+# Métricas en archivo de texto para el textfile collector de node_exporter (sin puertos abiertos en la app)
+INTERVALO_METRICAS_SEG = 15
+BUCKETS_LATENCIA_SEG = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Importación del histórico de libros (mediciones por punta en la base)
+TAM_LOTE_IMPORTACION = 200 # Archivos por transacción
+CHUNK_IMPORTACION = 8 # Archivos por envío a cada proceso
+
+# Caché compartida en la red: resultado ya interpretado de cada libro, junto al libro (opcional)
+CARPETA_SIDECAR = ".verificador_cache"
+VERSION_SIDECAR = 1 # Subir si cambia la interpretación de los libros: los sidecars anteriores se ignoran
+
+# Errores de un libro corrupto o con formato inesperado: solo estos ponen el libro en cuarentena.
+# Los OSError (red caída, permisos, archivo bloqueado) son pasajeros y el libro se vuelve a leer en el próximo escaneo.
+ERRORES_FORMATO_LIBRO = (zipfile.BadZipFile, ET.ParseError, KeyError, ValueError, csv.Error)
+
+# Lectura concurrente de libros (reporte de OT y otros procesos por lote)
+HILOS_LECTURA = 8
+# Búsqueda simultánea en varias raíces ILRL/Geometría (líneas y carpetas de archivo)
+HILOS_RAICES = 8
+SEPARADOR_RUTAS = ";" # Separador de raíces en la ventana de configuración
+
+# Cachés de Geometría: libros ya leídos (válidos mientras no cambien mtime/tamaño) y su fusión por OT
+MAX_LIBROS_GEO_CACHE = 64
+MAX_OTS_GEO_CACHE = 16
+
+# Libros que una estación está guardando mientras se escanea: se sirve la última lectura buena y se relee en segundo plano
+MAX_LECTURAS_BUENAS = 2000 # Última lectura correcta por libro (LRU)
+SEGUNDOS_LIBRO_RECIENTE = 10 # Un libro que falla y se modificó hace menos que esto se considera a medio escribir
+INTERVALO_ESTABILIDAD_SEG = 1.0 # Dos consultas iguales separadas por esto = libro estable
+ESPERA_MAX_ESTABILIDAD_SEG = 300
+
+# Modo cola de escaneo (escáner de código de barras continuo)
+HILOS_COLA_ESCANEO = 4
+MAX_FILAS_COLA = 500 # Filas visibles en la lista de resultados; las más antiguas se descartan
+INTERVALO_COLA_UI_MS = 100 # Frecuencia con la que el hilo de Tk atiende los resultados de otros hilos
+
+# Arranque en caliente: al abrir, se precargan índices y lecturas de las OTs verificadas en las últimas horas
+HORAS_PRECALENTAMIENTO = 8 # Valor por defecto de 'horas_precalentamiento' (0 = no precargar)
+RETARDO_PRECALENTAMIENTO_MS = 500 # Se empieza una vez mostrada la ventana
+
+# Archivo histórico: los meses antiguos se mueven a una base por mes, que se adjunta (ATTACH) para consultarla
+CARPETA_ARCHIVO = "archivo_verificaciones" # Junto a la base de datos activa
+PREFIJO_ARCHIVO = "cable_verifications_" # + AAAA-MM.db
+
+# Reevaluación de registros guardados con las reglas vigentes
+TAM_LOTE_REEVALUACION = 5000 # Registros leídos, evaluados y escritos por transacción
+
+COLUMNAS_ROLLUP = ("total", "aprobados", "rechazados", "no_encontrados",
+                   "ilrl_rechazado", "ilrl_no_encontrado", "geo_rechazado", "geo_no_encontrado")
+
+# Detalles por punta: tuplas en memoria y un formato binario compacto en la base de datos.
+# Las columnas ilrl_details_json/geo_details_json guardan un BLOB con este formato; los registros
+# anteriores (texto JSON) se siguen leyendo igual.
+FORMATO_DETALLES_ILRL = 1 # Primer byte del BLOB: tipo de detalle / versión del formato
+FORMATO_DETALLES_GEO = 2
+FECHA_DETALLE_ILRL = "%d/%m/%Y %H:%M"
+FECHA_DETALLE_GEO = "%d/%m/%Y %H:%M:%S"
+EPOCA = datetime(1970, 1, 1)
+_CABECERA_ILRL = struct.Struct("<BBIH") # formato, estado, fecha (minutos), cantidad de puntas
+_PUNTA_ILRL = struct.Struct("<HBIBB") # línea, resultado, fecha (minutos), archivo, tipo de archivo
+_CABECERA_GEO = struct.Struct("<BBBIH") # formato, archivo, resultado, fecha (segundos), cantidad de mediciones
+_MEDICION_GEO = struct.Struct("<BBBI") # serie, punta, resultado, fecha (segundos)
+
+
+class PuntaILRL(NamedTuple):
+    """Una línea (punta) de un archivo ILRL."""
+    linea: int
+    resultado: str
+    fecha: str # FECHA_DETALLE_ILRL o 'N/A'
+    origen_archivo: str
+    tipo_archivo: str # LC, SC o COMBINADO
+
+
+class MedicionGeo(NamedTuple):
+    """Una medición de Geometría de una punta."""
+    serie: str
+    punta: str
+    resultado: str
+    timestamp: str # FECHA_DETALLE_GEO o 'N/A'
+
+
+class DetallesILRL(NamedTuple):
+    """Resultado ILRL consolidado de un cable y sus puntas."""
+    estado: str
+    fecha: str
+    puntas: tuple # de PuntaILRL
+
+
+class DetallesGeo(NamedTuple):
+    """Resultado de Geometría de un cable, el libro del que sale y sus mediciones."""
+    archivo: str
+    resultado: str
+    fecha: str
+    puntas: tuple # de MedicionGeo
+
+
+class LibroEnCuarentena(NamedTuple):
+    """Libro que no se pudo interpretar; se omite mientras no cambien su mtime y tamaño."""
+    tipo: str # 'ilrl' o 'geo'
+    firma: tuple # (mtime, tamaño) del libro cuando falló
+    motivo: str
+    desde: str # "%Y-%m-%d %H:%M:%S"
+
+
+def _fecha_a_entero(texto, formato, divisor):
+    """Fecha de texto -> segundos (o minutos, divisor=60) desde 1970. 0 = sin fecha."""
+    if texto in (None, 'N/A'):
+        return 0
+    return int((datetime.strptime(texto, formato) - EPOCA).total_seconds()) // divisor
+
+
+def _entero_a_fecha(valor, formato, divisor):
+    return (EPOCA + timedelta(seconds=valor * divisor)).strftime(formato) if valor else 'N/A'
+
+
+def codificar_detalles(detalles):
+    """
+    Codifica DetallesILRL/DetallesGeo para la base: cabecera y registros de tamaño fijo con struct,
+    y los textos (archivos, resultados, puntas) en una tabla sin repetidos referida por índice.
+    Si algún valor no entra en el formato (fecha con otro formato, demasiados textos) se guarda como JSON.
+    """
+    if not detalles:
+        return None
+    textos = {None: 0}
+
+    def indice(texto):
+        return textos.setdefault(texto, len(textos))
+
+    try:
+        if isinstance(detalles, DetallesILRL):
+            cuerpo = b"".join(_PUNTA_ILRL.pack(
+                p.linea, indice(p.resultado), _fecha_a_entero(p.fecha, FECHA_DETALLE_ILRL, 60),
+                indice(p.origen_archivo), indice(p.tipo_archivo)
+            ) for p in detalles.puntas)
+            cabecera = _CABECERA_ILRL.pack(FORMATO_DETALLES_ILRL, indice(detalles.estado),
+                                           _fecha_a_entero(detalles.fecha, FECHA_DETALLE_ILRL, 60), len(detalles.puntas))
+        else:
+            cuerpo = b"".join(_MEDICION_GEO.pack(
+                indice(m.serie), indice(m.punta), indice(m.resultado),
+                _fecha_a_entero(m.timestamp, FECHA_DETALLE_GEO, 1)
+            ) for m in detalles.puntas)
+            cabecera = _CABECERA_GEO.pack(FORMATO_DETALLES_GEO, indice(detalles.archivo), indice(detalles.resultado),
+                                          _fecha_a_entero(detalles.fecha, FECHA_DETALLE_GEO, 1), len(detalles.puntas))
+        tabla = [struct.pack("<B", len(textos) - 1)]
+        for texto in list(textos)[1:]:
+            datos = str(texto).encode('utf-8')
+            tabla.append(struct.pack("<H", len(datos)) + datos)
+        return cabecera + b"".join(tabla) + cuerpo
+    except (ValueError, TypeError, struct.error):
+        return json.dumps(detalles_a_dict(detalles), ensure_ascii=False)
+
+
+def decodificar_detalles(valor):
+    """Columna de detalles (BLOB compacto o JSON de registros anteriores) -> DetallesILRL/DetallesGeo o None."""
+    if not valor:
+        return None
+    if isinstance(valor, str):
+        return detalles_desde_dict(json.loads(valor))
+
+    formato = valor[0]
+    cabecera = _CABECERA_ILRL if formato == FORMATO_DETALLES_ILRL else _CABECERA_GEO
+    campos = cabecera.unpack_from(valor, 0)
+    posicion = cabecera.size
+    textos = [None]
+    for _ in range(valor[posicion]):
+        largo, = struct.unpack_from("<H", valor, posicion + 1)
+        textos.append(valor[posicion + 3:posicion + 3 + largo].decode('utf-8'))
+        posicion += 2 + largo
+    posicion += 1
+
+    if formato == FORMATO_DETALLES_ILRL:
+        _, estado, fecha, cantidad = campos
+        puntas = tuple(
+            PuntaILRL(linea, textos[resultado], _entero_a_fecha(minutos, FECHA_DETALLE_ILRL, 60), textos[archivo], textos[tipo])
+            for linea, resultado, minutos, archivo, tipo in _PUNTA_ILRL.iter_unpack(valor[posicion:posicion + cantidad * _PUNTA_ILRL.size])
+        )
+        # Sin puntas no hay fecha de medición (None, como al evaluar)
+        return DetallesILRL(textos[estado], _entero_a_fecha(fecha, FECHA_DETALLE_ILRL, 60) if puntas else None, puntas)
+
+    _, archivo, resultado, fecha, cantidad = campos
+    puntas = tuple(
+        MedicionGeo(textos[serie], textos[punta], textos[res], _entero_a_fecha(segundos, FECHA_DETALLE_GEO, 1))
+        for serie, punta, res, segundos in _MEDICION_GEO.iter_unpack(valor[posicion:posicion + cantidad * _MEDICION_GEO.size])
+    )
+    return DetallesGeo(textos[archivo], textos[resultado], _entero_a_fecha(fecha, FECHA_DETALLE_GEO, 1), puntas)
+
+
+def detalles_a_dict(detalles):
+    """DetallesILRL/DetallesGeo -> dict con las claves históricas del JSON (exportación y envío al servidor)."""
+    if detalles is None:
+        return None
+    if isinstance(detalles, DetallesILRL):
+        return {
+            'lc_file': None,
+            'sc_file': None,
+            'combinado_file': None,
+            'overall_ilrl_status': detalles.estado,
+            'latest_ilrl_date': detalles.fecha,
+            'combined_details': [p._asdict() for p in detalles.puntas]
+        }
+    return {
+        'file_path': detalles.archivo,
+        'resultado_general': detalles.resultado,
+        'fecha_general': detalles.fecha,
+        'detalles_puntas': [m._asdict() for m in detalles.puntas]
+    }
+
+
+def detalles_desde_dict(datos):
+    """dict con las claves históricas del JSON -> DetallesILRL/DetallesGeo."""
+    if datos is None:
+        return None
+    if 'combined_details' in datos:
+        return DetallesILRL(datos.get('overall_ilrl_status'), datos.get('latest_ilrl_date'), tuple(
+            PuntaILRL(d.get('linea'), d.get('resultado'), d.get('fecha', 'N/A'), d.get('origen_archivo', ''), d.get('tipo_archivo'))
+            for d in datos['combined_details']
+        ))
+    return DetallesGeo(datos.get('file_path'), datos.get('resultado_general'), datos.get('fecha_general'), tuple(
+        MedicionGeo(d.get('serie'), d.get('punta'), d.get('resultado'), d.get('timestamp', 'N/A'))
+        for d in datos.get('detalles_puntas', [])
+    ))
+
+
+class MetricasVerificacion:
+    """
+    Contadores, medidores e histogramas de latencia en memoria (seguros entre hilos), exportados en el formato
+    de texto de Prometheus/OpenMetrics. Cada serie se identifica por nombre y etiquetas.
+    """
 
-class VerificadorCables:
     def __init__(self):
+        self._lock = threading.Lock()
+        self._contadores = defaultdict(float) # (nombre, etiquetas) -> valor
+        self._histogramas = {} # (nombre, etiquetas) -> [conteos por bucket..., suma, cantidad]
+        self._ayuda = {}
+
+    def _clave(self, nombre, ayuda, etiquetas):
+        if ayuda:
+            self._ayuda.setdefault(nombre, ayuda)
+        return nombre, tuple(sorted(etiquetas.items()))
+
+    def incrementar(self, nombre, valor=1, ayuda="", **etiquetas):
+        clave = self._clave(nombre, ayuda, etiquetas)
+        with self._lock:
+            self._contadores[clave] += valor
+
+    def observar(self, nombre, segundos, ayuda="", **etiquetas):
+        clave = self._clave(nombre, ayuda, etiquetas)
+        with self._lock:
+            h = self._histogramas.get(clave)
+            if h is None:
+                h = self._histogramas[clave] = [0] * (len(BUCKETS_LATENCIA_SEG) + 2)
+            for i, limite in enumerate(BUCKETS_LATENCIA_SEG):
+                if segundos <= limite:
+                    h[i] += 1
+            h[-2] += segundos
+            h[-1] += 1
+
+    def texto(self, medidores=(), contadores_externos=()):
+        """
+        Exposición en texto. medidores: [(nombre, ayuda, etiquetas, valor)] con valores instantáneos;
+        contadores_externos: ídem para contadores llevados fuera de esta clase (p. ej. estadisticas_cache).
+        """
+        def etiquetas_texto(etiquetas, extra=()):
+            pares = list(etiquetas) + list(extra)
+            if not pares:
+                return ""
+            return "{" + ",".join(f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                                  for k, v in pares) + "}"
+
+        familias = defaultdict(list) # nombre -> (tipo, [líneas])
+        with self._lock:
+            contadores = [(n, e, v) for (n, e), v in self._contadores.items()]
+            histogramas = [(n, e, list(h)) for (n, e), h in self._histogramas.items()]
+            ayuda = dict(self._ayuda)
+        for nombre, ayuda_ext, etiquetas, valor in contadores_externos:
+            ayuda.setdefault(nombre, ayuda_ext)
+            contadores.append((nombre, tuple(sorted(etiquetas.items())), valor))
+
+        tipos = {}
+        for nombre, etiquetas, valor in sorted(contadores):
+            tipos[nombre] = "counter"
+            familias[nombre].append(f"{nombre}{etiquetas_texto(etiquetas)} {valor:g}")
+        for nombre, ayuda_med, etiquetas, valor in medidores:
+            ayuda.setdefault(nombre, ayuda_med)
+            tipos[nombre] = "gauge"
+            familias[nombre].append(f"{nombre}{etiquetas_texto(tuple(sorted(etiquetas.items())))} {valor:g}")
+        for nombre, etiquetas, h in sorted(histogramas):
+            tipos[nombre] = "histogram"
+            for limite, conteo in zip(BUCKETS_LATENCIA_SEG, h):
+                familias[nombre].append(f"{nombre}_bucket{etiquetas_texto(etiquetas, [('le', f'{limite:g}')])} {conteo}")
+            familias[nombre].append(f"{nombre}_bucket{etiquetas_texto(etiquetas, [('le', '+Inf')])} {h[-1]}")
+            familias[nombre].append(f"{nombre}_sum{etiquetas_texto(etiquetas)} {h[-2]:.6f}")
+            familias[nombre].append(f"{nombre}_count{etiquetas_texto(etiquetas)} {h[-1]}")
+
+        lineas = []
+        for nombre in sorted(familias):
+            if ayuda.get(nombre):
+                lineas.append(f"# HELP {nombre} {ayuda[nombre]}")
+            lineas.append(f"# TYPE {nombre} {tipos[nombre]}")
+            lineas.extend(familias[nombre])
+        return "\n".join(lineas) + "\n"
+
+
+class VerificadorCables:
+    def __init__(self, interactivo=True, db_name=None, cargar_configuracion=True):
+        # interactivo=False: uso desde línea de comandos, los avisos van a consola en lugar de messagebox
+        self.interactivo = interactivo
         self.root = None
         self.ot_entry = None
         self.serie_entry = None
@@ -17,12 +397,40 @@ class VerificadorCables:
         self.ruta_ilrl_label = None
         self.ruta_geo_label = None
     
-        # Rutas base configuradas (ahora se cargarán de config.json)
-        self.ruta_base_ilrl = r"C:\Users\Paulo\Desktop\ILRL JWS1-1" # Valor por defecto
-        self.ruta_base_geo = r"C:\Users\Paulo\Desktop\Geometria JWS1-1" # Valor por defecto
+        # Raíces configuradas (ahora se cargarán de config.json). Puede haber varias por fuente
+        # (una por línea y las carpetas de archivo); ruta_base_ilrl/ruta_base_geo son la primera de cada lista.
+        self.rutas_ilrl = [r"C:\Users\Paulo\Desktop\ILRL JWS1-1"] # Valor por defecto
+        self.rutas_geo = [r"C:\Users\Paulo\Desktop\Geometria JWS1-1"] # Valor por defecto
+        self._pool_raices = ThreadPoolExecutor(max_workers=HILOS_RAICES, thread_name_prefix="raices")
     
         self.config_file = "config.json"
         self.password = "admin123" # Contraseña para acceder a la configuración
+
+        # Almacenamiento: "sqlite" (solo local, por defecto) o "remoto" (además se envía al servidor de línea)
+        self.almacenamiento = "sqlite"
+        self.servidor_url = f"http://localhost:{PUERTO_SERVIDOR_DEFECTO}"
+        self.estacion = socket.gethostname()
+        self._conexion_remota = None # Conexión HTTP reutilizada entre lotes
+        self._evento_envio = threading.Event()
+        self._hilo_envio = None
+
+        # API HTTP local de verificación (0 = deshabilitada)
+        self.api_puerto = 0
+        self._servidor_api = None
+
+        # Sidecars compartidos: la primera estación que interpreta un libro deja el resultado para las demás
+        self.cache_compartida = False
+
+        # Métricas internas; si hay ruta configurada se escriben periódicamente en un archivo .prom ("" = no se escriben)
+        self.metricas = MetricasVerificacion()
+        self.metricas_archivo = ""
+        self._hilo_metricas = None
+
+        # Espejo local opcional de las carpetas ILRL/Geometría ("" = deshabilitado)
+        self.espejo_local = ""
+        self._ots_activas = {} # OT -> última vez verificada (las más recientes se espejan)
+        self._evento_espejo = threading.Event()
+        self._hilo_espejo = None
     
         # Variables para almacenar la última información analizada
         self.last_ilrl_analysis_data = None
@@ -31,17 +439,116 @@ class VerificadorCables:
         self.last_geo_file_path = None
     
         # Base de datos - ahora con ruta absoluta en el directorio del programa
-        self.db_name = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cable_verifications.db")
+        self.db_name = os.path.abspath(db_name) if db_name else os.path.join(os.path.dirname(os.path.abspath(__file__)), "cable_verifications.db")
+        self.carpeta_archivo = os.path.join(os.path.dirname(self.db_name), CARPETA_ARCHIVO)
+        self.meses_retencion = 0 # Meses completos que quedan en la base activa al archivar al inicio (0 = no archivar)
+        self.horas_precalentamiento = HORAS_PRECALENTAMIENTO
     
         # Asegurarse de que el directorio existe
         os.makedirs(os.path.dirname(self.db_name), exist_ok=True)
     
         self._init_database() # Inicializar la base de datos al inicio
-        self.cargar_rutas() # Cargar las rutas al iniciar la aplicación
+        if cargar_configuracion: # Sin configuración (simulaciones): rutas por defecto, sin envío remoto ni espejo
+            self.cargar_rutas() # Cargar las rutas al iniciar la aplicación
+        self._iniciar_envio_remoto() # Solo arranca si el almacenamiento es "remoto"
+        self._iniciar_espejo_local() # Solo arranca si hay carpeta de espejo configurada
 
         # Nuevo caché para almacenar los detalles de los elementos de Treeview
         self.item_data_cache = {}
 
+        # Ventanas de detalle reutilizables (clave -> (Toplevel, widgets)) y canvas desplazable de cada ventana
+        self._ventanas = {}
+        self._canvas_por_ventana = {}
+
+        # Llamadas a la interfaz pendientes desde hilos de trabajo (Tk solo debe usarse desde su propio hilo)
+        self._cola_ui = queue.Queue()
+
+        # Modo cola de escaneo
+        self.modo_cola_var = None
+        self._pool_cola = None
+        self._locks_archivos = {} # (OT, terminación) -> Lock: escaneos que leen los mismos archivos van en orden
+        self._pendientes_cola = 0
+        self._resultados_cola = {} # item del Treeview -> resultado de evaluar_cable
+        self._contador_cola = 0
+        self._resumen_cola = defaultdict(int)
+
+        # Cachés de Geometría (LRU) y contadores de aciertos/fallos/desalojos por caché
+        self._cache_libros_geo = OrderedDict() # ruta -> ((mtime, tamaño), resultado de leer_resultado_geo)
+        self._cache_geo_ot = OrderedDict() # OT -> (firma de sus libros, {serie: DetallesGeo})
+        # Una sola fusión en curso por OT: locks repartidos por hash de la OT (cantidad fija, no crece con las OTs vistas)
+        self._locks_geo_ot = [threading.Lock() for _ in range(MAX_OTS_GEO_CACHE)]
+        self._lock_cache_geo = threading.Lock()
+        self.estadisticas_cache = defaultdict(int)
+
+        # Índice ILRL por carpeta de OT: ruta_ot -> (mtimes de <OT>/ y <OT>/F/, {terminación: ([principal], [F])}, todos)
+        self._indice_ilrl = {}
+        self._lock_indices = threading.Lock()
+
+        # Libros ilegibles (corruptos o con formato inesperado): ruta -> LibroEnCuarentena
+        self._cuarentena = {}
+        self._lock_cuarentena = threading.Lock()
+
+        # Libros a medio escribir: última lectura correcta de cada libro y relecturas en segundo plano pendientes
+        self._lecturas_buenas = OrderedDict() # ruta -> ((mtime, tamaño), resultado)
+        self._relecturas_pendientes = set()
+        self._lock_lecturas = threading.Lock()
+
+    def _notificar(self, tipo, titulo, mensaje):
+        """Muestra un aviso (info/warning/error) en la interfaz o, sin interfaz, en la consola."""
+        if self.interactivo:
+            mostrar = {'info': messagebox.showinfo, 'warning': messagebox.showwarning,
+                       'error': messagebox.showerror}[tipo]
+            self._en_hilo_ui(lambda: mostrar(titulo, mensaje))
+        else:
+            print(f"[{titulo}] {mensaje}")
+
+    @property
+    def ruta_base_ilrl(self):
+        """Raíz ILRL principal (la primera de rutas_ilrl)."""
+        return self.rutas_ilrl[0]
+
+    @ruta_base_ilrl.setter
+    def ruta_base_ilrl(self, ruta):
+        self.rutas_ilrl = [ruta]
+
+    @property
+    def ruta_base_geo(self):
+        """Raíz de Geometría principal (la primera de rutas_geo)."""
+        return self.rutas_geo[0]
+
+    @ruta_base_geo.setter
+    def ruta_base_geo(self, ruta):
+        self.rutas_geo = [ruta]
+
+    def _en_raices(self, funcion, raices):
+        """
+        Aplica funcion(raiz) a todas las raíces a la vez: la demora total es la de la raíz más lenta,
+        no la suma. Retorna: lista de resultados en el orden de las raíces.
+        """
+        if len(raices) == 1:
+            return [funcion(raices[0])]
+        return list(self._pool_raices.map(funcion, raices))
+
+    def _en_hilo_ui(self, funcion):
+        """Ejecuta `funcion` en el hilo de Tk: directamente si ya se está en él, si no, a través de la cola de la UI."""
+        if self.root is None or threading.current_thread() is threading.main_thread():
+            funcion()
+        else:
+            self._cola_ui.put(funcion)
+
+    def _procesar_cola_ui(self):
+        """Atiende (en el hilo de Tk) las llamadas a la interfaz encoladas por otros hilos."""
+        try:
+            while True:
+                try:
+                    self._cola_ui.get_nowait()()
+                except queue.Empty:
+                    break
+                except Exception as e: # Un error en una llamada no debe detener la atención de la cola
+                    print(f"Error en llamada a la interfaz desde otro hilo: {e}")
+        finally:
+            self.root.after(INTERVALO_COLA_UI_MS, self._procesar_cola_ui)
+
     def _init_database(self):
         """Inicializa la base de datos SQLite y crea la tabla si no existe."""
         conn = None
@@ -57,6 +564,8 @@ class VerificadorCables:
             """)
         
             if cursor.fetchone()[0] == 0:
+                # Base nueva: el espacio de los registros archivados se recupera con PRAGMA incremental_vacuum
+                cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
                 # Crear tabla solo si no existe
                 cursor.execute("""
                     CREATE TABLE cable_verifications (
@@ -74,36 +583,215 @@ class VerificadorCables:
                     )
                 """)
                 conn.commit()
+
+            # Índices para filtros por rango de fechas y por OT (exportación, consultas)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cv_entry_date ON cable_verifications (entry_date)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cv_ot_fecha ON cable_verifications (ot_number, entry_date)")
+            # Índices de la vista de registros (filtro por estado + rango de fechas, orden por serie)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cv_estado_fecha ON cable_verifications (overall_status, entry_date)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cv_serie ON cable_verifications (serial_number)")
+
+            # Tabla de acumulados por día/turno/OT, mantenida en cada registro (estadísticas sin recorrer el historial)
+            cursor.execute("""
+                SELECT count(name) FROM sqlite_master 
+                WHERE type='table' AND name='rollup_produccion'
+            """)
+            if cursor.fetchone()[0] == 0:
+                cursor.execute("""
+                    CREATE TABLE rollup_produccion (
+                        dia TEXT NOT NULL,
+                        turno TEXT NOT NULL,
+                        ot_number TEXT NOT NULL,
+                        total INTEGER NOT NULL DEFAULT 0,
+                        aprobados INTEGER NOT NULL DEFAULT 0,
+                        rechazados INTEGER NOT NULL DEFAULT 0,
+                        no_encontrados INTEGER NOT NULL DEFAULT 0,
+                        ilrl_rechazado INTEGER NOT NULL DEFAULT 0,
+                        ilrl_no_encontrado INTEGER NOT NULL DEFAULT 0,
+                        geo_rechazado INTEGER NOT NULL DEFAULT 0,
+                        geo_no_encontrado INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (dia, turno, ot_number)
+                    )
+                """)
+                self._reconstruir_rollups(cursor) # Única pasada sobre el historial existente
+                conn.commit()
+
+            # Último veredicto por número de serie (se actualiza en cada registro; evita recorrer los duplicados)
+            cursor.execute("""
+                SELECT count(name) FROM sqlite_master 
+                WHERE type='table' AND name='cable_latest_status'
+            """)
+            if cursor.fetchone()[0] == 0:
+                cursor.execute("""
+                    CREATE TABLE cable_latest_status (
+                        serial_number TEXT PRIMARY KEY,
+                        ot_number TEXT NOT NULL,
+                        overall_status TEXT NOT NULL,
+                        ilrl_status TEXT,
+                        geo_status TEXT,
+                        entry_date TEXT NOT NULL,
+                        last_entry_id INTEGER NOT NULL
+                    )
+                """)
+                cursor.execute("CREATE INDEX idx_cls_ot ON cable_latest_status (ot_number)")
+                cursor.execute("""
+                    INSERT INTO cable_latest_status
+                    SELECT serial_number, ot_number, overall_status, ilrl_status, geo_status, entry_date, id
+                    FROM cable_verifications
+                    WHERE id IN (SELECT MAX(id) FROM cable_verifications GROUP BY serial_number)
+                """)
+                conn.commit()
+            # Índices de la vista "solo último estado": mismo orden y desempate (serie) que _orden_sql
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cls_fecha ON cable_latest_status (entry_date, serial_number)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cls_estado_fecha ON cable_latest_status (overall_status, entry_date, serial_number)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cls_ot_fecha ON cable_latest_status (ot_number, entry_date, serial_number)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cls_id ON cable_latest_status (last_entry_id)")
+
+            # Cola persistente de registros pendientes de enviar al servidor de línea (modo "remoto").
+            # Sobrevive a reinicios y cortes de red: solo se vacía cuando el servidor confirma.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cola_envio_remoto (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    registro_id INTEGER NOT NULL,
+                    payload_json TEXT NOT NULL
+                )
+            """)
+
+            # Auditoría de la reevaluación: cada veredicto cambiado, con su valor anterior
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS reevaluacion_auditoria (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ejecucion TEXT NOT NULL,
+                    registro_id INTEGER NOT NULL,
+                    serial_number TEXT NOT NULL,
+                    overall_anterior TEXT, overall_nuevo TEXT,
+                    ilrl_anterior TEXT, ilrl_nuevo TEXT,
+                    geo_anterior TEXT, geo_nuevo TEXT
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ra_registro ON reevaluacion_auditoria (registro_id)")
+
+            # Histórico importado de los libros: mediciones por punta y archivos ya importados (por ruta, mtime y tamaño)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS mediciones_ilrl (
+                    ruta TEXT NOT NULL,
+                    ot_number TEXT NOT NULL,
+                    serial_number TEXT,
+                    linea INTEGER,
+                    resultado TEXT,
+                    fecha TEXT,
+                    tipo_archivo TEXT,
+                    retrabajo INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_mi_serie ON mediciones_ilrl (serial_number)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_mi_ruta ON mediciones_ilrl (ruta)")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS mediciones_geo (
+                    ruta TEXT NOT NULL,
+                    serial_number TEXT NOT NULL,
+                    punta TEXT,
+                    resultado TEXT,
+                    fecha TEXT
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_mg_serie ON mediciones_geo (serial_number)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_mg_ruta ON mediciones_geo (ruta)")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS importacion_archivos (
+                    ruta TEXT PRIMARY KEY,
+                    tipo TEXT NOT NULL,
+                    mtime REAL NOT NULL,
+                    tamano INTEGER NOT NULL,
+                    mediciones INTEGER NOT NULL,
+                    estado TEXT NOT NULL,
+                    fecha_importacion TEXT NOT NULL
+                )
+            """)
+            conn.commit()
             
         except sqlite3.Error as e:
-            messagebox.showerror("Error de Base de Datos", 
+            self._notificar("error", "Error de Base de Datos", 
                             f"No se pudo inicializar la base de datos: {e}")
             # Intentar crear el archivo si no existe y falló la conexión
             if not os.path.exists(self.db_name):
                 try:
                     open(self.db_name, 'w').close()
                     # No reintentar init_database aquí para evitar bucles si el error es persistente
-                    messagebox.showinfo("Base de Datos", "Archivo de base de datos creado. Intente reiniciar la aplicación.")
+                    self._notificar("info", "Base de Datos", "Archivo de base de datos creado. Intente reiniciar la aplicación.")
                 except Exception as e:
-                    messagebox.showerror("Error Crítico", 
+                    self._notificar("error", "Error Crítico", 
                                     f"No se pudo crear el archivo de base de datos: {e}")
         finally:
             if conn:
                 conn.close()
 
+    def _dia_y_turno(self, entry_date):
+        """Retorna (día de producción 'YYYY-MM-DD', turno) para un entry_date 'YYYY-MM-DD HH:MM:SS'."""
+        fecha = datetime.strptime(entry_date, "%Y-%m-%d %H:%M:%S")
+        hora = fecha.hour
+        turno = TURNOS[-1][0]
+        for nombre, hora_inicio in TURNOS:
+            if hora >= hora_inicio:
+                turno = nombre
+        if hora < TURNOS[0][1]: # Madrugada: pertenece al turno nocturno del día anterior
+            fecha -= timedelta(days=1)
+        return fecha.strftime("%Y-%m-%d"), turno
+
+    def _valores_rollup(self, overall_status, ilrl_status, geo_status):
+        """Contribución de un registro a cada contador de rollup_produccion (en el orden de COLUMNAS_ROLLUP)."""
+        return (
+            1,
+            int(overall_status == "APROBADO"),
+            int(overall_status == "RECHAZADO"),
+            int(overall_status == "NO ENCONTRADO"),
+            int(ilrl_status == "RECHAZADO"),
+            int(ilrl_status == "NO ENCONTRADO"),
+            int(geo_status == "RECHAZADO"),
+            int(geo_status == "NO ENCONTRADO"),
+        )
+
+    def _acumular_rollup(self, cursor, entry_date, ot_number, overall_status, ilrl_status, geo_status, signo=1):
+        """Suma (o resta, con signo=-1) un registro a su celda día/turno/OT dentro de la transacción en curso."""
+        dia, turno = self._dia_y_turno(entry_date)
+        valores = [signo * v for v in self._valores_rollup(overall_status, ilrl_status, geo_status)]
+        cursor.execute(f"""
+            INSERT INTO rollup_produccion (dia, turno, ot_number, {', '.join(COLUMNAS_ROLLUP)})
+            VALUES (?, ?, ?, {', '.join('?' * len(COLUMNAS_ROLLUP))})
+            ON CONFLICT (dia, turno, ot_number) DO UPDATE SET
+                {', '.join(f'{c} = {c} + excluded.{c}' for c in COLUMNAS_ROLLUP)}
+        """, (dia, turno, ot_number, *valores))
+
+    def _reconstruir_rollups(self, cursor):
+        """Recalcula rollup_produccion desde cable_verifications (solo columnas de estado, sin leer los JSON)."""
+        acumulados = defaultdict(lambda: [0] * len(COLUMNAS_ROLLUP))
+        cursor.execute("SELECT entry_date, ot_number, overall_status, ilrl_status, geo_status FROM cable_verifications")
+        for entry_date, ot_number, overall_status, ilrl_status, geo_status in cursor:
+            dia, turno = self._dia_y_turno(entry_date)
+            celda = acumulados[(dia, turno, ot_number)]
+            for i, v in enumerate(self._valores_rollup(overall_status, ilrl_status, geo_status)):
+                celda[i] += v
+        cursor.execute("DELETE FROM rollup_produccion")
+        cursor.executemany(
+            f"INSERT INTO rollup_produccion (dia, turno, ot_number, {', '.join(COLUMNAS_ROLLUP)}) "
+            f"VALUES (?, ?, ?, {', '.join('?' * len(COLUMNAS_ROLLUP))})",
+            [(*clave, *valores) for clave, valores in acumulados.items()]
+        )
+
     def _log_verification_result(self, serial_number, ot_number, overall_status, 
                            ilrl_status, ilrl_date, ilrl_details, 
                            geo_status, geo_date, geo_details):
         """Registra el resultado de la verificación de un cable en la base de datos."""
         conn = None
+        inicio = time.perf_counter()
         try:
             conn = sqlite3.connect(self.db_name, check_same_thread=False)
             cursor = conn.cursor()
             entry_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-            # Convertir detalles a JSON strings para almacenamiento
-            ilrl_details_json = json.dumps(ilrl_details, ensure_ascii=False) if ilrl_details else None
-            geo_details_json = json.dumps(geo_details, ensure_ascii=False) if geo_details else None
+            # Detalles en formato binario compacto (ver codificar_detalles)
+            ilrl_details_json = codificar_detalles(ilrl_details)
+            geo_details_json = codificar_detalles(geo_details)
 
             cursor.execute("""
                 INSERT INTO cable_verifications (
@@ -116,25 +804,650 @@ class VerificadorCables:
                 ilrl_status, ilrl_date, ilrl_details_json,
                 geo_status, geo_date, geo_details_json
             ))
+            registro_id = cursor.lastrowid
+
+            self._acumular_rollup(cursor, entry_date, ot_number, overall_status, ilrl_status, geo_status)
+            cursor.execute("""
+                INSERT INTO cable_latest_status (
+                    serial_number, ot_number, overall_status, ilrl_status, geo_status, entry_date, last_entry_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (serial_number) DO UPDATE SET
+                    ot_number = excluded.ot_number,
+                    overall_status = excluded.overall_status,
+                    ilrl_status = excluded.ilrl_status,
+                    geo_status = excluded.geo_status,
+                    entry_date = excluded.entry_date,
+                    last_entry_id = excluded.last_entry_id
+            """, (serial_number, ot_number, overall_status, ilrl_status, geo_status, entry_date, registro_id))
+
+            if self.almacenamiento == "remoto":
+                # Se encola en la misma transacción: el registro local y su envío pendiente van juntos
+                payload = {
+                    'id_origen': registro_id,
+                    'entry_date': entry_date,
+                    'serial_number': serial_number,
+                    'ot_number': ot_number,
+                    'overall_status': overall_status,
+                    'ilrl_status': ilrl_status,
+                    'ilrl_date': ilrl_date,
+                    'ilrl_details': detalles_a_dict(ilrl_details),
+                    'geo_status': geo_status,
+                    'geo_date': geo_date,
+                    'geo_details': detalles_a_dict(geo_details)
+                }
+                cursor.execute(
+                    "INSERT INTO cola_envio_remoto (registro_id, payload_json) VALUES (?, ?)",
+                    (registro_id, json.dumps(payload, ensure_ascii=False))
+                )
         
             # Asegurarse de hacer commit explícito
             conn.commit()
+            self.metricas.observar("verificador_registro_bd_segundos", time.perf_counter() - inicio,
+                                   "Duración del registro de una verificación en la base (insert + acumulados + commit)")
+
+            if self.almacenamiento == "remoto":
+                self._evento_envio.set() # Despertar al hilo de envío
         
         except sqlite3.Error as e:
-            messagebox.showerror("Error de Base de Datos", 
+            self._notificar("error", "Error de Base de Datos", 
                             f"No se pudo registrar el resultado: {e}\n"
                             f"Base de datos: {os.path.abspath(self.db_name)}")
         finally:
             if conn:
                 conn.close()
 
+    def _iniciar_envio_remoto(self):
+        """Arranca el hilo que envía por lotes la cola pendiente al servidor de línea."""
+        if self.almacenamiento != "remoto" or (self._hilo_envio and self._hilo_envio.is_alive()):
+            return
+        self._hilo_envio = threading.Thread(target=self._bucle_envio_remoto, name="envio-remoto", daemon=True)
+        self._hilo_envio.start()
+
+    def _bucle_envio_remoto(self):
+        """Vacía la cola de envío mientras haya lotes completos; si el servidor no responde, reintenta más tarde."""
+        while True:
+            self._evento_envio.wait(INTERVALO_ENVIO_SEG)
+            self._evento_envio.clear()
+            try:
+                while self._enviar_lote_pendiente() == TAM_LOTE_ENVIO:
+                    pass
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                # Sin conexión: los registros quedan en la cola local (modo offline)
+                print(f"Servidor de verificaciones no disponible ({self.servidor_url}): {e}")
+                self._cerrar_conexion_remota()
+            except sqlite3.Error as e:
+                # Base local ocupada (p. ej. "database is locked"): la cola se vuelve a intentar en la próxima vuelta
+                print(f"No se pudo leer la cola de envío local: {e}")
+
+    def _obtener_conexion_remota(self):
+        """Devuelve la conexión HTTP persistente al servidor, creándola si hace falta."""
+        if self._conexion_remota is None:
+            url = urlparse(self.servidor_url)
+            self._conexion_remota = http.client.HTTPConnection(
+                url.hostname or "localhost", url.port or PUERTO_SERVIDOR_DEFECTO, timeout=10
+            )
+        return self._conexion_remota
+
+    def _cerrar_conexion_remota(self):
+        if self._conexion_remota is not None:
+            self._conexion_remota.close()
+            self._conexion_remota = None
+
+    def _enviar_lote_pendiente(self):
+        """
+        Envía al servidor un lote de la cola pendiente y lo elimina solo tras la confirmación.
+        Retorna: número de registros enviados.
+        """
+        conn = sqlite3.connect(self.db_name, check_same_thread=False)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, payload_json FROM cola_envio_remoto ORDER BY id LIMIT ?", (TAM_LOTE_ENVIO,))
+            pendientes = cursor.fetchall()
+            if not pendientes:
+                return 0
+
+            cuerpo = json.dumps({
+                'estacion': self.estacion,
+                'registros': [json.loads(p[1]) for p in pendientes]
+            }, ensure_ascii=False).encode('utf-8')
+
+            conexion = self._obtener_conexion_remota()
+            conexion.request("POST", "/verificaciones", body=cuerpo,
+                             headers={"Content-Type": "application/json"})
+            respuesta = conexion.getresponse()
+            respuesta.read() # Consumir el cuerpo para poder reutilizar la conexión
+            if respuesta.status != 200:
+                raise ValueError(f"respuesta HTTP {respuesta.status}")
+
+            # El servidor ignora duplicados (estacion, id_origen), así que reenviar tras un fallo es seguro
+            cursor.executemany("DELETE FROM cola_envio_remoto WHERE id = ?", [(p[0],) for p in pendientes])
+            conn.commit()
+            return len(pendientes)
+        finally:
+            conn.close()
+
+    def _contar_envios_pendientes(self):
+        """Cantidad de registros locales que aún no confirmó el servidor de línea."""
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_name, check_same_thread=False)
+            return conn.execute("SELECT COUNT(*) FROM cola_envio_remoto").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+        finally:
+            if conn:
+                conn.close()
+
+    def consultar_estado_actual(self, serial_number):
+        """Último veredicto registrado para un número de serie (búsqueda por clave primaria), o None."""
+        conn = sqlite3.connect(self.db_name, check_same_thread=False)
+        try:
+            conn.row_factory = sqlite3.Row
+            fila = conn.execute("SELECT * FROM cable_latest_status WHERE serial_number = ?",
+                                (serial_number.strip(),)).fetchone()
+            return dict(fila) if fila else None
+        finally:
+            conn.close()
+
+    def consultar_estado_ot(self, ot_number):
+        """Último veredicto de cada número de serie verificado de una OT (por índice de OT), ordenado por serie."""
+        conn = sqlite3.connect(self.db_name, check_same_thread=False)
+        try:
+            conn.row_factory = sqlite3.Row
+            filas = conn.execute("SELECT * FROM cable_latest_status WHERE ot_number = ? ORDER BY serial_number",
+                                 (ot_number.strip().upper(),)).fetchall()
+            return [dict(f) for f in filas]
+        finally:
+            conn.close()
+
+    def _iniciar_api(self):
+        """Arranca la API HTTP local (solo en este equipo) si hay un puerto configurado."""
+        if not self.api_puerto or self._servidor_api:
+            return
+        try:
+            self._servidor_api = crear_api_verificacion(self, "127.0.0.1", self.api_puerto)
+        except OSError as e:
+            print(f"No se pudo iniciar la API de verificación en el puerto {self.api_puerto}: {e}")
+            return
+        threading.Thread(target=self._servidor_api.serve_forever, daemon=True, name="api-verificacion").start()
+
+    def _iniciar_metricas(self):
+        """Arranca la escritura periódica del archivo de métricas si hay una ruta configurada."""
+        if not self.metricas_archivo or (self._hilo_metricas and self._hilo_metricas.is_alive()):
+            return
+        self._hilo_metricas = threading.Thread(target=self._bucle_metricas, name="metricas", daemon=True)
+        self._hilo_metricas.start()
+
+    def _bucle_metricas(self):
+        while True:
+            try:
+                self.escribir_metricas()
+            except (OSError, sqlite3.Error) as e:
+                print(f"No se pudo escribir el archivo de métricas: {e}")
+            time.sleep(INTERVALO_METRICAS_SEG)
+
+    def texto_metricas(self):
+        """Métricas actuales en formato de texto Prometheus/OpenMetrics."""
+        contadores = []
+        for clave, valor in dict(self.estadisticas_cache).items():
+            cache, _, evento = clave.rpartition('_') # 'geo_libro_aciertos' -> ('geo_libro', 'aciertos')
+            contadores.append(("verificador_cache_eventos_total", "Eventos de las cachés (aciertos, fallos, desalojos, escrituras)",
+                               {'cache': cache, 'evento': evento}, valor))
+        medidores = [("verificador_cola_escaneo_pendientes", "Escaneos en la cola esperando verificación", {}, self._pendientes_cola)]
+        en_cuarentena = defaultdict(int, {'ilrl': 0, 'geo': 0})
+        for _, libro in self.libros_en_cuarentena():
+            en_cuarentena[libro.tipo] += 1
+        medidores.extend(("verificador_libros_en_cuarentena", "Libros ilegibles que se omiten hasta que cambien",
+                          {'tipo': tipo}, cantidad) for tipo, cantidad in en_cuarentena.items())
+        if self.almacenamiento == "remoto":
+            conn = sqlite3.connect(self.db_name)
+            try:
+                pendientes = conn.execute("SELECT COUNT(*) FROM cola_envio_remoto").fetchone()[0]
+                medidores.append(("verificador_cola_envio_pendientes", "Registros pendientes de enviar al servidor de línea",
+                                  {}, pendientes))
+            except sqlite3.Error as e:
+                # Base ocupada (archivo, importación): este ciclo sale sin ese medidor, pero el archivo se escribe igual
+                print(f"Métricas sin cola de envío en este ciclo: {e}")
+            finally:
+                conn.close()
+        return self.metricas.texto(medidores, contadores)
+
+    def escribir_metricas(self):
+        """Escribe el archivo de métricas de forma atómica (temporal + rename), como exige el textfile collector."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.metricas_archivo)), exist_ok=True)
+        temporal = self.metricas_archivo + ".tmp"
+        with open(temporal, 'w', encoding="utf-8", newline="\n") as f:
+            f.write(self.texto_metricas())
+        os.replace(temporal, self.metricas_archivo)
+
+    def _bases_archivo(self):
+        """Bases mensuales del archivo histórico, de la más reciente a la más antigua."""
+        if not os.path.isdir(self.carpeta_archivo):
+            return []
+        return sorted((os.path.join(self.carpeta_archivo, nombre) for nombre in os.listdir(self.carpeta_archivo)
+                       if nombre.startswith(PREFIJO_ARCHIVO) and nombre.endswith(".db")), reverse=True)
+
+    def _primer_dia_mes(self, desplazamiento_meses):
+        """'AAAA-MM-01' del mes actual desplazado N meses (negativo = hacia atrás)."""
+        hoy = datetime.now()
+        meses = hoy.year * 12 + hoy.month - 1 + desplazamiento_meses
+        return f"{meses // 12:04d}-{meses % 12 + 1:02d}-01"
+
+    def archivar_registros(self, meses_retencion, convertir_base=False):
+        """
+        Mueve a la base mensual del archivo (CARPETA_ARCHIVO/cable_verifications_AAAA-MM.db) los registros
+        anteriores a los últimos `meses_retencion` meses completos, un mes por transacción (INSERT y DELETE
+        juntos: un corte no deja registros duplicados ni perdidos). Luego compacta la base activa.
+        El registro que es el último estado de su serie (cable_latest_status.last_entry_id) queda en la base activa,
+        así la vista "solo último estado" sigue mostrando todas las series; los acumulados no se tocan.
+        convertir_base: permite el VACUUM completo único de una base sin vacuum incremental (ver _compactar_base).
+        Retorna: dict mes ('AAAA-MM') -> registros archivados.
+        """
+        if meses_retencion < 1:
+            raise ValueError("Debe conservarse al menos el mes en curso (meses_retencion >= 1)")
+        corte = self._primer_dia_mes(-(meses_retencion - 1))
+        columnas = ", ".join(COLUMNAS_EXPORTACION) # Todas las columnas de cable_verifications
+        archivados = {}
+
+        os.makedirs(self.carpeta_archivo, exist_ok=True)
+        conn = sqlite3.connect(self.db_name, timeout=30)
+        try:
+            # Solo los meses con registros que se pueden mover (el último estado de cada serie se queda)
+            vigentes = "id NOT IN (SELECT last_entry_id FROM main.cable_latest_status)"
+            meses = [fila[0] for fila in conn.execute(f"""
+                SELECT DISTINCT substr(entry_date, 1, 7) FROM main.cable_verifications
+                WHERE entry_date < ? AND {vigentes} ORDER BY 1
+            """, (corte,))]
+            for mes in meses:
+                desde = f"{mes}-01"
+                anio, numero_mes = int(mes[:4]), int(mes[5:7])
+                hasta = f"{anio + numero_mes // 12:04d}-{numero_mes % 12 + 1:02d}-01"
+                ruta = os.path.join(self.carpeta_archivo, f"{PREFIJO_ARCHIVO}{mes}.db")
+
+                conn.execute("ATTACH DATABASE ? AS archivo", (ruta,))
+                try:
+                    conn.execute("""
+                        CREATE TABLE IF NOT EXISTS archivo.cable_verifications (
+                            id INTEGER PRIMARY KEY,
+                            entry_date TEXT NOT NULL,
+                            serial_number TEXT NOT NULL,
+                            ot_number TEXT NOT NULL,
+                            overall_status TEXT NOT NULL,
+                            ilrl_status TEXT,
+                            ilrl_date TEXT,
+                            geo_status TEXT,
+                            geo_date TEXT,
+                            ilrl_details_json TEXT,
+                            geo_details_json TEXT
+                        )
+                    """)
+                    conn.execute("CREATE INDEX IF NOT EXISTS archivo.idx_cv_serie ON cable_verifications (serial_number)")
+                    conn.execute("CREATE INDEX IF NOT EXISTS archivo.idx_cv_ot_fecha ON cable_verifications (ot_number, entry_date)")
+                    with conn: # Una transacción sobre ambas bases
+                        conn.execute(f"""
+                            INSERT OR IGNORE INTO archivo.cable_verifications ({columnas})
+                            SELECT {columnas} FROM main.cable_verifications
+                            WHERE entry_date >= ? AND entry_date < ? AND {vigentes}
+                        """, (desde, hasta))
+                        archivados[mes] = conn.execute(
+                            f"DELETE FROM main.cable_verifications WHERE entry_date >= ? AND entry_date < ? AND {vigentes}",
+                            (desde, hasta)
+                        ).rowcount
+                finally:
+                    conn.execute("DETACH DATABASE archivo")
+
+            if any(archivados.values()) or convertir_base:
+                self._compactar_base(conn, convertir_base)
+        finally:
+            conn.close()
+        return archivados
+
+    def _compactar_base(self, conn, convertir_base=False):
+        """
+        Devuelve al sistema las páginas libres de la base activa. Una base creada sin vacuum incremental solo se
+        convierte con convertir_base (VACUUM completo: bloquea la base, por eso solo desde el comando 'archivar',
+        nunca con la aplicación registrando escaneos).
+        """
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            if not convertir_base:
+                print("La base activa no tiene vacuum incremental: ejecute 'archivar' desde la línea de comandos "
+                      "con la aplicación cerrada para compactarla")
+                return
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        else:
+            # executescript ejecuta el pragma hasta el final (execute solo daría el primer paso: una página)
+            conn.executescript("PRAGMA incremental_vacuum;")
+
+    def _consultar_archivo(self, condicion, parametros, orden="entry_date DESC", limite=-1):
+        """
+        Busca en las bases mensuales del archivo (de la más reciente a la más antigua), adjuntándolas de a una
+        (SQLite limita la cantidad de bases adjuntas a la vez). Retorna: lista de filas completas.
+        """
+        filas = []
+        conn = sqlite3.connect(self.db_name)
+        try:
+            for ruta in self._bases_archivo():
+                conn.execute("ATTACH DATABASE ? AS archivo", (ruta,))
+                try:
+                    filas.extend(conn.execute(f"""
+                        SELECT {', '.join(COLUMNAS_EXPORTACION)} FROM archivo.cable_verifications
+                        WHERE {condicion} ORDER BY {orden} LIMIT ?
+                    """, (*parametros, limite)))
+                finally:
+                    conn.execute("DETACH DATABASE archivo")
+        finally:
+            conn.close()
+        return filas
+
+    def _archivar_al_inicio(self):
+        """Archivo automático según meses_retencion, en segundo plano para no demorar la apertura."""
+        if self.meses_retencion < 1:
+            return
+
+        def tarea():
+            try:
+                archivados = self.archivar_registros(self.meses_retencion)
+                if archivados:
+                    print(f"Archivo histórico: {sum(archivados.values())} registros movidos ({', '.join(archivados)})")
+            except (sqlite3.Error, OSError) as e:
+                print(f"No se pudo archivar el historial: {e}")
+        threading.Thread(target=tarea, daemon=True, name="archivo-historico").start()
+
+    def _ots_recientes(self, horas, limite):
+        """OTs verificadas en las últimas `horas`, de la más reciente a la más antigua: [(ot, última verificación)]."""
+        desde = (datetime.now() - timedelta(hours=horas)).strftime("%Y-%m-%d %H:%M:%S")
+        conn = sqlite3.connect(self.db_name)
+        try:
+            return conn.execute("""
+                SELECT ot_number, MAX(entry_date) AS ultima FROM cable_verifications
+                WHERE entry_date >= ? GROUP BY ot_number ORDER BY ultima DESC LIMIT ?
+            """, (desde, limite)).fetchall()
+        finally:
+            conn.close()
+
+    def precalentar(self, horas):
+        """
+        Deja listos los índices ILRL y la Geometría (lecturas por libro y fusión por OT) de las OTs verificadas en
+        las últimas `horas`, para que los primeros escaneos tras un reinicio no paguen las lecturas en frío.
+        Las OTs también vuelven a la lista de activas, así el espejo local las copia. Retorna: OTs precargadas.
+        """
+        recientes = self._ots_recientes(horas, min(MAX_OTS_GEO_CACHE, MAX_OTS_ESPEJO))
+        precargadas = []
+        for ot, ultima in reversed(recientes): # La más reciente al final: queda primera en las cachés LRU
+            try:
+                self._ots_activas.setdefault(ot, datetime.strptime(ultima, "%Y-%m-%d %H:%M:%S"))
+                self._indice_ilrl_ot(ot)
+                self.resultados_geo_ot(ot)
+            except Exception as e: # Una OT que falla no debe dejar sin precargar a las demás
+                print(f"No se pudo precargar la OT {ot}: {e}")
+                continue
+            self.estadisticas_cache['precalentamiento_ots'] += 1
+            precargadas.append(ot)
+        if precargadas and self.espejo_local:
+            self._evento_espejo.set() # Copiar ya las carpetas de estas OTs al espejo local
+        return precargadas
+
+    def _precalentar_al_inicio(self):
+        """Arranque en caliente según horas_precalentamiento, en segundo plano para no demorar la interfaz."""
+        if self.horas_precalentamiento <= 0:
+            return
+
+        def tarea():
+            inicio = time.perf_counter()
+            try:
+                precargadas = self.precalentar(self.horas_precalentamiento)
+                if precargadas:
+                    print(f"Arranque en caliente: {len(precargadas)} OTs precargadas en {time.perf_counter() - inicio:.1f} s")
+            except sqlite3.Error as e:
+                print(f"No se pudo precargar la actividad reciente: {e}")
+        threading.Thread(target=tarea, daemon=True, name="precalentamiento").start()
+
+    def mostrar_dialogo_archivo(self, parent=None):
+        """Pide los meses a conservar y archiva en segundo plano."""
+        meses = simpledialog.askinteger("Archivar Registros",
+                                        "Meses completos a conservar en la base activa\n"
+                                        "(los anteriores se mueven al archivo histórico mensual):",
+                                        initialvalue=self.meses_retencion or 6, minvalue=1, parent=parent or self.root)
+        if not meses:
+            return
+        if not messagebox.askyesno("Confirmar Archivo",
+                                   f"Se moverán al archivo los registros anteriores a {self._primer_dia_mes(-(meses - 1))}.\n"
+                                   f"Seguirán disponibles con \"Buscar también en archivo\".\n\n¿Continuar?", parent=parent):
+            return
+
+        def tarea():
+            try:
+                archivados = self.archivar_registros(meses)
+                mensaje = (f"Se archivaron {sum(archivados.values())} registros en {len(archivados)} bases mensuales."
+                           if archivados else "No hay registros anteriores a ese período.")
+                self._notificar("info", "Archivo Completo", mensaje)
+                if hasattr(self, 'tree_registros'):
+                    self._en_hilo_ui(self.aplicar_filtro_registros)
+            except (sqlite3.Error, OSError) as e:
+                self._notificar("error", "Error de Archivo", f"No se pudo archivar: {e}")
+        threading.Thread(target=tarea, daemon=True).start()
+
+    def _reevaluar_detalles(self, ilrl_detalles, geo_detalles):
+        """
+        Aplica las reglas vigentes a los detalles guardados de un registro (sin leer archivos).
+        Retorna: (estado_general, resultado_ilrl, resultado_geo, ilrl_detalles, geo_detalles) actualizados.
+        """
+        if ilrl_detalles is None:
+            resultado_ilrl = "NO ENCONTRADO" # No había archivos ILRL para la serie
+        else:
+            resultado_ilrl, fecha_ilrl, consolidados = self._consolidar_detalles_ilrl(list(ilrl_detalles.puntas))
+            if consolidados:
+                ilrl_detalles = DetallesILRL(resultado_ilrl, fecha_ilrl, tuple(consolidados))
+
+        if geo_detalles is None:
+            resultado_geo = "NO ENCONTRADO"
+        else:
+            resultado_geo = self._estado_geo(self._ultima_medicion_por_punta(
+                (m.punta, m.resultado == 'PASS',
+                 datetime.strptime(m.timestamp, FECHA_DETALLE_GEO) if m.timestamp not in (None, 'N/A') else None)
+                for m in geo_detalles.puntas
+            ))
+            geo_detalles = geo_detalles._replace(resultado=resultado_geo)
+
+        return (self._estado_general(resultado_ilrl, resultado_geo), resultado_ilrl, resultado_geo,
+                ilrl_detalles, geo_detalles)
+
+    def reevaluar_registros(self, simular=False, tam_lote=TAM_LOTE_REEVALUACION):
+        """
+        Recalcula los veredictos de cable_verifications con las reglas vigentes a partir de los detalles por punta
+        guardados. Recorre la tabla por lotes de id (una transacción por lote) y solo escribe los registros cuyo
+        veredicto cambia: el registro, su auditoría, los acumulados (resta el veredicto anterior y suma el nuevo)
+        y el último estado de la serie. simular=True solo cuenta los cambios.
+        Retorna: dict con 'revisados', 'cambiados' y 'transiciones' {(anterior, nuevo): cantidad}.
+        """
+        ejecucion = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        resumen = {'revisados': 0, 'cambiados': 0, 'transiciones': defaultdict(int)}
+        ultimo_id = 0
+
+        conn = sqlite3.connect(self.db_name, timeout=30)
+        try:
+            cursor = conn.cursor()
+            while True:
+                # Paginación por id: no queda un cursor de lectura abierto mientras se escribe
+                filas = cursor.execute("""
+                    SELECT id, entry_date, serial_number, ot_number, overall_status, ilrl_status, geo_status,
+                           ilrl_details_json, geo_details_json
+                    FROM cable_verifications WHERE id > ? ORDER BY id LIMIT ?
+                """, (ultimo_id, tam_lote)).fetchall()
+                if not filas:
+                    break
+                ultimo_id = filas[-1][0]
+
+                cambios = []
+                for registro_id, entry_date, serie, ot, overall, ilrl, geo, ilrl_blob, geo_blob in filas:
+                    ilrl_detalles, geo_detalles = decodificar_detalles(ilrl_blob), decodificar_detalles(geo_blob)
+                    nuevo = self._reevaluar_detalles(ilrl_detalles, geo_detalles)
+                    if nuevo[:3] != (overall, ilrl, geo):
+                        cambios.append((registro_id, entry_date, serie, ot, (overall, ilrl, geo), nuevo))
+                resumen['revisados'] += len(filas)
+                resumen['cambiados'] += len(cambios)
+                for *_, anterior, nuevo in cambios:
+                    resumen['transiciones'][(anterior[0], nuevo[0])] += 1
+                if simular or not cambios:
+                    continue
+
+                with conn: # Un lote = una transacción
+                    cursor.executemany("""
+                        UPDATE cable_verifications
+                        SET overall_status = ?, ilrl_status = ?, geo_status = ?, ilrl_details_json = ?, geo_details_json = ?
+                        WHERE id = ?
+                    """, [(n[0], n[1], n[2], codificar_detalles(n[3]), codificar_detalles(n[4]), registro_id)
+                          for registro_id, _, _, _, _, n in cambios])
+                    cursor.executemany("""
+                        INSERT INTO reevaluacion_auditoria (ejecucion, registro_id, serial_number,
+                            overall_anterior, overall_nuevo, ilrl_anterior, ilrl_nuevo, geo_anterior, geo_nuevo)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, [(ejecucion, registro_id, serie, a[0], n[0], a[1], n[1], a[2], n[2])
+                          for registro_id, _, serie, _, a, n in cambios])
+                    for registro_id, entry_date, _, ot, anterior, nuevo in cambios:
+                        self._acumular_rollup(cursor, entry_date, ot, *anterior, signo=-1)
+                        self._acumular_rollup(cursor, entry_date, ot, *nuevo[:3])
+                    cursor.executemany("""
+                        UPDATE cable_latest_status SET overall_status = ?, ilrl_status = ?, geo_status = ?
+                        WHERE last_entry_id = ?
+                    """, [(n[0], n[1], n[2], registro_id) for registro_id, _, _, _, _, n in cambios])
+        finally:
+            conn.close()
+
+        resumen['transiciones'] = dict(resumen['transiciones'])
+        return resumen
+
+    def _archivos_historicos(self, tipos=('ilrl', 'geo')):
+        """
+        Recorre todas las raíces: cada carpeta de OT ILRL (y su subcarpeta F) y las carpetas de Geometría.
+        Retorna: lista de (tipo, ruta, ot, retrabajo).
+        """
+        archivos = []
+        if 'ilrl' in tipos:
+            for raiz in self.rutas_ilrl:
+                try:
+                    carpetas_ot = [e for e in os.scandir(raiz) if e.is_dir()]
+                except OSError as e:
+                    print(f"Raíz ILRL no disponible {raiz}: {e}")
+                    continue
+                for carpeta_ot in carpetas_ot:
+                    for retrabajo, carpeta in enumerate((carpeta_ot.path, os.path.join(carpeta_ot.path, "F"))):
+                        if not os.path.isdir(carpeta):
+                            continue
+                        for f in self._preferir_csv([f for f in os.listdir(carpeta) if self._es_archivo_estacion(f)]):
+                            if any(x in f.upper() for x in ['-SC-', '-LC-', '-SCLC-', '-LCSC-']): # Mismo criterio que el índice
+                                archivos.append(('ilrl', os.path.join(carpeta, f), carpeta_ot.name, retrabajo))
+        if 'geo' in tipos:
+            for raiz in self.rutas_geo:
+                try:
+                    nombres = [f for f in os.listdir(raiz) if self._es_archivo_estacion(f)]
+                except OSError as e:
+                    print(f"Raíz de Geometría no disponible {raiz}: {e}")
+                    continue
+                archivos.extend(('geo', os.path.join(raiz, f), None, 0) for f in self._preferir_csv(nombres))
+        return archivos
+
+    def importar_historico(self, procesos=None, tipos=('ilrl', 'geo'), progreso=None):
+        """
+        Carga en la base las mediciones por punta de todos los libros ILRL y de Geometría de las raíces configuradas.
+        Los archivos se interpretan en paralelo en un pool de procesos con los mismos lectores de la verificación
+        y se insertan con executemany, una transacción cada TAM_LOTE_IMPORTACION archivos. Es reanudable: se
+        omiten los archivos ya importados con la misma ruta, mtime y tamaño; los que cambiaron se reemplazan.
+        progreso(hechos, total), si se indica, se llama después de cada transacción.
+        Retorna: dict con 'archivos', 'omitidos', 'importados', 'sin_datos' y 'mediciones'.
+        """
+        conn = sqlite3.connect(self.db_name, timeout=30)
+        try:
+            importados = {ruta: (mtime, tamano) for ruta, mtime, tamano in
+                          conn.execute("SELECT ruta, mtime, tamano FROM importacion_archivos")}
+            todos = self._archivos_historicos(tipos)
+            pendientes = []
+            for tipo, ruta, ot, retrabajo in todos:
+                firma = self._firma_archivo(ruta)
+                if firma and importados.get(ruta) != firma:
+                    pendientes.append((tipo, ruta, ot, retrabajo, firma))
+
+            resumen = {'archivos': len(todos), 'omitidos': len(todos) - len(pendientes),
+                       'importados': 0, 'sin_datos': 0, 'mediciones': 0}
+            if not pendientes:
+                return resumen
+
+            lote = []
+            def guardar_lote():
+                with conn: # Una transacción por lote de archivos
+                    for tabla in ('mediciones_ilrl', 'mediciones_geo'):
+                        conn.executemany(f"DELETE FROM {tabla} WHERE ruta = ?",
+                                         [(r['ruta'],) for r in lote if r['ruta'] in importados])
+                    conn.executemany("INSERT INTO mediciones_ilrl VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                     [m for r in lote if r['tipo'] == 'ilrl' for m in r['mediciones']])
+                    conn.executemany("INSERT INTO mediciones_geo VALUES (?, ?, ?, ?, ?)",
+                                     [m for r in lote if r['tipo'] == 'geo' for m in r['mediciones']])
+                    ahora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    conn.executemany("INSERT OR REPLACE INTO importacion_archivos VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                     [(r['ruta'], r['tipo'], r['firma'][0], r['firma'][1], len(r['mediciones']),
+                                       'IMPORTADO' if r['mediciones'] else 'SIN DATOS', ahora) for r in lote])
+                for r in lote:
+                    resumen['importados' if r['mediciones'] else 'sin_datos'] += 1
+                    resumen['mediciones'] += len(r['mediciones'])
+                lote.clear()
+                if progreso:
+                    progreso(resumen['importados'] + resumen['sin_datos'], len(pendientes))
+
+            with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso_importacion,
+                                     initargs=(self.db_name, self.cache_compartida)) as pool:
+                for resultado in pool.map(_interpretar_para_importacion, pendientes, chunksize=CHUNK_IMPORTACION):
+                    lote.append(resultado)
+                    if len(lote) >= TAM_LOTE_IMPORTACION:
+                        guardar_lote()
+            if lote:
+                guardar_lote()
+            return resumen
+        finally:
+            conn.close()
+
+    def solicitar_contrasena_reevaluar(self, parent=None):
+        """Reevalúa los registros guardados (protegido con contraseña: cambia veredictos) en segundo plano."""
+        password_ingresada = simpledialog.askstring("Contraseña Requerida", 
+                                                     "Ingrese la contraseña para reevaluar los registros:", 
+                                                     show='*', parent=parent)
+        if password_ingresada != self.password:
+            if password_ingresada is not None:
+                messagebox.showerror("Acceso Denegado", "Contraseña incorrecta.")
+            return
+        if not messagebox.askyesno("Confirmar Reevaluación",
+                                   "Se recalcularán los veredictos de todos los registros con las reglas actuales,\n"
+                                   "usando los detalles por punta guardados (sin leer archivos).\n"
+                                   "Los cambios quedan en la tabla de auditoría.\n\n¿Continuar?", parent=parent):
+            return
+
+        def tarea():
+            try:
+                resumen = self.reevaluar_registros()
+                detalle = "\n".join(f"   • {a} → {n}: {c}" for (a, n), c in sorted(resumen['transiciones'].items()))
+                self._notificar("info", "Reevaluación Completa",
+                                f"Registros revisados: {resumen['revisados']}\n"
+                                f"Veredictos cambiados: {resumen['cambiados']}" + (f"\n{detalle}" if detalle else ""))
+                if hasattr(self, 'tree_registros'):
+                    self._en_hilo_ui(self.aplicar_filtro_registros)
+            except sqlite3.Error as e:
+                self._notificar("error", "Error de Base de Datos", f"No se pudo reevaluar: {e}")
+        threading.Thread(target=tarea, daemon=True).start()
+
     def verificar_ruta_db(self):
         """Muestra la ruta real de la base de datos para diagnóstico."""
         ruta_absoluta = os.path.abspath(self.db_name)
+        info_remoto = ""
+        if self.almacenamiento == "remoto":
+            info_remoto = (
+                f"\n\nServidor de línea: {self.servidor_url} (estación: {self.estacion})\n"
+                f"Registros pendientes de envío: {self._contar_envios_pendientes()}"
+            )
         messagebox.showinfo(
             "Ubicación de la Base de Datos",
             f"La base de datos se está guardando en:\n\n{ruta_absoluta}\n\n"
             f"Tamaño del archivo: {os.path.getsize(self.db_name) if os.path.exists(self.db_name) else 0} bytes"
+            f"{info_remoto}"
         )
 
     def cargar_rutas(self):
@@ -143,10 +1456,20 @@ class VerificadorCables:
             try:
                 with open(self.config_file, 'r') as f:
                     config = json.load(f)
-                    self.ruta_base_ilrl = config.get('ruta_ilrl', self.ruta_base_ilrl)
-                    self.ruta_base_geo = config.get('ruta_geo', self.ruta_base_geo)
+                    # 'rutas_ilrl'/'rutas_geo' (listas); 'ruta_ilrl'/'ruta_geo' de configuraciones anteriores
+                    self.rutas_ilrl = list(config.get('rutas_ilrl') or [config.get('ruta_ilrl', self.ruta_base_ilrl)])
+                    self.rutas_geo = list(config.get('rutas_geo') or [config.get('ruta_geo', self.ruta_base_geo)])
+                    self.almacenamiento = config.get('almacenamiento', self.almacenamiento)
+                    self.servidor_url = config.get('servidor_url', self.servidor_url)
+                    self.estacion = config.get('estacion', self.estacion)
+                    self.espejo_local = config.get('espejo_local', self.espejo_local)
+                    self.meses_retencion = int(config.get('meses_retencion', self.meses_retencion))
+                    self.horas_precalentamiento = float(config.get('horas_precalentamiento', self.horas_precalentamiento))
+                    self.api_puerto = int(config.get('api_puerto', self.api_puerto))
+                    self.cache_compartida = bool(config.get('cache_compartida', self.cache_compartida))
+                    self.metricas_archivo = config.get('metricas_archivo', self.metricas_archivo)
             except Exception as e:
-                messagebox.showerror("Error de Configuración", f"No se pudo cargar la configuración: {e}. Usando rutas por defecto.")
+                self._notificar("error", "Error de Configuración", f"No se pudo cargar la configuración: {e}. Usando rutas por defecto.")
                 self.guardar_rutas() # Guardar rutas por defecto si falla la carga
         else:
             self.guardar_rutas() # Guardar las rutas por defecto si el archivo no existe
@@ -154,15 +1477,184 @@ class VerificadorCables:
     def guardar_rutas(self):
         """Guarda las rutas actuales en un archivo de configuración JSON."""
         config = {
-            'ruta_ilrl': self.ruta_base_ilrl,
-            'ruta_geo': self.ruta_base_geo
+            'ruta_ilrl': self.ruta_base_ilrl, # Raíz principal (compatibilidad con versiones anteriores)
+            'ruta_geo': self.ruta_base_geo,
+            'rutas_ilrl': self.rutas_ilrl,
+            'rutas_geo': self.rutas_geo,
+            'almacenamiento': self.almacenamiento,
+            'servidor_url': self.servidor_url,
+            'estacion': self.estacion,
+            'espejo_local': self.espejo_local,
+            'meses_retencion': self.meses_retencion,
+            'horas_precalentamiento': self.horas_precalentamiento,
+            'api_puerto': self.api_puerto,
+            'cache_compartida': self.cache_compartida,
+            'metricas_archivo': self.metricas_archivo
         }
         try:
             with open(self.config_file, 'w') as f:
                 json.dump(config, f, indent=4)
-            messagebox.showinfo("Configuración Guardada", "Las rutas se han guardado correctamente.")
+            self._notificar("info", "Configuración Guardada", "Las rutas se han guardado correctamente.")
         except Exception as e:
-            messagebox.showerror("Error al Guardar", f"No se pudieron guardar las rutas: {e}")
+            self._notificar("error", "Error al Guardar", f"No se pudieron guardar las rutas: {e}")
+
+    def _iterar_registros(self, fecha_desde=None, fecha_hasta=None, ot=None, incluir_archivo=False):
+        """
+        Generador que recorre cable_verifications con un cursor, bloque a bloque,
+        sin materializar el resultado completo en memoria.
+        fecha_desde/fecha_hasta: 'YYYY-MM-DD' (ambas inclusive). ot: número de OT exacto.
+        incluir_archivo: recorre antes las bases mensuales del archivo (de la más antigua a la más reciente).
+        """
+        condiciones = []
+        parametros = []
+        if fecha_desde:
+            condiciones.append("entry_date >= ?")
+            parametros.append(fecha_desde)
+        if fecha_hasta:
+            condiciones.append("entry_date <= ?")
+            # Una fecha sin hora incluye el día completo
+            parametros.append(f"{fecha_hasta} 23:59:59" if len(fecha_hasta) == 10 else fecha_hasta)
+        if ot:
+            condiciones.append("ot_number = ?")
+            parametros.append(ot.strip().upper())
+
+        sql = f"SELECT {', '.join(COLUMNAS_EXPORTACION)} FROM {{tabla}}"
+        if condiciones:
+            sql += " WHERE " + " AND ".join(condiciones)
+        sql += " ORDER BY entry_date, id"
+
+        def recorrer(tabla):
+            cursor = conn.execute(sql.format(tabla=tabla), parametros)
+            cursor.arraysize = TAM_BLOQUE_EXPORTACION
+            while True:
+                filas = cursor.fetchmany()
+                if not filas:
+                    break
+                yield from filas
+
+        conn = sqlite3.connect(self.db_name, check_same_thread=False)
+        try:
+            if incluir_archivo:
+                for ruta in reversed(self._bases_archivo()):
+                    conn.execute("ATTACH DATABASE ? AS archivo", (ruta,))
+                    try:
+                        yield from recorrer("archivo.cable_verifications")
+                    finally:
+                        conn.execute("DETACH DATABASE archivo")
+            yield from recorrer("main.cable_verifications")
+        finally:
+            conn.close()
+
+    def exportar_registros(self, ruta_salida, formato=None, fecha_desde=None, fecha_hasta=None, ot=None, incluir_archivo=False):
+        """
+        Exporta los registros (con los detalles por punta ILRL/Geometría) a CSV, XLSX o JSON Lines.
+        Las filas se escriben a medida que se leen del cursor: la memoria no depende del volumen.
+        Retorna: número de registros exportados.
+        """
+        formato = (formato or os.path.splitext(ruta_salida)[1].lstrip('.')).lower()
+        if formato not in FORMATOS_EXPORTACION:
+            raise ValueError(f"Formato de exportación no soportado: '{formato}' (use {', '.join(FORMATOS_EXPORTACION)})")
+
+        filas = self._iterar_registros(fecha_desde, fecha_hasta, ot, incluir_archivo)
+        total = 0
+
+        if formato == 'csv':
+            with open(ruta_salida, 'w', newline='', encoding='utf-8-sig') as f: # BOM para que Excel respete los acentos
+                escritor = csv.writer(f)
+                escritor.writerow(COLUMNAS_EXPORTACION)
+                for fila in filas:
+                    escritor.writerow(self._fila_exportable(fila))
+                    total += 1
+
+        elif formato == 'jsonl':
+            with open(ruta_salida, 'w', encoding='utf-8') as f:
+                for fila in filas:
+                    registro = dict(zip(COLUMNAS_EXPORTACION[:9], fila[:9]))
+                    registro['ilrl_details'] = detalles_a_dict(decodificar_detalles(fila[9]))
+                    registro['geo_details'] = detalles_a_dict(decodificar_detalles(fila[10]))
+                    f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                    total += 1
+
+        else: # xlsx
+            from openpyxl import Workbook # Solo se necesita para este formato
+            libro = Workbook(write_only=True) # Modo streaming: las filas se vuelcan a disco al agregarse
+            hoja = libro.create_sheet("cable_verifications")
+            hoja.append(COLUMNAS_EXPORTACION)
+            for fila in filas:
+                hoja.append(self._fila_exportable(fila))
+                total += 1
+            libro.save(ruta_salida)
+
+        return total
+
+    def _fila_exportable(self, fila):
+        """Fila para CSV/XLSX: los detalles compactos se exportan como el JSON legible de siempre."""
+        def como_json(valor):
+            if isinstance(valor, bytes):
+                return json.dumps(detalles_a_dict(decodificar_detalles(valor)), ensure_ascii=False)
+            return valor
+        return fila[:9] + (como_json(fila[9]), como_json(fila[10]))
+
+    def mostrar_dialogo_exportacion(self, parent=None):
+        """Ventana para exportar registros filtrando por rango de fechas y OT."""
+        export_window = tk.Toplevel(parent or self.root)
+        export_window.title("Exportar Registros")
+        export_window.geometry("420x260")
+        export_window.transient(parent or self.root)
+        export_window.grab_set()
+
+        frame = ttk.Frame(export_window, padding=(20, 20), style="TFrame")
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(frame, text="Desde (AAAA-MM-DD):", font=("Arial", 10, "bold"), foreground="#2C3E50").grid(row=0, column=0, sticky=tk.W, pady=5)
+        desde_entry = ttk.Entry(frame, width=20, font=("Arial", 10), style="TEntry")
+        desde_entry.insert(0, datetime.now().replace(day=1).strftime("%Y-%m-%d"))
+        desde_entry.grid(row=0, column=1, pady=5, padx=10, sticky="ew")
+
+        ttk.Label(frame, text="Hasta (AAAA-MM-DD):", font=("Arial", 10, "bold"), foreground="#2C3E50").grid(row=1, column=0, sticky=tk.W, pady=5)
+        hasta_entry = ttk.Entry(frame, width=20, font=("Arial", 10), style="TEntry")
+        hasta_entry.insert(0, datetime.now().strftime("%Y-%m-%d"))
+        hasta_entry.grid(row=1, column=1, pady=5, padx=10, sticky="ew")
+
+        ttk.Label(frame, text="OT (opcional):", font=("Arial", 10, "bold"), foreground="#2C3E50").grid(row=2, column=0, sticky=tk.W, pady=5)
+        ot_entry = ttk.Entry(frame, width=20, font=("Arial", 10), style="TEntry")
+        ot_entry.grid(row=2, column=1, pady=5, padx=10, sticky="ew")
+
+        ttk.Label(frame, text="Formato:", font=("Arial", 10, "bold"), foreground="#2C3E50").grid(row=3, column=0, sticky=tk.W, pady=5)
+        formato_combo = ttk.Combobox(frame, values=FORMATOS_EXPORTACION, state="readonly", width=10)
+        formato_combo.set('csv')
+        formato_combo.grid(row=3, column=1, pady=5, padx=10, sticky="w")
+
+        def exportar():
+            desde = desde_entry.get().strip() or None
+            hasta = hasta_entry.get().strip() or None
+            for valor in (desde, hasta):
+                if valor:
+                    try:
+                        datetime.strptime(valor, "%Y-%m-%d")
+                    except ValueError:
+                        messagebox.showwarning("Fecha Inválida", f"'{valor}' no tiene el formato AAAA-MM-DD.", parent=export_window)
+                        return
+            formato = formato_combo.get()
+            ruta = filedialog.asksaveasfilename(parent=export_window, defaultextension=f".{formato}",
+                                                filetypes=[(formato.upper(), f"*.{formato}")],
+                                                initialfile=f"cable_verifications_{desde or 'inicio'}_{hasta or 'hoy'}.{formato}")
+            if not ruta:
+                return
+            ot = ot_entry.get().strip() or None
+            export_window.destroy()
+
+            # La exportación corre en segundo plano; el resultado se informa desde el hilo de Tk
+            def tarea():
+                try:
+                    total = self.exportar_registros(ruta, formato, desde, hasta, ot)
+                    self._en_hilo_ui(lambda: messagebox.showinfo("Exportación Completa", f"Se exportaron {total} registros a:\n{ruta}"))
+                except Exception as e:
+                    self._en_hilo_ui(lambda e=e: messagebox.showerror("Error de Exportación", f"No se pudo exportar: {e}"))
+            threading.Thread(target=tarea, name="exportacion", daemon=True).start()
+
+        ttk.Button(frame, text="📤 Exportar", command=exportar, style="Primary.TButton").grid(row=4, column=0, columnspan=2, pady=20)
+        frame.columnconfigure(1, weight=1)
 
     def extraer_clave_ilrl(self, archivo):
         """Método mejorado para extraer clave de archivo ILRL"""
@@ -180,7 +1672,453 @@ class VerificadorCables:
             return f"{m.group(1)}-{m.group(2)}"
         return None
 
+    def _estilos_fecha_xlsx(self, libro_zip):
+        """
+        Índices de estilo (cellXfs) cuyo formato numérico es de fecha/hora.
+        Retorna: {indice_estilo: es_duracion} (las duraciones tipo [h]:mm se convierten a timedelta).
+        """
+        try:
+            raiz = ET.fromstring(libro_zip.read("xl/styles.xml"))
+        except KeyError:
+            return {}
+        formatos = {int(nf.get("numFmtId")): nf.get("formatCode", "")
+                    for nf in raiz.iter(f"{NS_XLSX}numFmt")}
+        estilos = {}
+        cell_xfs = raiz.find(f"{NS_XLSX}cellXfs")
+        for indice, xf in enumerate(cell_xfs if cell_xfs is not None else []):
+            num_fmt = int(xf.get("numFmtId", 0))
+            if num_fmt in FORMATOS_FECHA_INTEGRADOS:
+                estilos[indice] = False
+            elif num_fmt in formatos:
+                codigo = formatos[num_fmt]
+                es_duracion = bool(re.search(r'\[[hms]+\]', codigo, re.I))
+                # Quitar literales, colores/condiciones y escapes antes de buscar tokens de fecha
+                limpio = re.sub(r'"[^"]*"|\[[^\]]*\]|\\.', '', codigo)
+                if es_duracion or re.search(r'[dmyhs]', limpio, re.I):
+                    estilos[indice] = es_duracion
+        return estilos
+
+    def _fecha_desde_serial_excel(self, valor, fecha_1904=False, es_duracion=False):
+        """Convierte un número de serie de Excel a datetime/time/timedelta (mismas reglas que openpyxl)."""
+        if es_duracion:
+            return timedelta(days=valor)
+        dia, fraccion = divmod(valor, 1)
+        diferencia = timedelta(milliseconds=round(fraccion * 86400000))
+        if 0 <= valor < 1 and diferencia.days == 0:
+            return (datetime.min + diferencia).time() # Solo hora
+        if fecha_1904:
+            return datetime(1904, 1, 1) + timedelta(days=dia) + diferencia
+        if 0 < valor < 60:
+            dia += 1 # Excel considera 1900 bisiesto: las fechas antes del 1/3/1900 van corridas un día
+        return datetime(1899, 12, 30) + timedelta(days=dia) + diferencia
+
+    def _es_archivo_estacion(self, nombre):
+        """True para exportaciones de estación (xlsx, CSV o TSV), excluyendo los temporales de Excel (~$)."""
+        return nombre.lower().endswith(EXTENSIONES_ESTACION) and not nombre.startswith('~$')
+
+    def _preferir_csv(self, nombres):
+        """
+        De los archivos de una carpeta deja uno por corrida (mismo nombre sin extensión),
+        el del formato preferido según EXTENSIONES_ESTACION. Conserva el orden original.
+        """
+        elegido = {}
+        for nombre in nombres:
+            base, extension = os.path.splitext(nombre)
+            actual = elegido.get(base)
+            if actual is None or EXTENSIONES_ESTACION.index(extension.lower()) < EXTENSIONES_ESTACION.index(os.path.splitext(actual)[1].lower()):
+                elegido[base] = nombre
+        preferidos = set(elegido.values())
+        return [nombre for nombre in nombres if nombre in preferidos]
+
+    def _detectar_delimitador(self, lineas):
+        """
+        Separador de un CSV a partir de sus filas de datos: el que aparece en todas ellas el mayor número de veces
+        (con ';', el de Excel en configuración regional española, las comas decimales aparecen menos). ',' si no hay datos.
+        """
+        lineas = [linea for linea in lineas if linea.strip()]
+        cuentas = {d: min((linea.count(d) for linea in lineas), default=0) for d in DELIMITADORES_CSV}
+        mejor = max(cuentas, key=cuentas.get)
+        return mejor if cuentas[mejor] else ','
+
+    def _leer_filas_csv(self, ruta, columnas, inicio=FILAS_ENCABEZADO):
+        """
+        Lector de exportaciones CSV/TSV con el mismo diseño que los libros (12 filas de encabezado, columnas fijas).
+        Recorre el archivo en streaming con el módulo csv; el separador se detecta (',' ';' o tabulador) y las
+        celdas con fecha se convierten a datetime para que los lectores ILRL/Geometría las traten igual que en el xlsx.
+        Retorna: lista de filas; cada fila es una lista indexada por número de columna (None si la celda está vacía).
+        """
+        columnas = sorted(set(columnas))
+        ancho = max(columnas) + 1
+        formato_columna = {} # Último formato de fecha que sirvió en cada columna (se prueba primero)
+
+        def convertir(texto, columna):
+            texto = texto.strip()
+            if not texto:
+                return None
+            if texto[0].isdigit() and ('-' in texto or '/' in texto):
+                formatos = FORMATOS_FECHA_CSV
+                if columna in formato_columna:
+                    formatos = (formato_columna[columna],) + formatos
+                for formato in formatos:
+                    try:
+                        valor = datetime.strptime(texto.split('.')[0], formato)
+                    except ValueError:
+                        continue
+                    formato_columna[columna] = formato
+                    return valor
+            return texto
+
+        for codificacion in CODIFICACIONES_CSV:
+            try:
+                with open(ruta, newline='', encoding=codificacion) as f:
+                    if ruta.lower().endswith('.tsv'):
+                        delimitador = '\t'
+                    else:
+                        # Solo filas de datos: el encabezado libre (y las comas decimales) confunden la detección
+                        muestra = [linea for _, linea in zip(range(inicio + 20), f)][inicio:]
+                        f.seek(0)
+                        delimitador = self._detectar_delimitador(muestra)
+                    filas = []
+                    for numero_fila, valores in enumerate(csv.reader(f, delimiter=delimitador), start=1):
+                        if numero_fila <= inicio:
+                            continue
+                        fila = [None] * ancho
+                        for c in columnas:
+                            if c < len(valores):
+                                fila[c] = convertir(valores[c], c)
+                        filas.append(fila)
+                    return filas
+            except UnicodeDecodeError:
+                continue
+        raise ValueError(f"Codificación no reconocida en {os.path.basename(ruta)}")
+
+    def _leer_filas_xlsx(self, ruta, columnas, inicio=FILAS_ENCABEZADO):
+        """
+        Lector ligero para el diseño fijo de los libros de estación: abre el zip, resuelve las cadenas compartidas
+        y recorre en streaming (iterparse) solo la primera hoja, desde la fila inicio+1 y solo con las columnas pedidas.
+        Retorna: lista de filas; cada fila es una lista indexada por número de columna (None si la celda está vacía).
+        """
+        columnas = set(columnas)
+        ancho = max(columnas) + 1
+        filas = []
+        with zipfile.ZipFile(ruta) as libro_zip:
+            # Ubicar la primera hoja a través de workbook.xml y sus relaciones
+            libro = ET.fromstring(libro_zip.read("xl/workbook.xml"))
+            primera_hoja = libro.find(f"{NS_XLSX}sheets/{NS_XLSX}sheet")
+            id_relacion = primera_hoja.get(f"{NS_RELACIONES}id")
+            propiedades = libro.find(f"{NS_XLSX}workbookPr")
+            fecha_1904 = propiedades is not None and propiedades.get("date1904") in ("1", "true")
+            relaciones = ET.fromstring(libro_zip.read("xl/_rels/workbook.xml.rels"))
+            destino = next(r.get("Target") for r in relaciones.iter(f"{NS_PAQUETE}Relationship") if r.get("Id") == id_relacion)
+            ruta_hoja = destino.lstrip("/") if destino.startswith("/") else "xl/" + destino
+
+            cadenas = []
+            if "xl/sharedStrings.xml" in libro_zip.namelist():
+                with libro_zip.open("xl/sharedStrings.xml") as f:
+                    for _, elem in ET.iterparse(f):
+                        if elem.tag == f"{NS_XLSX}si":
+                            # Texto completo de la cadena (incluye runs con formato), sin la guía fonética
+                            cadenas.append("".join(t.text or "" for t in elem.iter(f"{NS_XLSX}t")
+                                                   if t not in elem.findall(f".//{NS_XLSX}rPh/{NS_XLSX}t")))
+                            elem.clear()
+
+            estilos_fecha = self._estilos_fecha_xlsx(libro_zip)
+
+            indices_columna = {} # Memo de letras de columna ("H") -> índice (7)
+            with libro_zip.open(ruta_hoja) as f:
+                numero_fila = 0
+                for _, elem in ET.iterparse(f):
+                    if elem.tag != f"{NS_XLSX}row":
+                        continue
+                    numero_fila = int(elem.get("r", numero_fila + 1))
+                    if numero_fila <= inicio:
+                        elem.clear()
+                        continue
+                    fila = [None] * ancho
+                    numero_columna = -1
+                    for celda in elem.iter(f"{NS_XLSX}c"):
+                        referencia = celda.get("r")
+                        if referencia:
+                            letras = referencia.rstrip("0123456789")
+                            numero_columna = indices_columna.get(letras)
+                            if numero_columna is None:
+                                numero_columna = -1
+                                for letra in letras:
+                                    numero_columna = (numero_columna + 1) * 26 + ord(letra) - 65
+                                indices_columna[letras] = numero_columna
+                        else:
+                            numero_columna += 1
+                        if numero_columna not in columnas:
+                            continue
+
+                        tipo = celda.get("t", "n")
+                        if tipo == "inlineStr":
+                            fila[numero_columna] = "".join(t.text or "" for t in celda.iter(f"{NS_XLSX}t"))
+                            continue
+                        valor = celda.find(f"{NS_XLSX}v")
+                        if valor is None or valor.text is None:
+                            continue
+                        texto = valor.text
+                        if tipo == "s":
+                            fila[numero_columna] = cadenas[int(texto)]
+                        elif tipo in ("str", "e"):
+                            fila[numero_columna] = texto
+                        elif tipo == "b":
+                            fila[numero_columna] = texto == "1"
+                        elif tipo == "d":
+                            fila[numero_columna] = datetime.fromisoformat(texto)
+                        else:
+                            numero = float(texto)
+                            estilo = int(celda.get("s", 0))
+                            if estilo in estilos_fecha:
+                                fila[numero_columna] = self._fecha_desde_serial_excel(numero, fecha_1904, estilos_fecha[estilo])
+                            else:
+                                fila[numero_columna] = int(numero) if numero.is_integer() else numero
+                    elem.clear()
+                    filas.append(fila)
+        return filas
+
+    def _leer_tabla_estacion(self, ruta, columnas, inicio=FILAS_ENCABEZADO):
+        """
+        Filas de datos (después del encabezado) de un libro de estación, solo con las columnas pedidas.
+        Usa el lector ligero y, si el libro tiene algo que este no entiende, recurre a pandas.
+        """
+        ruta = self._ruta_lectura(ruta) # Copia local del espejo si está vigente
+        if ruta.lower().endswith(('.csv', '.tsv')):
+            return self._leer_filas_csv(ruta, columnas, inicio)
+        try:
+            return self._leer_filas_xlsx(ruta, columnas, inicio)
+        except Exception as e:
+            print(f"Lector ligero no pudo leer {os.path.basename(ruta)} ({e}); usando pandas")
+
+        df = pd.read_excel(ruta, header=None)
+        ancho = max(columnas) + 1
+        filas = []
+        for valores in df.iloc[inicio:].itertuples(index=False):
+            fila = [None] * ancho
+            for c in columnas:
+                if c < len(valores) and not pd.isna(valores[c]):
+                    fila[c] = valores[c]
+            filas.append(fila)
+        return filas
+
+    def _ruta_sidecar(self, ruta):
+        """Sidecar de un libro: <carpeta del libro>/.verificador_cache/<nombre del libro>.json"""
+        return os.path.join(os.path.dirname(ruta), CARPETA_SIDECAR, os.path.basename(ruta) + ".json")
+
+    def _leer_sidecar(self, ruta, tipo, firma):
+        """
+        Resultado interpretado de un libro desde su sidecar, si es de esta versión y corresponde al libro actual
+        (mismo mtime y tamaño). Retorna None si no existe, está desactualizado o no se puede leer.
+        """
+        try:
+            with open(self._ruta_sidecar(ruta), encoding="utf-8") as f:
+                sidecar = json.load(f)
+        except (OSError, ValueError):
+            return None
+        origen = sidecar.get('origen', {})
+        if (sidecar.get('version') != VERSION_SIDECAR or sidecar.get('tipo') != tipo
+                or (origen.get('mtime'), origen.get('tamano')) != firma):
+            return None
+        datos = sidecar['datos']
+        if tipo == 'ilrl':
+            return datos['resultado'], datos['fecha'], [PuntaILRL(*p) for p in datos['puntas']]
+        return (datos['resultados'],
+                pd.Timestamp(datos['fecha']) if datos['fecha'] else None,
+                {serie: [MedicionGeo(*m) for m in mediciones] for serie, mediciones in datos['detalles'].items()})
+
+    def _escribir_sidecar(self, ruta, tipo, firma, resultado):
+        """
+        Guarda el resultado interpretado junto al libro, con el mtime y tamaño del origen (lo que se valida al leerlo).
+        Se escribe en un temporal y se renombra, así ninguna estación lee un sidecar a medio escribir.
+        """
+        if tipo == 'ilrl':
+            res, fecha, puntas = resultado
+            datos = {'resultado': res, 'fecha': fecha, 'puntas': [list(p) for p in puntas]}
+        else:
+            resultados, fecha, detalles = resultado
+            datos = {'resultados': resultados, 'fecha': str(fecha) if fecha is not None else None,
+                     'detalles': {serie: [list(m) for m in mediciones] for serie, mediciones in detalles.items()}}
+        sidecar = {'version': VERSION_SIDECAR, 'tipo': tipo,
+                   'origen': {'nombre': os.path.basename(ruta), 'mtime': firma[0], 'tamano': firma[1]},
+                   'estacion': self.estacion, 'datos': datos}
+
+        destino = self._ruta_sidecar(ruta)
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        temporal = f"{destino}.{self.estacion}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporal, 'w', encoding="utf-8") as f:
+                json.dump(sidecar, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temporal, destino)
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+    def _en_cuarentena(self, ruta, firma):
+        """True si el libro falló antes y no cambió desde entonces; si cambió, sale de la cuarentena."""
+        with self._lock_cuarentena:
+            entrada = self._cuarentena.get(ruta)
+            if entrada is None:
+                return False
+            if firma is not None and entrada.firma == firma:
+                return True
+            del self._cuarentena[ruta]
+            return False
+
+    def _poner_en_cuarentena(self, ruta, tipo, error):
+        """
+        Registra un libro que no se pudo interpretar, con su firma actual y el motivo. Solo por errores de formato
+        (ERRORES_FORMATO_LIBRO) y si el libro no se está escribiendo; un error de red no lo deja en cuarentena.
+        """
+        if not isinstance(error, ERRORES_FORMATO_LIBRO):
+            return
+        firma = self._firma_archivo(ruta)
+        if firma is None or self._en_escritura(ruta, firma):
+            return
+        with self._lock_cuarentena:
+            self._cuarentena[ruta] = LibroEnCuarentena(tipo, firma, f"{type(error).__name__}: {error}",
+                                                       datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        self.estadisticas_cache['cuarentena_altas'] += 1
+
+    def libros_en_cuarentena(self):
+        """Copia del registro de cuarentena: [(ruta, LibroEnCuarentena)], los más recientes primero."""
+        with self._lock_cuarentena:
+            return sorted(self._cuarentena.items(), key=lambda e: e[1].desde, reverse=True)
+
+    def liberar_cuarentena(self, rutas=None):
+        """Saca libros de la cuarentena (todos si rutas es None) para que el próximo escaneo los vuelva a leer."""
+        with self._lock_cuarentena:
+            rutas = list(self._cuarentena) if rutas is None else list(rutas)
+            for ruta in rutas:
+                self._cuarentena.pop(ruta, None)
+        for ruta in rutas: # El resultado fallido también quedó en las cachés de Geometría
+            self._olvidar_lecturas(ruta)
+
+    def _olvidar_lecturas(self, ruta):
+        """Descarta lo que las cachés de Geometría guardaron de un libro (su lectura y las fusiones de OT que lo usan)."""
+        with self._lock_cache_geo:
+            self._cache_libros_geo.pop(ruta, None)
+            for ot in [ot for ot, (firma, _) in self._cache_geo_ot.items() if any(r == ruta for r, _ in firma)]:
+                del self._cache_geo_ot[ot]
+
+    def _hay_archivo_bloqueo(self, ruta):
+        """True si Excel tiene el libro abierto (archivo ~$ junto al libro; con nombres largos reemplaza los 2 primeros caracteres)."""
+        carpeta, nombre = os.path.split(ruta)
+        return any(os.path.exists(os.path.join(carpeta, bloqueo)) for bloqueo in {"~$" + nombre, "~$" + nombre[2:]})
+
+    def _en_escritura(self, ruta, firma):
+        """Heurística de libro a medio escribir: abierto en Excel o modificado hace muy poco."""
+        return time.time() - firma[0] < SEGUNDOS_LIBRO_RECIENTE or self._hay_archivo_bloqueo(ruta)
+
+    def _leer_libro(self, ruta, tipo, lector):
+        """
+        Capa común de lectura de libros de estación: omite los libros en cuarentena y, si el libro cambió mientras
+        se leía o falló mientras se está guardando, sirve la última lectura correcta y lo relee en segundo plano
+        cuando quede estable, en vez de devolver un veredicto a partir de un archivo incompleto.
+        """
+        firma = self._firma_archivo(ruta)
+        if self._en_cuarentena(ruta, firma):
+            self.estadisticas_cache['cuarentena_aciertos'] += 1
+            return None, None, None
+
+        resultado = self._leer_con_sidecar(ruta, tipo, lector, firma)
+        if firma is None:
+            return resultado
+        firma_despues = self._firma_archivo(ruta)
+
+        if resultado[0] is not None and firma_despues == firma:
+            with self._lock_lecturas:
+                self._lecturas_buenas[ruta] = (firma, resultado)
+                self._lecturas_buenas.move_to_end(ruta)
+                while len(self._lecturas_buenas) > MAX_LECTURAS_BUENAS:
+                    self._lecturas_buenas.popitem(last=False)
+            return resultado
+        if firma_despues == firma and not self._en_escritura(ruta, firma):
+            return resultado # Falla real (o libro sin datos): la cuarentena ya la registró si corresponde
+
+        # Libro a medio escribir
+        self.estadisticas_cache['en_escritura_detectados'] += 1
+        with self._lock_cuarentena:
+            self._cuarentena.pop(ruta, None)
+        self._programar_relectura(ruta, tipo, lector)
+        with self._lock_lecturas:
+            anterior = self._lecturas_buenas.get(ruta)
+        if anterior is not None:
+            self.estadisticas_cache['en_escritura_servidos'] += 1
+            return anterior[1]
+        return resultado
+
+    def _programar_relectura(self, ruta, tipo, lector):
+        """Relee un libro en segundo plano cuando su mtime/tamaño dejen de cambiar y Excel lo suelte."""
+        with self._lock_lecturas:
+            if ruta in self._relecturas_pendientes:
+                return
+            self._relecturas_pendientes.add(ruta)
+
+        def tarea():
+            try:
+                limite = time.time() + ESPERA_MAX_ESTABILIDAD_SEG
+                firma = self._firma_archivo(ruta)
+                while time.time() < limite:
+                    time.sleep(INTERVALO_ESTABILIDAD_SEG)
+                    nueva = self._firma_archivo(ruta)
+                    if nueva is None:
+                        return # El libro desapareció (p. ej. guardado con otro nombre)
+                    if nueva == firma and not self._hay_archivo_bloqueo(ruta):
+                        break
+                    firma = nueva
+                self._leer_libro(ruta, tipo, lector)
+                # Lo que las cachés guardaron mientras tanto (la lectura anterior, con la firma nueva) deja de valer
+                self._olvidar_lecturas(ruta)
+                self.estadisticas_cache['en_escritura_releidos'] += 1
+            finally:
+                with self._lock_lecturas:
+                    self._relecturas_pendientes.discard(ruta)
+        threading.Thread(target=tarea, name="relectura", daemon=True).start()
+
+    def _leer_con_sidecar(self, ruta, tipo, lector, firma):
+        """
+        Con la caché compartida activa, usa el sidecar del libro si está vigente; si no, interpreta el libro
+        con `lector` y deja el sidecar para las demás estaciones. Sin caché compartida, solo llama al lector.
+        """
+        if firma is None or not self.cache_compartida:
+            return self._interpretar_medido(ruta, tipo, lector)
+
+        resultado = self._leer_sidecar(ruta, tipo, firma)
+        if resultado is not None:
+            self.estadisticas_cache['sidecar_aciertos'] += 1
+            return resultado
+        self.estadisticas_cache['sidecar_fallos'] += 1
+
+        resultado = self._interpretar_medido(ruta, tipo, lector)
+        # Solo se comparten lecturas correctas de un libro que no cambió mientras se leía
+        if resultado[0] is not None and self._firma_archivo(ruta) == firma:
+            try:
+                self._escribir_sidecar(ruta, tipo, firma, resultado)
+                self.estadisticas_cache['sidecar_escrituras'] += 1
+            except OSError as e:
+                print(f"No se pudo escribir el sidecar de {os.path.basename(ruta)}: {e}")
+        return resultado
+
+    def _interpretar_medido(self, ruta, tipo, lector):
+        """Llama al lector de un libro registrando su duración y si se pudo interpretar."""
+        inicio = time.perf_counter()
+        resultado = lector(ruta)
+        self.metricas.observar("verificador_lectura_libro_segundos", time.perf_counter() - inicio,
+                               "Duración de la lectura e interpretación de un libro de estación", tipo=tipo)
+        if resultado[0] is None:
+            self.metricas.incrementar("verificador_lectura_libro_fallidas_total", 1,
+                                      "Libros sin datos interpretables o con error de lectura", tipo=tipo)
+        return resultado
+
     def leer_resultado_ilrl(self, ruta):
+        """
+        Resultado ILRL de un archivo, desde su sidecar compartido si está vigente (ver _leer_libro).
+        Retorna: resultado_final, ultima_fecha, lista_detalles_ilrl (para JSON)
+        """
+        return self._leer_libro(ruta, 'ilrl', self._interpretar_ilrl)
+
+    def _interpretar_ilrl(self, ruta):
         """
         Método mejorado para leer resultados ILRL que maneja todos los casos.
         Retorna: resultado_final, ultima_fecha, lista_detalles_ilrl (para JSON)
@@ -194,8 +2132,11 @@ class VerificadorCables:
             if os.path.basename(ruta).startswith('~$'):
                 return None, None, None
             
-            df = pd.read_excel(ruta, header=None)
-            inicio = 12
+            filas = self._leer_tabla_estacion(ruta, COLUMNAS_ILRL)
+
+            def valores_columna(col):
+                """Valores no vacíos de una columna, en orden de fila."""
+                return [f[col] for f in filas if f[col] is not None]
 
             es_combinado = any(x in os.path.basename(ruta).upper() for x in ['SCLC', 'LCSC'])
         
@@ -205,8 +2146,8 @@ class VerificadorCables:
             if es_combinado:
                 pass_counts = []
                 for col in [7, 8, 9, 10]:
-                    col_vals = df.iloc[inicio:, col].dropna().astype(str).str.upper()
-                    pass_count = col_vals.isin(['PASS']).sum()
+                    col_vals = [str(v).upper() for v in valores_columna(col)]
+                    pass_count = sum(1 for v in col_vals if v == 'PASS')
                     pass_counts.append(pass_count)
 
                 if max(pass_counts) > 0:
@@ -216,11 +2157,11 @@ class VerificadorCables:
                     return None, None, None
 
             else: # Procesamiento normal para archivos no combinados (LC o SC)
-                col7_vals = df.iloc[inicio:, 7].dropna().astype(str).str.upper()
-                col8_vals = df.iloc[inicio:, 8].dropna().astype(str).str.upper()
+                col7_vals = [str(v).upper() for v in valores_columna(7)]
+                col8_vals = [str(v).upper() for v in valores_columna(8)]
 
-                count_col7_pass_fail = col7_vals.isin(['PASS', 'FAIL']).sum()
-                count_col8_pass_fail = col8_vals.isin(['PASS', 'FAIL']).sum()
+                count_col7_pass_fail = sum(1 for v in col7_vals if v in ('PASS', 'FAIL'))
+                count_col8_pass_fail = sum(1 for v in col8_vals if v in ('PASS', 'FAIL'))
 
                 if count_col8_pass_fail >= count_col7_pass_fail and count_col8_pass_fail > 0:
                     col_resultado = 8
@@ -234,7 +2175,7 @@ class VerificadorCables:
             if col_resultado == -1:
                 return None, None, None
 
-            resultados_raw = df.iloc[inicio:, col_resultado].dropna().astype(str).str.upper().tolist()
+            resultados_raw = [str(v).upper() for v in valores_columna(col_resultado)]
             valid_results = [r for r in resultados_raw if r in ['PASS', 'FAIL']]
 
             if not valid_results: # Si no hay resultados válidos en el archivo
@@ -243,7 +2184,7 @@ class VerificadorCables:
             # Determinar el resultado final para ESTE ARCHIVO
             resultado_final = 'APROBADO' if all(r == 'PASS' for r in valid_results) else 'RECHAZADO'
 
-            fechas_raw = df.iloc[inicio:, col_fecha].dropna().tolist()
+            fechas_raw = valores_columna(col_fecha)
             fechas_datetime = []
             for f in fechas_raw:
                 try:
@@ -275,17 +2216,18 @@ class VerificadorCables:
                             except:
                                 pass
 
-                lista_detalles_ilrl.append({
-                    'linea': i + 1,
-                    'resultado': res_val,
-                    'fecha': fecha_str_linea,
-                    'origen_archivo': os.path.basename(ruta),
-                    'tipo_archivo': 'COMBINADO' if es_combinado else ('LC' if '-LC-' in os.path.basename(ruta).upper() else 'SC')
-                })
+                lista_detalles_ilrl.append(PuntaILRL(
+                    linea=i + 1,
+                    resultado=res_val,
+                    fecha=fecha_str_linea,
+                    origen_archivo=os.path.basename(ruta),
+                    tipo_archivo='COMBINADO' if es_combinado else ('LC' if '-LC-' in os.path.basename(ruta).upper() else 'SC')
+                ))
             
             return resultado_final, ultima_fecha, lista_detalles_ilrl
         except Exception as e:
             print(f"Error leyendo {os.path.basename(ruta)}: {e}")
+            self._poner_en_cuarentena(ruta, 'ilrl', e)
             return None, None, None
 
     def normalizar_serie_geo(self, serie_completo):
@@ -304,7 +2246,31 @@ class VerificadorCables:
             punta = 'R' + punta.replace('R', '').replace('-', '')
         return serie, punta if punta in {'1','2','3','4','R1','R2','R3','R4'} else None
 
+    def _ultima_medicion_por_punta(self, mediciones):
+        """
+        Regla de Geometría: por cada punta física (la 'R1' es una re-medición de la punta 1) vale la medición más reciente.
+        mediciones: iterable de (punta, aprobada, timestamp). Retorna: dict punta física -> (punta, aprobada, timestamp)
+        """
+        ultima_por_punta = {}
+        for punta, aprobada, timestamp in mediciones:
+            punta_fisica = punta.replace('R', '')
+            actual = ultima_por_punta.get(punta_fisica)
+            if actual is None or (timestamp and actual[2] and timestamp > actual[2]) or (not actual[2] and timestamp):
+                ultima_por_punta[punta_fisica] = (punta, aprobada, timestamp)
+        return ultima_por_punta
+
+    def _estado_geo(self, ultima_por_punta):
+        """Aceptación de Geometría: las puntas 1 a 4 medidas y con su última medición PASS."""
+        return "APROBADO" if all(p in ultima_por_punta and ultima_por_punta[p][1] for p in ('1', '2', '3', '4')) else "RECHAZADO"
+
     def leer_resultado_geo(self, ruta):
+        """
+        Resultado de Geometría de un libro, desde su sidecar compartido si está vigente (ver _leer_libro).
+        Retorna: resultados_por_serie, ultima_fecha, detalles_geo_por_serie (para JSON)
+        """
+        return self._leer_libro(ruta, 'geo', self._interpretar_geo)
+
+    def _interpretar_geo(self, ruta):
         """
         Método para leer resultados de geometría.
         Retorna: resultados_por_serie, ultima_fecha, detalles_geo_por_serie (para JSON)
@@ -320,10 +2286,10 @@ class VerificadorCables:
                 print(f"Ignorando archivo temporal de Excel: {ruta}")
                 return None, None, None
             
-            df = pd.read_excel(ruta, header=None, skiprows=12)
+            filas = self._leer_tabla_estacion(ruta, COLUMNAS_GEO)
             datos = []
         
-            for idx, row in df.iterrows():
+            for row in filas:
                 serie, punta = self.normalizar_serie_geo(row[0])
                 if not serie or not punta:
                     continue
@@ -384,91 +2350,453 @@ class VerificadorCables:
             ultima_fecha_total = df_procesado['Timestamp'].max()
 
             for serie, grupo in df_procesado.groupby('Serie'):
-                ultima_medicion_por_punta = {}
-            
-                for _, medicion in grupo.iterrows():
-                    punta = medicion['Punta']
-                    punta_fisica = punta.replace('R', '')
-                
-                    if punta_fisica not in ultima_medicion_por_punta or \
-                    (medicion['Timestamp'] and ultima_medicion_por_punta[punta_fisica]['Timestamp'] and \
-                        medicion['Timestamp'] > ultima_medicion_por_punta[punta_fisica]['Timestamp']):
-                        ultima_medicion_por_punta[punta_fisica] = {
-                            'Punta': punta,
-                            'Resultado': medicion['Resultado'] == 'PASS',
-                            'Timestamp': medicion['Timestamp']
-                        }
-                    elif not ultima_medicion_por_punta[punta_fisica]['Timestamp'] and medicion['Timestamp']:
-                        ultima_medicion_por_punta[punta_fisica] = {
-                            'Punta': punta,
-                            'Resultado': medicion['Resultado'] == 'PASS',
-                            'Timestamp': medicion['Timestamp']
-                        }
-            
-                estado_final = "APROBADO"
-                for p in ['1', '2', '3', '4']:
-                    if p in ultima_medicion_por_punta:
-                        if not ultima_medicion_por_punta[p]['Resultado']:
-                            estado_final = "RECHAZADO"
-                    else:
-                        estado_final = "RECHAZADO"
-                    
-                resultados_por_serie[serie] = estado_final
+                ultima_medicion_por_punta = self._ultima_medicion_por_punta(
+                    zip(grupo['Punta'], grupo['Resultado'] == 'PASS', grupo['Timestamp'])
+                )
+                resultados_por_serie[serie] = self._estado_geo(ultima_medicion_por_punta)
 
                 # Almacenar detalles para la serie actual (todas las mediciones para esa serie)
                 for _, medicion in grupo.iterrows():
-                    detalles_geo_por_serie[serie].append({
-                        'serie': medicion['Serie'],
-                        'punta': medicion['Punta'],
-                        'resultado': medicion['Resultado'],
-                        'timestamp': medicion['Timestamp'].strftime("%d/%m/%Y %H:%M:%S") if medicion['Timestamp'] else 'N/A'
-                    })
+                    detalles_geo_por_serie[serie].append(MedicionGeo(
+                        serie=medicion['Serie'],
+                        punta=medicion['Punta'],
+                        resultado=medicion['Resultado'],
+                        timestamp=medicion['Timestamp'].strftime(FECHA_DETALLE_GEO) if medicion['Timestamp'] else 'N/A'
+                    ))
         
             return resultados_por_serie, ultima_fecha_total, dict(detalles_geo_por_serie)
         except Exception as e:
             print(f"Error leyendo {os.path.basename(ruta)}: {e}")
+            self._poner_en_cuarentena(ruta, 'geo', e)
             return None, None, None
 
+    def _ruta_espejo(self, ruta):
+        """Ruta de la copia local de un archivo de la red, o None si no pertenece a las carpetas espejadas."""
+        if not self.espejo_local:
+            return None
+        ruta = os.path.normcase(os.path.normpath(ruta))
+        for nombre, base in self._raices_espejo():
+            base = os.path.normcase(os.path.normpath(base))
+            try:
+                dentro = os.path.commonpath([ruta, base]) == base
+            except ValueError: # Distinta unidad en Windows
+                dentro = False
+            if dentro:
+                return os.path.join(self.espejo_local, nombre, os.path.relpath(ruta, base))
+        return None
+
+    def _raices_espejo(self):
+        """Carpeta del espejo de cada raíz de la red: [(nombre, raíz)] con nombres ilrl, ilrl2, ... / geo, geo2, ..."""
+        return [(f"{fuente}{i + 1 if i else ''}", base)
+                for fuente, rutas in (("ilrl", self.rutas_ilrl), ("geo", self.rutas_geo))
+                for i, base in enumerate(rutas)]
+
+    def _raiz_lectura(self, raiz):
+        """
+        Raíz en la que se buscan los libros: la de la red o, si no responde y hay espejo local, su copia local,
+        así una caída de la red no deja sin resultados a las OTs ya espejadas.
+        """
+        if not self.espejo_local or os.path.isdir(raiz):
+            return raiz
+        for nombre, base in self._raices_espejo():
+            copia = os.path.join(self.espejo_local, nombre)
+            if base == raiz and os.path.isdir(copia):
+                self.estadisticas_cache['espejo_respaldos'] += 1
+                return copia
+        return raiz
+
+    def _copia_vigente(self, origen, destino):
+        """True si la copia local tiene el mismo tamaño y fecha de modificación que el original."""
+        try:
+            st_origen = os.stat(origen)
+            st_destino = os.stat(destino)
+        except OSError:
+            return False
+        # Tolerancia de 1 s por la resolución de fechas de algunos sistemas de archivos
+        return st_origen.st_size == st_destino.st_size and abs(st_origen.st_mtime - st_destino.st_mtime) < 1
+
+    def _ruta_lectura(self, ruta):
+        """Ruta desde la que conviene leer un libro: la copia local si está vigente, si no el original en la red."""
+        destino = self._ruta_espejo(ruta)
+        if destino and self._copia_vigente(ruta, destino):
+            return destino
+        if destino:
+            self._evento_espejo.set() # Copia ausente o desactualizada: adelantar la próxima sincronización
+        return ruta
+
+    def _sincronizar_archivo(self, origen, destino):
+        """Copia un archivo nuevo o modificado al espejo de forma atómica (temporal + rename)."""
+        if self._copia_vigente(origen, destino):
+            return False
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        temporal = destino + ".tmp"
+        antes = os.stat(origen)
+        shutil.copy2(origen, temporal) # copy2 conserva la fecha de modificación, usada para validar la copia
+        despues = os.stat(origen)
+        if ((antes.st_size, antes.st_mtime) != (despues.st_size, despues.st_mtime)
+                or os.path.getsize(temporal) != despues.st_size):
+            # El libro se estaba guardando: la copia puede estar incompleta; se vuelve a copiar en la próxima pasada
+            os.remove(temporal)
+            return False
+        os.replace(temporal, destino)
+        return True
+
+    def _iniciar_espejo_local(self):
+        """Arranca el hilo de sincronización del espejo local si está configurado."""
+        if not self.espejo_local or (self._hilo_espejo and self._hilo_espejo.is_alive()):
+            return
+        self._hilo_espejo = threading.Thread(target=self._bucle_espejo, name="espejo-local", daemon=True)
+        self._hilo_espejo.start()
+
+    def _bucle_espejo(self):
+        """Pasada periódica: copia los libros de Geometría y los ILRL de las OTs recientes que cambiaron."""
+        while True:
+            try:
+                self.sincronizar_espejo()
+            except OSError as e:
+                print(f"Error sincronizando el espejo local: {e}")
+            self._evento_espejo.wait(INTERVALO_ESPEJO_SEG)
+            self._evento_espejo.clear()
+
+    def sincronizar_espejo(self):
+        """Una pasada de sincronización del espejo local. Retorna: número de archivos copiados."""
+        origenes = []
+        for raiz in self.rutas_geo:
+            if os.path.isdir(raiz):
+                origenes.extend(e.path for e in os.scandir(raiz)
+                                if e.is_file() and self._es_archivo_estacion(e.name))
+        ots_activas = dict(self._ots_activas) # Copia: otros hilos registran OTs mientras tanto
+        ots_recientes = sorted(ots_activas, key=ots_activas.get, reverse=True)[:MAX_OTS_ESPEJO]
+        for ot in ots_recientes:
+            origenes.extend(self.buscar_archivos_ilrl(ot))
+
+        copiados = 0
+        for origen in origenes:
+            destino = self._ruta_espejo(origen)
+            try:
+                if destino and self._sincronizar_archivo(origen, destino):
+                    copiados += 1
+            except OSError as e:
+                print(f"No se pudo copiar {origen} al espejo local: {e}")
+        return copiados
+
+    def _marcar_ot_activa(self, ot_numero):
+        """Registra la OT como recién verificada (candidata al espejo local); solo se recuerdan las más recientes."""
+        self._ots_activas[ot_numero] = datetime.now()
+        if len(self._ots_activas) > 2 * MAX_OTS_ESPEJO:
+            ots_activas = dict(self._ots_activas) # Copia: otros hilos registran OTs mientras tanto
+            for ot in sorted(ots_activas, key=ots_activas.get)[:-MAX_OTS_ESPEJO]:
+                self._ots_activas.pop(ot, None)
+
+    def _mtime_directorio(self, ruta):
+        """mtime de un directorio (cambia al crear, borrar o renombrar archivos), o None si no existe."""
+        try:
+            return os.stat(ruta).st_mtime_ns
+        except OSError:
+            return None
+
+    def _indice_ilrl_ot(self, ot_numero):
+        """
+        Índice de archivos ILRL de una OT por terminación de 4 dígitos: {terminación: ([carpeta principal], [subcarpeta F])}.
+        Junta los índices de todas las raíces ILRL (consultadas en paralelo), en el orden configurado.
+        Retorna: (indice, todos_los_archivos); la clave None agrupa los archivos cuyo nombre no tiene terminación.
+        """
+        por_raiz = self._en_raices(lambda raiz: self._indice_ilrl_raiz(raiz, ot_numero), self.rutas_ilrl)
+        if len(por_raiz) == 1:
+            return por_raiz[0]
+
+        indice = {}
+        todos = []
+        for indice_raiz, todos_raiz in por_raiz:
+            for sufijo, (principal, retrabajo) in indice_raiz.items():
+                destino = indice.setdefault(sufijo, ([], []))
+                destino[0].extend(principal)
+                destino[1].extend(retrabajo)
+            todos.extend(todos_raiz)
+        return indice, todos
+
+    def _indice_ilrl_raiz(self, raiz, ot_numero):
+        """
+        Índice ILRL de una OT dentro de una raíz (ver _indice_ilrl_ot).
+        Se construye una vez y solo se rehace cuando cambia el mtime de <OT>/ o de <OT>/F/.
+        """
+        ruta_ot = os.path.join(self._raiz_lectura(raiz), ot_numero)
+        ruta_ot_f = os.path.join(ruta_ot, "F")
+        firma = (self._mtime_directorio(ruta_ot), self._mtime_directorio(ruta_ot_f))
+
+        with self._lock_indices:
+            en_cache = self._indice_ilrl.get(ruta_ot)
+            vigente = bool(en_cache and en_cache[0] == firma)
+            self.estadisticas_cache['ilrl_indice_aciertos' if vigente else 'ilrl_indice_fallos'] += 1
+        if vigente:
+            return en_cache[1], en_cache[2]
+
+        indice = {}
+        todos = []
+        # Buscar en la carpeta principal de la OT y en la subcarpeta F si existe (para retrabajos)
+        for posicion, carpeta in enumerate((ruta_ot, ruta_ot_f)):
+            if firma[posicion] is None:
+                continue
+            for f in self._preferir_csv([f for f in os.listdir(carpeta) if self._es_archivo_estacion(f)]):
+                # Verificar si el nombre coincide con los patrones esperados
+                base_name = os.path.splitext(f)[0]
+                if any(x in base_name.upper() for x in ['-SC-', '-LC-', '-SCLC-', '-LCSC-']):
+                    archivo = os.path.join(carpeta, f)
+                    clave = self.extraer_clave_ilrl(f)
+                    sufijo = clave.split('-')[1] if clave else None
+                    indice.setdefault(sufijo, ([], []))[posicion].append(archivo)
+                    todos.append(archivo)
+
+        with self._lock_indices:
+            self._indice_ilrl[ruta_ot] = (firma, indice, todos)
+        return indice, todos
+
     def buscar_archivos_ilrl(self, ot_numero):
         """Busca archivos ILRL para la OT especificada, incluyendo todos los casos"""
-        ruta_ot = os.path.join(self.ruta_base_ilrl, ot_numero)
-        archivos = []
-    
-        # Buscar en la carpeta principal de la OT
-        if os.path.exists(ruta_ot):
-            for f in os.listdir(ruta_ot):
-                if f.endswith('.xlsx') and not f.startswith('~$'):
-                    # Verificar si el nombre coincide con los patrones esperados
-                    base_name = os.path.splitext(f)[0]
-                    if any(x in base_name.upper() for x in ['-SC-', '-LC-', '-SCLC-', '-LCSC-']):
-                        archivos.append(os.path.join(ruta_ot, f))
-    
-        # Buscar en la subcarpeta F si existe (para retrabajos)
-        ruta_ot_f = os.path.join(ruta_ot, "F")
-        if os.path.exists(ruta_ot_f):
-            for f in os.listdir(ruta_ot_f):
-                if f.endswith('.xlsx') and not f.startswith('~$'):
-                    base_name = os.path.splitext(f)[0]
-                    if any(x in base_name.upper() for x in ['-SC-', '-LC-', '-SCLC-', '-LCSC-']):
-                        archivos.append(os.path.join(ruta_ot_f, f))
-    
-        return archivos
+        return list(self._indice_ilrl_ot(ot_numero)[1])
+
+    def buscar_archivos_ilrl_serie(self, ot_numero, serie_cable):
+        """Archivos ILRL (carpeta principal y luego subcarpeta F) cuya terminación coincide con la serie."""
+        principal, retrabajo = self._indice_ilrl_ot(ot_numero)[0].get(serie_cable[-4:], ([], []))
+        return principal + retrabajo
 
     def buscar_archivos_geo(self, ot_numero):
-        """Busca archivos de Geometría para la OT especificada"""
-        archivos = []
-        for f in os.listdir(self.ruta_base_geo):
-            # Excluir archivos temporales de Excel y asegurarse de que es .xlsx
-            if f.endswith('.xlsx') and ot_numero in f and not f.startswith('~$'):
-                archivos.append(os.path.join(self.ruta_base_geo, f))
-        return archivos
+        """Busca archivos de Geometría para la OT especificada en todas las raíces (en paralelo)"""
+        def buscar(raiz):
+            raiz = self._raiz_lectura(raiz)
+            archivos = []
+            try:
+                nombres = os.listdir(raiz)
+            except OSError as e:
+                if len(self.rutas_geo) == 1:
+                    raise
+                print(f"Raíz de Geometría no disponible {raiz}: {e}") # Las demás raíces siguen respondiendo
+                return archivos
+            # Excluir archivos temporales de Excel; xlsx o exportaciones CSV/TSV
+            for f in self._preferir_csv([f for f in nombres if self._es_archivo_estacion(f)]):
+                if ot_numero in f:
+                    archivos.append(os.path.join(raiz, f))
+            return archivos
+
+        return [ruta for archivos in self._en_raices(buscar, self.rutas_geo) for ruta in archivos]
+
+    def _firma_archivo(self, ruta):
+        """(mtime, tamaño) de un archivo, o None si no se puede consultar."""
+        try:
+            estado = os.stat(ruta)
+            return (estado.st_mtime, estado.st_size)
+        except OSError:
+            return None
+
+    def _leer_geo_cacheado(self, ruta, firma):
+        """leer_resultado_geo con caché LRU por libro: se vuelve a leer solo si cambió su mtime/tamaño."""
+        with self._lock_cache_geo:
+            entrada = self._cache_libros_geo.get(ruta)
+            if entrada and entrada[0] == firma:
+                self._cache_libros_geo.move_to_end(ruta)
+                self.estadisticas_cache['geo_libro_aciertos'] += 1
+                return entrada[1]
+            self.estadisticas_cache['geo_libro_fallos'] += 1
+
+        resultado = self.leer_resultado_geo(ruta)
+
+        with self._lock_cache_geo:
+            self._cache_libros_geo[ruta] = (firma, resultado)
+            self._cache_libros_geo.move_to_end(ruta)
+            while len(self._cache_libros_geo) > MAX_LIBROS_GEO_CACHE:
+                self._cache_libros_geo.popitem(last=False)
+                self.estadisticas_cache['geo_libro_desalojos'] += 1
+        return resultado
+
+    def _fusionar_geo(self, lecturas):
+        """
+        Junta las mediciones de cada serie de todos los libros de la OT y aplica la regla de Geometría al conjunto:
+        por punta física vale la medición más reciente, esté en el libro que esté.
+        lecturas: iterable de (ruta, resultado de leer_resultado_geo). Retorna: {serie: DetallesGeo}
+        """
+        mediciones_por_serie = defaultdict(list) # serie -> [(timestamp, ruta, MedicionGeo)]
+        for ruta, (_, _, detalles_por_serie) in lecturas:
+            for serie, mediciones in (detalles_por_serie or {}).items():
+                for m in mediciones:
+                    timestamp = datetime.strptime(m.timestamp, FECHA_DETALLE_GEO) if m.timestamp not in (None, 'N/A') else None
+                    mediciones_por_serie[serie].append((timestamp, ruta, m))
+
+        por_serie = {}
+        for serie, mediciones in mediciones_por_serie.items():
+            mediciones.sort(key=lambda x: x[0] or datetime.min) # Orden estable: a igual fecha, el orden de lectura
+            ultima_por_punta = self._ultima_medicion_por_punta((m.punta, m.resultado == 'PASS', t) for t, _, m in mediciones)
+            fecha = max((t for t, _, _ in mediciones if t), default=None)
+            # Libros de la serie, empezando por el de la medición más reciente
+            libros = list(dict.fromkeys(ruta for _, ruta, _ in reversed(mediciones)))
+            por_serie[serie] = DetallesGeo(
+                archivo="\n".join(libros),
+                resultado=self._estado_geo(ultima_por_punta),
+                fecha=fecha.strftime(FECHA_DETALLE_GEO) if fecha else 'N/A',
+                puntas=tuple(m for _, _, m in mediciones)
+            )
+        return por_serie
+
+    def resultados_geo_ot(self, ot_numero):
+        """
+        Geometría de todas las series de una OT a partir de todos sus libros, leídos en paralelo y fusionados
+        (ver _fusionar_geo). El resultado queda en caché mientras ningún libro de la OT cambie, aparezca o desaparezca.
+        Retorna: {serie: DetallesGeo}
+        """
+        archivos = self.buscar_archivos_geo(ot_numero)
+        firma = tuple((ruta, self._firma_archivo(ruta)) for ruta in sorted(archivos))
+
+        lock_ot = self._locks_geo_ot[hash(ot_numero) % len(self._locks_geo_ot)]
+        with lock_ot: # Escaneos simultáneos de la misma OT esperan la misma fusión en vez de repetirla
+            with self._lock_cache_geo:
+                entrada = self._cache_geo_ot.get(ot_numero)
+                if entrada and entrada[0] == firma:
+                    self._cache_geo_ot.move_to_end(ot_numero)
+                    self.estadisticas_cache['geo_ot_aciertos'] += 1
+                    return entrada[1]
+                self.estadisticas_cache['geo_ot_fallos'] += 1
+
+            if not firma:
+                por_serie = {}
+            else:
+                with ThreadPoolExecutor(max_workers=min(HILOS_LECTURA, len(firma))) as pool:
+                    lecturas = list(pool.map(lambda item: self._leer_geo_cacheado(*item), firma))
+                por_serie = self._fusionar_geo(zip((ruta for ruta, _ in firma), lecturas))
+
+            with self._lock_cache_geo:
+                self._cache_geo_ot[ot_numero] = (firma, por_serie)
+                self._cache_geo_ot.move_to_end(ot_numero)
+                while len(self._cache_geo_ot) > MAX_OTS_GEO_CACHE:
+                    self._cache_geo_ot.popitem(last=False)
+                    self.estadisticas_cache['geo_ot_desalojos'] += 1
+        return por_serie
+
+    def _consolidar_detalles_ilrl(self, all_ilrl_details_collected):
+        """
+        Consolida las puntas ILRL recolectadas de todos los archivos de un cable y aplica la regla de aceptación
+        (4 puntas, todas PASS). Retorna: resultado_ilrl, fecha_ilrl, detalles_consolidados
+        """
+        if not all_ilrl_details_collected:
+            return "NO ENCONTRADO", None, []
+
+        # Filtrar detalles duplicados si una punta aparece en múltiples archivos (mantener la más reciente si hay fechas)
+        # Para simplificar, asumiremos que 'linea' + 'tipo_archivo' es un identificador de punta única
+        unique_ilrl_details = {} 
+        latest_date_overall = datetime.min
+
+        for detail in all_ilrl_details_collected:
+            # Crear un identificador único para cada "punta"
+            # Asumimos que 'linea' es la punta (1, 2, 3, 4) y 'tipo_archivo' (LC, SC, COMBINADO) ayuda a la unicidad
+            # Si un cable es LC-0001 (punta 1,2) y otro LC-0001 (punta 3,4) de la misma OT,
+            # necesitamos que se identifiquen como 4 puntas distintas.
+            # Para esto, usaremos una combinación de origen_archivo y línea.
+            
+            # Un identificador de punta más robusto podría ser (origen_archivo, linea)
+            # O si las puntas tienen nombres específicos (ej. 'Punta A', 'Punta B'), usar eso.
+            # Dado que 'linea' es un número, y puede repetirse entre archivos,
+            # usaremos una combinación de archivo + línea como identificador único.
+            
+            unique_id = (detail.origen_archivo, detail.linea)
+
+            # Si ya tenemos esta punta, solo la actualizamos si la nueva es más reciente
+            current_detail = unique_ilrl_details.get(unique_id)
+            if current_detail:
+                try:
+                    current_date = datetime.strptime(current_detail.fecha, FECHA_DETALLE_ILRL)
+                    new_date = datetime.strptime(detail.fecha, FECHA_DETALLE_ILRL)
+                    if new_date > current_date:
+                        unique_ilrl_details[unique_id] = detail
+                except (ValueError, TypeError):
+                    unique_ilrl_details[unique_id] = detail # Si la fecha no es parseable, simplemente reemplazamos
+            else:
+                unique_ilrl_details[unique_id] = detail
+
+            # Actualizar la fecha más reciente general
+            try:
+                detail_date = datetime.strptime(detail.fecha, FECHA_DETALLE_ILRL)
+                if detail_date > latest_date_overall:
+                    latest_date_overall = detail_date
+            except (ValueError, TypeError):
+                pass # Ignorar fechas no válidas
+
+        final_consolidated_details = list(unique_ilrl_details.values())
+        
+        # Verificar el estado final basado en las puntas consolidadas
+        total_puntas_encontradas = len(final_consolidated_details)
+        all_puntas_pass = all(d.resultado == 'PASS' for d in final_consolidated_details)
+
+        if total_puntas_encontradas == 4 and all_puntas_pass:
+            resultado_ilrl = "APROBADO"
+        elif total_puntas_encontradas > 0: # Si se encontraron puntas pero no 4 o no todas PASS
+            resultado_ilrl = "RECHAZADO"
+        else: # No se encontraron puntas válidas en absoluto
+            resultado_ilrl = "NO ENCONTRADO"
+
+        fecha_ilrl = latest_date_overall.strftime("%d/%m/%Y %H:%M") if latest_date_overall != datetime.min else 'N/A'
+        return resultado_ilrl, fecha_ilrl, final_consolidated_details
+
+    def generar_reporte_ot(self, ot_numero):
+        """
+        Reporte de completitud de una OT: cada archivo ILRL y cada libro de Geometría de la OT se lee una sola vez
+        (en paralelo) y los resultados se cruzan en memoria por número de serie.
+        Retorna: lista de dicts por serie (ordenada por serie).
+        """
+        ot_numero = ot_numero.strip().upper()
+        match_ot = re.search(r'(\d+)', ot_numero)
+        ot_numerico_parte = match_ot.group(1) if match_ot else ""
+
+        # ILRL: archivo -> terminación de 4 dígitos (la serie es la parte numérica de la OT + la terminación)
+        archivos_ilrl = {}
+        for sufijo, (principal, retrabajo) in self._indice_ilrl_ot(ot_numero)[0].items():
+            for archivo in principal + retrabajo:
+                clave = self.extraer_clave_ilrl(archivo)
+                if clave and clave.split('-')[0] == ot_numerico_parte:
+                    archivos_ilrl[archivo] = sufijo
+        with ThreadPoolExecutor(max_workers=HILOS_LECTURA) as pool:
+            lecturas_ilrl = list(pool.map(self.leer_resultado_ilrl, archivos_ilrl))
+
+        detalles_ilrl_por_serie = defaultdict(list)
+        for (archivo, sufijo), (_, _, detalles) in zip(archivos_ilrl.items(), lecturas_ilrl):
+            detalles_ilrl_por_serie[ot_numerico_parte + sufijo].extend(detalles or [])
+
+        # Geometría: la misma fusión de todos los libros de la OT que usa la verificación individual
+        geo_por_serie = {serie: detalles for serie, detalles in self.resultados_geo_ot(ot_numero).items()
+                         if serie.startswith(ot_numerico_parte)}
+
+        ultimos = {r['serial_number']: r for r in self.consultar_estado_ot(ot_numero)}
+
+        reporte = []
+        for serie in sorted(set(detalles_ilrl_por_serie) | set(geo_por_serie) | set(ultimos)):
+            resultado_ilrl, _, puntas_ilrl = self._consolidar_detalles_ilrl(detalles_ilrl_por_serie.get(serie, []))
+            detalles_geo = geo_por_serie.get(serie)
+            resultado_geo = detalles_geo.resultado if detalles_geo else "NO ENCONTRADO"
+            puntas_geo = {d.punta.replace('R', '') for d in detalles_geo.puntas} & {'1', '2', '3', '4'} if detalles_geo else set()
+
+            faltantes = []
+            if resultado_ilrl != "APROBADO":
+                faltantes.append("ILRL")
+            if resultado_geo != "APROBADO":
+                faltantes.append("Geometría")
+
+            reporte.append({
+                'serie': serie,
+                'ilrl_estado': resultado_ilrl,
+                'ilrl_puntas_pass': sum(1 for d in puntas_ilrl if d.resultado == 'PASS'),
+                'geo_estado': resultado_geo,
+                'geo_puntas': len(puntas_geo),
+                'geo_archivo': ", ".join(os.path.basename(r) for r in detalles_geo.archivo.split("\n")) if detalles_geo else None,
+                'ultimo_escaneo': ultimos[serie]['overall_status'] if serie in ultimos else "SIN ESCANEAR",
+                'falta': " + ".join(faltantes) if faltantes else "COMPLETO"
+            })
+        return reporte
 
     def verificar_cable_automatico(self, event=None):
         """Método que se llama automáticamente al escribir en el campo de serie."""
         serie_cable = self.serie_entry.get().strip()
-        if len(serie_cable) == 13:
+        if len(serie_cable) == 13 and self._modo_cola_activo():
+            self._encolar_escaneo()
+        elif len(serie_cable) == 13:
             self.verificar_cable()
-        elif len(serie_cable) < 13:
+        elif len(serie_cable) < 13 and not self._modo_cola_activo():
             # Limpiar resultados if the serial number is incomplete
             self.resultado_text.config(state=tk.NORMAL)
             self.resultado_text.delete(1.0, tk.END)
@@ -478,38 +2806,17 @@ class VerificadorCables:
             self.resultado_text.tag_unbind("geo_click", "<Button-1>")
             self.resultado_text.config(state=tk.DISABLED)
 
-    def verificar_cable(self):
-        ot_numero = self.ot_entry.get().strip().upper()
-        serie_cable = self.serie_entry.get().strip()
-        
-        # Limpiar datos de análisis previos
-        self.last_ilrl_analysis_data = None
-        self.last_ilrl_file_path = None
-        self.last_geo_analysis_data = None
-        self.last_geo_file_path = None
-        
-        # Actualizar información de rutas en la interfaz
-        self.ruta_ilrl_label.config(text=f"📂 Ruta ILRL: {self.ruta_base_ilrl}")
-        self.ruta_geo_label.config(text=f"📂 Ruta Geometría: {self.ruta_base_geo}")
-        
+    def _validar_ot_serie(self, ot_numero, serie_cable):
+        """
+        Validaciones previas a una verificación (incluye el Poka-Yoke de coincidencia OT / Número de Serie).
+        Retorna: None si los datos son válidos, o (codigo, mensaje) con el motivo del rechazo.
+        """
         if not ot_numero or not serie_cable:
-            self.resultado_text.config(state=tk.NORMAL)
-            self.resultado_text.delete(1.0, tk.END)
-            self.resultado_text.insert(tk.END, "Por favor, ingrese OT y Número de Serie para verificar.", "normal")
-            self.resultado_text.tag_unbind("ilrl_click", "<Button-1>")
-            self.resultado_text.tag_unbind("geo_click", "<Button-1>")
-            self.resultado_text.config(state=tk.DISABLED)
-            return
-        
+            return "VACIO", "Por favor, ingrese OT y Número de Serie para verificar."
+
         if not re.match(r'^\d{13}$', serie_cable):
-            self.resultado_text.config(state=tk.NORMAL)
-            self.resultado_text.delete(1.0, tk.END)
-            self.resultado_text.insert(tk.END, "El número de serie debe tener 13 dígitos para realizar la verificación.", "rojo")
-            self.resultado_text.tag_unbind("ilrl_click", "<Button-1>")
-            self.resultado_text.tag_unbind("geo_click", "<Button-1>")
-            self.resultado_text.config(state=tk.DISABLED)
-            return
-        
+            return "FORMATO", "El número de serie debe tener 13 dígitos para realizar la verificación."
+
         # --- Poka-Yoke: Validación de coincidencia OT y Número de Serie ---
         match_ot = re.search(r'(\d+)', ot_numero)
         ot_numerico_parte = match_ot.group(1) if match_ot else None
@@ -517,173 +2824,263 @@ class VerificadorCables:
         serie_ot_parte = serie_cable[:9] if len(serie_cable) >= 9 else None
 
         if ot_numerico_parte is None or serie_ot_parte is None or ot_numerico_parte != serie_ot_parte:
-            messagebox.showwarning(
-                "Error de Coincidencia",
-                f"La Orden de Trabajo '{ot_numero}' no coincide con la parte inicial "
-                f"del Número de Serie '{serie_cable}'.\n\n"
-                "Verifique que los datos sean correctos. No se realizará la verificación ni el registro."
-            )
-            self.resultado_text.config(state=tk.NORMAL)
-            self.resultado_text.delete(1.0, tk.END)
-            self.resultado_text.insert(tk.END, "⚠️ ERROR: La OT y el Número de Serie no coinciden.\n"
-                                         "Por favor, verifique los datos.", "rojo")
-            self.resultado_text.tag_unbind("ilrl_click", "<Button-1>")
-            self.resultado_text.tag_unbind("geo_click", "<Button-1>")
-            self.resultado_text.config(state=tk.DISABLED)
-            return
+            return "NO COINCIDE", (f"La Orden de Trabajo '{ot_numero}' no coincide con la parte inicial "
+                                   f"del Número de Serie '{serie_cable}'.")
+        return None
+
+    def _estado_general(self, resultado_ilrl, resultado_geo):
+        """Regla de estado general a partir de los resultados ILRL y Geometría."""
+        overall_status_db = "NO ENCONTRADO"
+        if resultado_ilrl != "NO ENCONTRADO" and resultado_geo != "NO ENCONTRADO":
+            overall_status_db = "APROBADO" if resultado_ilrl == "APROBADO" and resultado_geo == "APROBADO" else "RECHAZADO"
+        elif resultado_ilrl != "NO ENCONTRADO" and resultado_geo == "NO ENCONTRADO":
+            overall_status_db = "RECHAZADO" # Si ILRL está y GEO no, se rechaza
+        elif resultado_ilrl == "NO ENCONTRADO" and resultado_geo != "NO ENCONTRADO":
+            overall_status_db = "RECHAZADO" # Si GEO está y ILRL no, se rechaza
+        return overall_status_db
+
+    def evaluar_cable(self, ot_numero, serie_cable):
+        """
+        Motor de verificación: busca y lee los archivos ILRL y Geometría de un cable y aplica las reglas.
+        No toca la interfaz ni registra en la base de datos, por lo que puede ejecutarse desde otros hilos.
+        Retorna: dict con los resultados, fechas y detalles (para mostrar y para registrar).
+        """
+        self._marcar_ot_activa(ot_numero)
+        inicio = time.perf_counter()
 
         # --- Procesamiento ILRL ---
-        serie_buscar_ilrl = serie_cable[-4:]
         all_ilrl_details_collected = [] # Lista para recolectar detalles de todas las puntas encontradas
         ilrl_file_paths_for_display = [] # Para almacenar los nombres de archivo para mostrar
+        ilrl_file_path = None
 
-        archivos_ilrl = self.buscar_archivos_ilrl(ot_numero)
+        hay_archivos_ilrl = bool(self._indice_ilrl_ot(ot_numero)[1])
 
-        if not archivos_ilrl:
+        if not hay_archivos_ilrl:
             resultado_ilrl = "NO ENCONTRADO"
             fecha_ilrl = None
             ilrl_detalles_para_db = None
         else:
-            for archivo in archivos_ilrl:
-                base_name = os.path.basename(archivo)
-                clave = self.extraer_clave_ilrl(base_name)
-        
-                if clave and clave.split('-')[1] == serie_buscar_ilrl:
-                    res_file, fecha_file, detalles_ilrl_list_file = self.leer_resultado_ilrl(archivo)
-                    if detalles_ilrl_list_file: # Si la función devolvió detalles válidos
-                        all_ilrl_details_collected.extend(detalles_ilrl_list_file)
-                        ilrl_file_paths_for_display.append(archivo) # Añadir a la lista de archivos procesados
+            # Solo se leen los archivos de esta terminación (índice por OT, sin recorrer ni filtrar la carpeta)
+            for archivo in self.buscar_archivos_ilrl_serie(ot_numero, serie_cable):
+                res_file, fecha_file, detalles_ilrl_list_file = self.leer_resultado_ilrl(archivo)
+                if detalles_ilrl_list_file: # Si la función devolvió detalles válidos
+                    all_ilrl_details_collected.extend(detalles_ilrl_list_file)
+                    ilrl_file_paths_for_display.append(archivo) # Añadir a la lista de archivos procesados
 
             # --- Consolidar resultados ILRL de todas las puntas recolectadas ---
-            resultado_ilrl = "NO ENCONTRADO"
-            fecha_ilrl = None
-            ilrl_detalles_para_db = {
-                'lc_file': None, # Estos campos ahora serán más informativos, no solo booleanos
-                'sc_file': None,
-                'combinado_file': None,
-                'overall_ilrl_status': None,
-                'latest_ilrl_date': None,
-                'combined_details': []
-            }
-
-            if not all_ilrl_details_collected:
-                resultado_ilrl = "NO ENCONTRADO"
-            else:
-                # Filtrar detalles duplicados si una punta aparece en múltiples archivos (mantener la más reciente si hay fechas)
-                # Para simplificar, asumiremos que 'linea' + 'tipo_archivo' es un identificador de punta única
-                unique_ilrl_details = {} 
-                latest_date_overall = datetime.min
-
-                for detail in all_ilrl_details_collected:
-                    # Crear un identificador único para cada "punta"
-                    # Asumimos que 'linea' es la punta (1, 2, 3, 4) y 'tipo_archivo' (LC, SC, COMBINADO) ayuda a la unicidad
-                    # Si un cable es LC-0001 (punta 1,2) y otro LC-0001 (punta 3,4) de la misma OT,
-                    # necesitamos que se identifiquen como 4 puntas distintas.
-                    # Para esto, usaremos una combinación de origen_archivo y línea.
-                    
-                    # Un identificador de punta más robusto podría ser (origen_archivo, linea)
-                    # O si las puntas tienen nombres específicos (ej. 'Punta A', 'Punta B'), usar eso.
-                    # Dado que 'linea' es un número, y puede repetirse entre archivos,
-                    # usaremos una combinación de archivo + línea como identificador único.
-                    
-                    unique_id = (detail.get('origen_archivo'), detail.get('linea'))
+            resultado_ilrl, fecha_ilrl, final_consolidated_details = self._consolidar_detalles_ilrl(all_ilrl_details_collected)
+            ilrl_detalles_para_db = DetallesILRL(None, None, ())
 
-                    # Si ya tenemos esta punta, solo la actualizamos si la nueva es más reciente
-                    current_detail = unique_ilrl_details.get(unique_id)
-                    if current_detail:
-                        try:
-                            current_date = datetime.strptime(current_detail.get('fecha'), "%d/%m/%Y %H:%M")
-                            new_date = datetime.strptime(detail.get('fecha'), "%d/%m/%Y %H:%M")
-                            if new_date > current_date:
-                                unique_ilrl_details[unique_id] = detail
-                        except (ValueError, TypeError):
-                            unique_ilrl_details[unique_id] = detail # Si la fecha no es parseable, simplemente reemplazamos
-                    else:
-                        unique_ilrl_details[unique_id] = detail
-
-                    # Actualizar la fecha más reciente general
-                    try:
-                        detail_date = datetime.strptime(detail.get('fecha'), "%d/%m/%Y %H:%M")
-                        if detail_date > latest_date_overall:
-                            latest_date_overall = detail_date
-                    except (ValueError, TypeError):
-                        pass # Ignorar fechas no válidas
-
-                final_consolidated_details = list(unique_ilrl_details.values())
-                
-                # Verificar el estado final basado en las puntas consolidadas
-                total_puntas_encontradas = len(final_consolidated_details)
-                all_puntas_pass = all(d.get('resultado') == 'PASS' for d in final_consolidated_details)
-
-                if total_puntas_encontradas == 4 and all_puntas_pass:
-                    resultado_ilrl = "APROBADO"
-                elif total_puntas_encontradas > 0: # Si se encontraron puntas pero no 4 o no todas PASS
-                    resultado_ilrl = "RECHAZADO"
-                else: # No se encontraron puntas válidas en absoluto
-                    resultado_ilrl = "NO ENCONTRADO"
-
-                fecha_ilrl = latest_date_overall.strftime("%d/%m/%Y %H:%M") if latest_date_overall != datetime.min else 'N/A'
-                
-                ilrl_detalles_para_db['overall_ilrl_status'] = resultado_ilrl
-                ilrl_detalles_para_db['latest_ilrl_date'] = fecha_ilrl
-                ilrl_detalles_para_db['combined_details'] = final_consolidated_details
+            if final_consolidated_details:
+                ilrl_detalles_para_db = DetallesILRL(resultado_ilrl, fecha_ilrl, tuple(final_consolidated_details))
 
-                # Actualizar las rutas de archivo en last_ilrl_file_path para la interfaz
-                self.last_ilrl_file_path = "\n".join(ilrl_file_paths_for_display) if ilrl_file_paths_for_display else "N/A"
+                # Rutas de archivo para la interfaz
+                ilrl_file_path = "\n".join(ilrl_file_paths_for_display) if ilrl_file_paths_for_display else "N/A"
 
-        self.last_ilrl_analysis_data = ilrl_detalles_para_db
+        fin_ilrl = time.perf_counter()
 
         # --- Procesamiento Geometría ---
         resultado_geo = "NO ENCONTRADO"
         fecha_geo = None
         geo_detalles_para_db = None
+        geo_file_path = None
         
-        archivos_geo = self.buscar_archivos_geo(ot_numero)
-        if not archivos_geo:
-            # No se muestra mensaje de error aquí, se maneja en el resultado final
-            pass
+        # Todos los libros de la OT, fusionados por punta (una re-medición en otro libro reemplaza a la anterior)
+        geo_detalles_para_db = self.resultados_geo_ot(ot_numero).get(serie_cable)
+        if geo_detalles_para_db:
+            resultado_geo = geo_detalles_para_db.resultado
+            if geo_detalles_para_db.fecha != 'N/A':
+                fecha_geo = datetime.strptime(geo_detalles_para_db.fecha, FECHA_DETALLE_GEO)
+            geo_file_path = geo_detalles_para_db.archivo
+
+        fin = time.perf_counter()
+        ayuda = "Duración de la verificación de un cable por etapa (ilrl, geometria, total)"
+        self.metricas.observar("verificador_etapa_segundos", fin_ilrl - inicio, ayuda, etapa="ilrl")
+        self.metricas.observar("verificador_etapa_segundos", fin - fin_ilrl, ayuda, etapa="geometria")
+        self.metricas.observar("verificador_etapa_segundos", fin - inicio, ayuda, etapa="total")
+        estado_general = self._estado_general(resultado_ilrl, resultado_geo)
+        self.metricas.incrementar("verificador_escaneos_total", 1, "Cables verificados por veredicto", estado=estado_general)
+
+        return {
+            'ot_numero': ot_numero,
+            'serie_cable': serie_cable,
+            'resultado_ilrl': resultado_ilrl,
+            'fecha_ilrl': fecha_ilrl,
+            'ilrl_detalles': ilrl_detalles_para_db,
+            'ilrl_file_path': ilrl_file_path,
+            'resultado_geo': resultado_geo,
+            'fecha_geo': fecha_geo,
+            'geo_detalles': geo_detalles_para_db,
+            'geo_file_path': geo_file_path,
+            'estado_general': estado_general
+        }
+
+    def _registrar_evaluacion(self, resultado):
+        """Registra en la base de datos el resultado devuelto por evaluar_cable."""
+        fecha_geo = resultado['fecha_geo']
+        self._log_verification_result(
+            serial_number=resultado['serie_cable'],
+            ot_number=resultado['ot_numero'],
+            overall_status=resultado['estado_general'],
+            ilrl_status=resultado['resultado_ilrl'],
+            ilrl_date=resultado['fecha_ilrl'],
+            geo_status=resultado['resultado_geo'],
+            geo_date=fecha_geo.strftime("%d/%m/%Y %H:%M:%S") if hasattr(fecha_geo, 'strftime') else str(fecha_geo),
+            ilrl_details=resultado['ilrl_detalles'],
+            geo_details=resultado['geo_detalles']
+        )
+
+    def _mostrar_mensaje_resultado(self, texto, tag):
+        """Reemplaza el contenido del área de resultados por un único mensaje."""
+        self.resultado_text.config(state=tk.NORMAL)
+        self.resultado_text.delete(1.0, tk.END)
+        self.resultado_text.insert(tk.END, texto, tag)
+        self.resultado_text.tag_unbind("ilrl_click", "<Button-1>")
+        self.resultado_text.tag_unbind("geo_click", "<Button-1>")
+        self.resultado_text.config(state=tk.DISABLED)
+
+    def _modo_cola_activo(self):
+        return bool(self.modo_cola_var and self.modo_cola_var.get())
+
+    def _alternar_modo_cola(self):
+        """Muestra u oculta la lista de la cola de escaneo."""
+        if self._modo_cola_activo():
+            self.cola_frame.pack(fill=tk.BOTH, expand=True, pady=(5, 0))
+            self.serie_entry.focus_set()
         else:
-            for archivo in archivos_geo:
-                try:
-                    res_dict, fecha, detalles_geo_dict = self.leer_resultado_geo(archivo)
-                    if res_dict and serie_cable in res_dict:
-                        resultado_geo = res_dict[serie_cable]
-                        fecha_geo = fecha
-                        self.last_geo_file_path = archivo
-                        geo_detalles_para_db = {
-                            'file_path': archivo,
-                            'resultado_general': resultado_geo,
-                            'fecha_general': fecha.strftime("%d/%m/%Y %H:%M:%S") if hasattr(fecha, 'strftime') else str(fecha),
-                            'detalles_puntas': detalles_geo_dict.get(serie_cable, [])
-                        }
-                        break
-                except Exception as e:
-                    print(f"Error procesando archivo {archivo}: {e}")
-                    continue
+            self.cola_frame.pack_forget()
+
+    def _encolar_escaneo(self):
+        """Agrega el número de serie escaneado a la cola y deja el campo listo para el siguiente escaneo."""
+        ot_numero = self.ot_entry.get().strip().upper()
+        serie_cable = self.serie_entry.get().strip()
+        self.serie_entry.delete(0, tk.END)
+
+        self._contador_cola += 1
+        item = self.cola_tree.insert("", tk.END, values=(
+            self._contador_cola, datetime.now().strftime("%H:%M:%S"), serie_cable, "EN COLA", "", ""
+        ), tags=("EN COLA",))
+        self.cola_tree.see(item)
+
+        # Mantener acotada la lista (y los resultados asociados)
+        filas = self.cola_tree.get_children()
+        for viejo in filas[:max(0, len(filas) - MAX_FILAS_COLA)]:
+            self.cola_tree.delete(viejo)
+            self._resultados_cola.pop(viejo, None)
+
+        error = self._validar_ot_serie(ot_numero, serie_cable)
+        if error:
+            estado = "OT NO COINCIDE" if error[0] == "NO COINCIDE" else "SERIE INVÁLIDA"
+            self.cola_tree.item(item, values=(self._contador_cola, datetime.now().strftime("%H:%M:%S"),
+                                              serie_cable, estado, "", ""), tags=("RECHAZADO",))
+            self._resumen_cola[estado] += 1
+            self._actualizar_resumen_cola()
+            return
+
+        if self._pool_cola is None:
+            self._pool_cola = ThreadPoolExecutor(max_workers=HILOS_COLA_ESCANEO, thread_name_prefix="cola-escaneo")
+        self._pendientes_cola += 1
+        self._actualizar_resumen_cola()
+        self._pool_cola.submit(self._procesar_escaneo, item, ot_numero, serie_cable)
+
+    def _procesar_escaneo(self, item, ot_numero, serie_cable):
+        """Hilo de trabajo: verifica y registra un escaneo de la cola; el resultado vuelve al hilo de Tk."""
+        # Cables con la misma terminación leen los mismos archivos ILRL: se procesan de a uno y en orden
+        with self._lock_indices:
+            lock = self._locks_archivos.setdefault((ot_numero, serie_cable[-4:]), threading.Lock())
+        with lock:
+            try:
+                resultado = self.evaluar_cable(ot_numero, serie_cable)
+                self._registrar_evaluacion(resultado)
+            except Exception as e:
+                print(f"Error verificando {serie_cable} en cola: {e}")
+                resultado = None
+        self._en_hilo_ui(lambda: self._actualizar_item_cola(item, serie_cable, resultado))
+
+    def _actualizar_item_cola(self, item, serie_cable, resultado):
+        """Actualiza la fila de la cola con el veredicto (hilo de Tk)."""
+        self._pendientes_cola -= 1
+        if self._pendientes_cola == 0:
+            self._locks_archivos.clear() # Sin trabajos en curso: ningún lock está tomado
+
+        estado = resultado['estado_general'] if resultado else "ERROR"
+        self._resumen_cola[estado] += 1
+        if self.cola_tree.exists(item):
+            valores = self.cola_tree.item(item, "values")
+            self.cola_tree.item(item, values=(
+                valores[0], valores[1], serie_cable, estado,
+                resultado['resultado_ilrl'] if resultado else "", resultado['resultado_geo'] if resultado else ""
+            ), tags=(estado,))
+            if resultado:
+                self._resultados_cola[item] = resultado
+        self._actualizar_resumen_cola()
+
+    def _actualizar_resumen_cola(self):
+        resumen = self._resumen_cola
+        self.cola_resumen_label.config(text=(
+            f"En cola: {self._pendientes_cola}   ✅ Aprobados: {resumen['APROBADO']}   "
+            f"❌ Rechazados: {resumen['RECHAZADO']}   ⚠️ No encontrados: {resumen['NO ENCONTRADO']}   "
+            f"Otros: {resumen['OT NO COINCIDE'] + resumen['SERIE INVÁLIDA'] + resumen['ERROR']}"
+        ))
+
+    def _mostrar_item_cola(self, event=None):
+        """Doble clic en la cola: muestra el resultado completo de ese escaneo en el área de resultados."""
+        resultado = self._resultados_cola.get(self.cola_tree.focus())
+        if resultado:
+            self._mostrar_resultado(resultado)
+
+    def verificar_cable(self):
+        ot_numero = self.ot_entry.get().strip().upper()
+        serie_cable = self.serie_entry.get().strip()
         
-        self.last_geo_analysis_data = geo_detalles_para_db
+        # Limpiar datos de análisis previos
+        self.last_ilrl_analysis_data = None
+        self.last_ilrl_file_path = None
+        self.last_geo_analysis_data = None
+        self.last_geo_file_path = None
         
-        # --- Determinación del Estatus General y Registro en DB ---
-        overall_status_db = "NO ENCONTRADO"
-        if resultado_ilrl != "NO ENCONTRADO" and resultado_geo != "NO ENCONTRADO":
-            overall_status_db = "APROBADO" if resultado_ilrl == "APROBADO" and resultado_geo == "APROBADO" else "RECHAZADO"
-        elif resultado_ilrl != "NO ENCONTRADO" and resultado_geo == "NO ENCONTRADO":
-            overall_status_db = "RECHAZADO" # Si ILRL está y GEO no, se rechaza
-        elif resultado_ilrl == "NO ENCONTRADO" and resultado_geo != "NO ENCONTRADO":
-            overall_status_db = "RECHAZADO" # Si GEO está y ILRL no, se rechaza
+        # Actualizar información de rutas en la interfaz
+        self.ruta_ilrl_label.config(text=f"📂 Ruta ILRL: {'; '.join(self.rutas_ilrl)}")
+        self.ruta_geo_label.config(text=f"📂 Ruta Geometría: {'; '.join(self.rutas_geo)}")
         
+        error = self._validar_ot_serie(ot_numero, serie_cable)
+        if error:
+            codigo, mensaje = error
+            if codigo == "VACIO":
+                self._mostrar_mensaje_resultado(mensaje, "normal")
+            elif codigo == "FORMATO":
+                self._mostrar_mensaje_resultado(mensaje, "rojo")
+            else:
+                messagebox.showwarning(
+                    "Error de Coincidencia",
+                    f"{mensaje}\n\n"
+                    "Verifique que los datos sean correctos. No se realizará la verificación ni el registro."
+                )
+                self._mostrar_mensaje_resultado("⚠️ ERROR: La OT y el Número de Serie no coinciden.\n"
+                                                "Por favor, verifique los datos.", "rojo")
+            return
+
+        resultado = self.evaluar_cable(ot_numero, serie_cable)
+
         # Log results to database
-        self._log_verification_result(
-            serial_number=serie_cable,
-            ot_number=ot_numero,
-            overall_status=overall_status_db,
-            ilrl_status=resultado_ilrl,
-            ilrl_date=fecha_ilrl,
-            geo_status=resultado_geo,
-            geo_date=fecha_geo.strftime("%d/%m/%Y %H:%M:%S") if hasattr(fecha_geo, 'strftime') else str(fecha_geo),
-            ilrl_details=ilrl_detalles_para_db,
-            geo_details=geo_detalles_para_db
-        )
+        self._registrar_evaluacion(resultado)
+
+        self._mostrar_resultado(resultado)
+
+    def _mostrar_resultado(self, resultado):
+        """Muestra en el área de resultados una verificación devuelta por evaluar_cable."""
+        serie_cable = resultado['serie_cable']
+        ot_numero = resultado['ot_numero']
+        resultado_ilrl = resultado['resultado_ilrl']
+        fecha_ilrl = resultado['fecha_ilrl']
+        resultado_geo = resultado['resultado_geo']
+        fecha_geo = resultado['fecha_geo']
+        overall_status_db = resultado['estado_general']
+
+        self.last_ilrl_analysis_data = resultado['ilrl_detalles']
+        self.last_ilrl_file_path = resultado['ilrl_file_path']
+        self.last_geo_analysis_data = resultado['geo_detalles']
+        self.last_geo_file_path = resultado['geo_file_path']
 
         # --- Mostrar resultados en la interfaz ---
         self.resultado_text.config(state=tk.NORMAL)
@@ -704,7 +3101,7 @@ class VerificadorCables:
             self.resultado_text.tag_bind("ilrl_click", "<Button-1>", lambda e: self.mostrar_detalles_ilrl(self.last_ilrl_analysis_data))
             self.resultado_text.tag_config("ilrl_click", underline=1)
         else:
-            self.resultado_text.insert(tk.END, f"NO ENCONTRADO (buscando terminación {serie_buscar_ilrl})", "rojo")
+            self.resultado_text.insert(tk.END, f"NO ENCONTRADO (buscando terminación {serie_cable[-4:]})", "rojo")
         self.resultado_text.insert(tk.END, "\n")
         
         self.resultado_text.insert(tk.END, "📐 Geometría: ", "bold")
@@ -734,28 +3131,36 @@ class VerificadorCables:
 
         self.resultado_text.config(state=tk.DISABLED)
 
-    def mostrar_detalles_ilrl(self, data=None):
-        """Muestra una ventana con los detalles completos del análisis ILRL"""
-        details_to_show = data if data else self.last_ilrl_analysis_data
-
-        if not details_to_show:
-            messagebox.showinfo("Detalles ILRL", "No hay datos de ILRL para mostrar detalles. Realice una verificación primero.")
-            return
-
-        detalles_window = tk.Toplevel(self.root)
-        detalles_window.title("Detalles de Verificación ILRL")
-        detalles_window.geometry("800x600")
-        detalles_window.transient(self.root)
-        detalles_window.grab_set()
-
-        # Configurar el estilo
-        style = ttk.Style()
-        style.configure("Detalles.TFrame", background="#F0F4F8")
-        style.configure("Detalles.TLabel", background="#F0F4F8", foreground="#2C3E50")
-        style.configure("Detalles.Treeview", background="#FFFFFF", fieldbackground="#FFFFFF")
-        style.configure("Detalles.Treeview.Heading", background="#E9ECEF", foreground="#2C3E50", font=('Arial', 9, 'bold'))
-        style.map("Detalles.Treeview", background=[('selected', '#007BFF')])
-
+    def _ventana_reutilizable(self, clave, titulo, geometria, construir):
+        """
+        Ventanas de detalle de instancia única: se construyen la primera vez y luego solo se muestran de nuevo.
+        Cerrarlas las oculta, así que abrirlas otra vez cuesta actualizar su contenido, no rearmar los widgets.
+        construir(ventana) arma la ventana y retorna un dict con los widgets que se actualizan en cada apertura.
+        """
+        entrada = self._ventanas.get(clave)
+        if entrada and entrada[0].winfo_exists():
+            ventana, widgets = entrada
+            ventana.deiconify()
+            ventana.lift()
+        else:
+            ventana = tk.Toplevel(self.root)
+            ventana.geometry(geometria)
+            ventana.transient(self.root)
+            ventana.protocol("WM_DELETE_WINDOW", lambda: self._ocultar_ventana(clave))
+            widgets = construir(ventana)
+            self._ventanas[clave] = (ventana, widgets)
+        ventana.title(titulo)
+        ventana.grab_set()
+        return widgets
+
+    def _ocultar_ventana(self, clave):
+        """Oculta una ventana reutilizable (la conserva para la próxima apertura)."""
+        ventana = self._ventanas[clave][0]
+        ventana.grab_release()
+        ventana.withdraw()
+
+    def _construir_detalles_ilrl(self, detalles_window):
+        """Arma la ventana de detalles ILRL (una sola vez); el contenido lo completa mostrar_detalles_ilrl."""
         # Frame principal con scrollbar
         main_frame = ttk.Frame(detalles_window, style="Detalles.TFrame")
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -777,11 +3182,8 @@ class VerificadorCables:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-        # Función para el mouse wheel
-        def _on_mouse_wheel(event):
-            canvas.yview_scroll(-1 * int((event.delta / 120)), "units")
-    
-        canvas.bind_all("<MouseWheel>", _on_mouse_wheel)
+        # La rueda del mouse la atiende el manejador global de create_main_window
+        self._canvas_por_ventana[detalles_window] = canvas
 
         # Contenido del frame desplazable
         content_frame = ttk.Frame(scrollable_frame, style="Detalles.TFrame", padding=(20, 20))
@@ -793,7 +3195,7 @@ class VerificadorCables:
                 font=("Arial", 12, "bold"), 
                 style="Detalles.TLabel").pack(anchor="w", pady=(0, 15))
 
-        # Sección de archivos analizados (ahora muestra los archivos que contribuyeron)
+        # Sección de archivos analizados (los archivos que contribuyeron)
         files_frame = ttk.Frame(content_frame, style="Detalles.TFrame")
         files_frame.pack(fill=tk.X, pady=(0, 15))
 
@@ -801,27 +3203,15 @@ class VerificadorCables:
                 text="📁 Archivos Analizados:", 
                 font=("Arial", 10, "bold"), 
                 style="Detalles.TLabel").pack(anchor="w", pady=(0, 5))
-        
-        processed_files_display = details_to_show.get('ilrl_analizado_paths', [])
-        if processed_files_display:
-            for file_path in processed_files_display:
-                origen = "(Subcarpeta F)" if "\\F\\" in file_path else "(Carpeta principal)"
-                ttk.Label(files_frame, 
-                        text=f"• {os.path.basename(file_path)} {origen}", 
-                        wraplength=700, 
-                        font=("Arial", 9), 
-                        foreground="#6C757D", 
-                        background="#F0F4F8").pack(anchor="w")
-        else:
-            ttk.Label(files_frame, 
-                    text="• N/A (Ningún archivo ILRL encontrado para esta serie)", 
-                    wraplength=700, 
-                    font=("Arial", 9), 
-                    foreground="#6C757D", 
-                    background="#F0F4F8").pack(anchor="w")
-
-
-    # Resultado general
+        archivos_label = ttk.Label(files_frame, 
+                                   justify=tk.LEFT,
+                                   wraplength=700, 
+                                   font=("Arial", 9), 
+                                   foreground="#6C757D", 
+                                   background="#F0F4F8")
+        archivos_label.pack(anchor="w")
+
+        # Resultado general
         result_frame = ttk.Frame(content_frame, style="Detalles.TFrame")
         result_frame.pack(fill=tk.X, pady=(0, 15))
 
@@ -829,34 +3219,20 @@ class VerificadorCables:
                 text="📈 Resultado General ILRL:", 
                 font=("Arial", 10, "bold"), 
                 style="Detalles.TLabel").pack(anchor="w", pady=(0, 5))
-    
-        resultado_general = details_to_show.get('overall_ilrl_status', 'N/A')
-        fecha_general = details_to_show.get('latest_ilrl_date', 'N/A')
-        color = "green" if resultado_general == "APROBADO" else "red" if resultado_general == "RECHAZADO" else "orange"
-    
-        ttk.Label(result_frame, 
-                text=f"• Estado: {resultado_general}", 
-                font=("Arial", 10), 
-                foreground=color, 
-                background="#F0F4F8").pack(anchor="w")
-    
-        ttk.Label(result_frame, 
-                text=f"• Fecha de medición más reciente: {fecha_general}", 
-                font=("Arial", 9), 
-                foreground="#6C757D", 
-                background="#F0F4F8").pack(anchor="w")
+        estado_label = ttk.Label(result_frame, font=("Arial", 10), background="#F0F4F8")
+        estado_label.pack(anchor="w")
+        fecha_label = ttk.Label(result_frame, font=("Arial", 9), foreground="#6C757D", background="#F0F4F8")
+        fecha_label.pack(anchor="w")
 
-    # Detalles de las mediciones
+        # Detalles de las mediciones
         ttk.Label(content_frame, 
                 text="📊 Mediciones Detalladas:", 
                 font=("Arial", 10, "bold"), 
                 style="Detalles.TLabel").pack(anchor="w", pady=(0, 5))
 
-    # Crear Treeview con scrollbar
         tree_frame = ttk.Frame(content_frame, style="Detalles.TFrame")
         tree_frame.pack(fill=tk.BOTH, expand=True)
 
-    # Configurar Treeview
         tree = ttk.Treeview(
             tree_frame,
             columns=("Línea", "Resultado", "Fecha", "Tipo Archivo", "Origen"),
@@ -865,7 +3241,6 @@ class VerificadorCables:
             style="Detalles.Treeview"
         )
 
-    # Configurar columnas
         tree.heading("Línea", text="Línea", anchor=tk.W)
         tree.heading("Resultado", text="Resultado", anchor=tk.W)
         tree.heading("Fecha", text="Fecha", anchor=tk.W)
@@ -878,100 +3253,108 @@ class VerificadorCables:
         tree.column("Tipo Archivo", width=100, stretch=tk.NO, anchor=tk.W)
         tree.column("Origen", width=100, stretch=tk.NO, anchor=tk.W)
 
-    # Scrollbar para el Treeview
         tree_scroll = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
         tree.configure(yscrollcommand=tree_scroll.set)
         tree.pack(side="left", fill=tk.BOTH, expand=True)
         tree_scroll.pack(side="right", fill="y")
 
-    # Configurar tags para colores
         tree.tag_configure('PASS', foreground='green')
         tree.tag_configure('FAIL', foreground='red')
 
-    # Llenar el Treeview con los datos
-        detalles_lineas = details_to_show.get('combined_details', [])
+        # Estadísticas resumen
+        stats_frame = ttk.Frame(content_frame, style="Detalles.TFrame")
+        stats_frame.pack(fill=tk.X, pady=(15, 0))
+
+        ttk.Label(stats_frame, 
+                text="📝 Resumen Estadístico:", 
+                font=("Arial", 10, "bold"), 
+                style="Detalles.TLabel").pack(anchor="w", pady=(0, 5))
+        stats_label = ttk.Label(stats_frame, 
+                                justify=tk.LEFT,
+                                font=("Arial", 9), 
+                                foreground="#6C757D", 
+                                background="#F0F4F8")
+        stats_label.pack(anchor="w")
+
+        # Botón de cierre
+        btn_frame = ttk.Frame(content_frame, style="Detalles.TFrame")
+        btn_frame.pack(fill=tk.X, pady=(15, 0))
+
+        ttk.Button(btn_frame, 
+                text="Cerrar", 
+                command=lambda: self._ocultar_ventana('detalles_ilrl'),
+                style="TButton").pack(pady=10)
+
+        return {'canvas': canvas, 'archivos': archivos_label, 'estado': estado_label, 'fecha': fecha_label,
+                'tree': tree, 'estadisticas': stats_label}
+
+    def mostrar_detalles_ilrl(self, data=None):
+        """Muestra una ventana con los detalles completos del análisis ILRL"""
+        details_to_show = data if data else self.last_ilrl_analysis_data
+
+        if not details_to_show:
+            messagebox.showinfo("Detalles ILRL", "No hay datos de ILRL para mostrar detalles. Realice una verificación primero.")
+            return
+
+        w = self._ventana_reutilizable('detalles_ilrl', "Detalles de Verificación ILRL", "800x600",
+                                       self._construir_detalles_ilrl)
+
+        lineas_archivos = []
+        for file_path in sorted({p.origen_archivo for p in details_to_show.puntas}):
+            origen = "(Subcarpeta F)" if "\\F\\" in file_path else "(Carpeta principal)"
+            lineas_archivos.append(f"• {os.path.basename(file_path)} {origen}")
+        w['archivos'].config(text="\n".join(lineas_archivos) or "• N/A (Ningún archivo ILRL encontrado para esta serie)")
+
+        resultado_general = details_to_show.estado or 'N/A'
+        fecha_general = details_to_show.fecha or 'N/A'
+        color = "green" if resultado_general == "APROBADO" else "red" if resultado_general == "RECHAZADO" else "orange"
+        w['estado'].config(text=f"• Estado: {resultado_general}", foreground=color)
+        w['fecha'].config(text=f"• Fecha de medición más reciente: {fecha_general}")
+
+        # Llenar el Treeview con los datos
+        tree = w['tree']
+        tree.delete(*tree.get_children())
+        detalles_lineas = details_to_show.puntas
         for detalle in detalles_lineas:
-            resultado = detalle.get('resultado', 'N/A')
-            origen = "(Subcarpeta F)" if "\\F\\" in detalle.get('origen_archivo', '') else "(Carpeta principal)"
-            tipo_archivo = detalle.get('tipo_archivo', 'N/A')
+            resultado = detalle.resultado or 'N/A'
+            origen = "(Subcarpeta F)" if "\\F\\" in (detalle.origen_archivo or '') else "(Carpeta principal)"
+            tipo_archivo = detalle.tipo_archivo or 'N/A'
         
             tree.insert(
                 "", 
                 tk.END, 
                 values=(
-                    detalle.get('linea', 'N/A'),
+                    detalle.linea if detalle.linea is not None else 'N/A',
                     resultado,
-                    detalle.get('fecha', 'N/A'),
+                    detalle.fecha or 'N/A',
                     tipo_archivo,
                     origen
                 ), 
                 tags=(resultado,)
             )
 
-    # Estadísticas resumen
-        stats_frame = ttk.Frame(content_frame, style="Detalles.TFrame")
-        stats_frame.pack(fill=tk.X, pady=(15, 0))
-
-    # Contar PASS/FAIL
+        # Contar PASS/FAIL
         total = len(detalles_lineas)
-        pass_count = sum(1 for d in detalles_lineas if d.get('resultado') == 'PASS')
+        pass_count = sum(1 for d in detalles_lineas if d.resultado == 'PASS')
         fail_count = total - pass_count
-
-        ttk.Label(stats_frame, 
-                text="📝 Resumen Estadístico:", 
-                font=("Arial", 10, "bold"), 
-                style="Detalles.TLabel").pack(anchor="w", pady=(0, 5))
-
-        stats_text = (
+        w['estadisticas'].config(text=(
             f"• Total de mediciones: {total}\n"
-            f"• Aprobadas (PASS): {pass_count} ({pass_count/total*100:.1f}%)\n"
-            f"• Rechazadas (FAIL): {fail_count} ({fail_count/total*100:.1f}%)"
-        )
-    
-        ttk.Label(stats_frame, 
-                text=stats_text, 
-                justify=tk.LEFT,
-                font=("Arial", 9), 
-                foreground="#6C757D", 
-                background="#F0F4F8").pack(anchor="w")
-
-    # Botón de cierre
-        btn_frame = ttk.Frame(content_frame, style="Detalles.TFrame")
-        btn_frame.pack(fill=tk.X, pady=(15, 0))
-
-        ttk.Button(btn_frame, 
-                text="Cerrar", 
-                command=detalles_window.destroy,
-                style="TButton").pack(pady=10)
-
-        detalles_window.mainloop()
-
-    def mostrar_detalles_geo(self, data=None):
-        details_to_show = data if data else self.last_geo_analysis_data
-        
-        if not details_to_show:
-            messagebox.showinfo("Detalles Geometría", "No hay datos de Geometría para mostrar detalles. Realice una verificación primero.")
-            return
-
-        detalles_window = tk.Toplevel(self.root)
-        detalles_window.title("Detalles de Verificación Geometría")
-        detalles_window.geometry("700x500")
-        detalles_window.transient(self.root)
-        detalles_window.grab_set()
+            f"• Aprobadas (PASS): {pass_count} ({pass_count/(total or 1)*100:.1f}%)\n"
+            f"• Rechazadas (FAIL): {fail_count} ({fail_count/(total or 1)*100:.1f}%)"
+        ))
+        w['canvas'].yview_moveto(0)
 
+    def _construir_detalles_geo(self, detalles_window):
+        """Arma la ventana de detalles de Geometría (una sola vez); el contenido lo completa mostrar_detalles_geo."""
         frame = ttk.Frame(detalles_window, padding=(20, 20), style="TFrame")
         frame.pack(fill=tk.BOTH, expand=True)
 
         ttk.Label(frame, text="📁 Archivo Analizado:", font=("Arial", 10, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(anchor="w", pady=(0, 5))
-        origen = "(Subcarpeta F)" if "\\F\\" in details_to_show.get('file_path', '') else "(Carpeta principal)"
-        ttk.Label(frame, text=f"{details_to_show.get('file_path', 'N/A')} {origen}", wraplength=650, font=("Arial", 9), foreground="#6C757D", background="#F0F4F8").pack(anchor="w", pady=(0, 10))
+        archivo_label = ttk.Label(frame, wraplength=650, font=("Arial", 9), foreground="#6C757D", background="#F0F4F8")
+        archivo_label.pack(anchor="w", pady=(0, 10))
 
         ttk.Label(frame, text=f"📈 Resultado General para Geometría:", font=("Arial", 10, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(anchor="w", pady=(0, 5))
-        resultado_general = details_to_show.get('resultado_general', 'N/A')
-        fecha_general = details_to_show.get('fecha_general', 'N/A')
-        color = "green" if resultado_general == "APROBADO" else "red"
-        info_label = ttk.Label(frame, text=f"{resultado_general} (Fecha de medición más reciente: {fecha_general})", 
-                               font=("Arial", 10, "bold"), foreground=color, background="#F0F4F8")
+        info_label = ttk.Label(frame, font=("Arial", 10, "bold"), background="#F0F4F8")
         info_label.pack(anchor="w", pady=(0, 10))
 
         ttk.Label(frame, text="📐 Mediciones Detalladas por Punta:", font=("Arial", 10, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(anchor="w", pady=(0, 5))
@@ -987,12 +3370,6 @@ class VerificadorCables:
         tree.column("Resultado", width=100, stretch=tk.NO)
         tree.column("Fecha", width=180, stretch=tk.NO)
 
-        detalles_puntas = details_to_show.get('detalles_puntas', [])
-        for detalle in detalles_puntas:
-            resultado = detalle.get('resultado', 'N/A')
-            tree.insert("", tk.END, values=(detalle.get('serie', 'N/A'), detalle.get('punta', 'N/A'), resultado, detalle.get('timestamp', 'N/A')), 
-                        tags=('pass_style' if resultado == 'PASS' else 'fail_style'))
-        
         tree.tag_configure('pass_style', foreground='green')
         tree.tag_configure('fail_style', foreground='red')
 
@@ -1002,7 +3379,32 @@ class VerificadorCables:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         tree.configure(yscrollcommand=scrollbar.set)
 
-        detalles_window.mainloop()
+        return {'archivo': archivo_label, 'info': info_label, 'tree': tree}
+
+    def mostrar_detalles_geo(self, data=None):
+        details_to_show = data if data else self.last_geo_analysis_data
+        
+        if not details_to_show:
+            messagebox.showinfo("Detalles Geometría", "No hay datos de Geometría para mostrar detalles. Realice una verificación primero.")
+            return
+
+        w = self._ventana_reutilizable('detalles_geo', "Detalles de Verificación Geometría", "700x500",
+                                       self._construir_detalles_geo)
+
+        origen = "(Subcarpeta F)" if "\\F\\" in (details_to_show.archivo or '') else "(Carpeta principal)"
+        w['archivo'].config(text=f"{details_to_show.archivo or 'N/A'} {origen}")
+
+        resultado_general = details_to_show.resultado or 'N/A'
+        fecha_general = details_to_show.fecha or 'N/A'
+        color = "green" if resultado_general == "APROBADO" else "red"
+        w['info'].config(text=f"{resultado_general} (Fecha de medición más reciente: {fecha_general})", foreground=color)
+
+        tree = w['tree']
+        tree.delete(*tree.get_children())
+        for detalle in details_to_show.puntas:
+            resultado = detalle.resultado or 'N/A'
+            tree.insert("", tk.END, values=(detalle.serie or 'N/A', detalle.punta or 'N/A', resultado, detalle.timestamp or 'N/A'), 
+                        tags=('pass_style' if resultado == 'PASS' else 'fail_style'))
 
     def solicitar_contrasena(self):
         """Solicita la contraseña para acceder a la configuración de rutas."""
@@ -1031,39 +3433,43 @@ class VerificadorCables:
         frame = ttk.Frame(config_window, padding=(20, 20), style="TFrame")
         frame.pack(fill=tk.BOTH, expand=True)
 
-        ttk.Label(frame, text="Ruta Base ILRL:", font=("Arial", 10, "bold"), foreground="#2C3E50").grid(row=0, column=0, sticky=tk.W, pady=5)
+        ttk.Label(frame, text="Rutas Base ILRL:", font=("Arial", 10, "bold"), foreground="#2C3E50").grid(row=0, column=0, sticky=tk.W, pady=5)
         ilrl_entry = ttk.Entry(frame, width=60, font=("Arial", 10), style="TEntry")
-        ilrl_entry.insert(0, self.ruta_base_ilrl)
+        ilrl_entry.insert(0, f"{SEPARADOR_RUTAS} ".join(self.rutas_ilrl))
         ilrl_entry.grid(row=0, column=1, pady=5, padx=10, sticky="ew")
 
-        ttk.Label(frame, text="Ruta Base Geometría:", font=("Arial", 10, "bold"), foreground="#2C3E50").grid(row=1, column=0, sticky=tk.W, pady=5)
+        ttk.Label(frame, text="Rutas Base Geometría:", font=("Arial", 10, "bold"), foreground="#2C3E50").grid(row=1, column=0, sticky=tk.W, pady=5)
         geo_entry = ttk.Entry(frame, width=60, font=("Arial", 10), style="TEntry")
-        geo_entry.insert(0, self.ruta_base_geo)
+        geo_entry.insert(0, f"{SEPARADOR_RUTAS} ".join(self.rutas_geo))
         geo_entry.grid(row=1, column=1, pady=5, padx=10, sticky="ew")
 
+        ttk.Label(frame, text=f"Varias raíces (líneas, carpetas de archivo) se separan con '{SEPARADOR_RUTAS}'. La primera es la principal.",
+                  font=("Arial", 9), foreground="#6C757D").grid(row=2, column=0, columnspan=2, sticky=tk.W)
+
         def guardar_nuevas_rutas():
-            nueva_ilrl = ilrl_entry.get().strip()
-            nueva_geo = geo_entry.get().strip()
+            nuevas_ilrl = [r.strip() for r in ilrl_entry.get().split(SEPARADOR_RUTAS) if r.strip()]
+            nuevas_geo = [r.strip() for r in geo_entry.get().split(SEPARADOR_RUTAS) if r.strip()]
 
-            if not os.path.isdir(nueva_ilrl):
-                messagebox.showwarning("Ruta Inválida", "La ruta de ILRL no es un directorio válido.")
+            invalida = next((r for r in nuevas_ilrl if not os.path.isdir(r)), None)
+            if not nuevas_ilrl or invalida:
+                messagebox.showwarning("Ruta Inválida", f"La ruta de ILRL no es un directorio válido: {invalida or ''}")
                 return
-            if not os.path.isdir(nueva_geo):
-                messagebox.showwarning("Ruta Inválida", "La ruta de Geometría no es un directorio válido.")
+            invalida = next((r for r in nuevas_geo if not os.path.isdir(r)), None)
+            if not nuevas_geo or invalida:
+                messagebox.showwarning("Ruta Inválida", f"La ruta de Geometría no es un directorio válido: {invalida or ''}")
                 return
 
-            self.ruta_base_ilrl = nueva_ilrl
-            self.ruta_base_geo = nueva_geo
+            self.rutas_ilrl = nuevas_ilrl
+            self.rutas_geo = nuevas_geo
             self.guardar_rutas()
-            self.ruta_ilrl_label.config(text=f"📂 Ruta ILRL: {self.ruta_base_ilrl}")
-            self.ruta_geo_label.config(text=f"📂 Ruta Geometría: {self.ruta_base_geo}")
+            self.ruta_ilrl_label.config(text=f"📂 Ruta ILRL: {'; '.join(self.rutas_ilrl)}")
+            self.ruta_geo_label.config(text=f"📂 Ruta Geometría: {'; '.join(self.rutas_geo)}")
             config_window.destroy()
 
         save_button = ttk.Button(frame, text="Guardar Rutas", command=guardar_nuevas_rutas, style="Primary.TButton")
-        save_button.grid(row=2, column=0, columnspan=2, pady=20)
+        save_button.grid(row=3, column=0, columnspan=2, pady=20)
 
         config_window.columnconfigure(1, weight=1)
-        config_window.mainloop()
 
     def _borrar_todos_los_registros(self):
         """Borra todos los registros de la tabla cable_verifications."""
@@ -1077,6 +3483,8 @@ class VerificadorCables:
             conn = sqlite3.connect(self.db_name)
             cursor = conn.cursor()
             cursor.execute("DELETE FROM cable_verifications")
+            cursor.execute("DELETE FROM rollup_produccion")
+            cursor.execute("DELETE FROM cable_latest_status")
             conn.commit()
             messagebox.showinfo("Éxito", "Todos los registros han sido eliminados correctamente.")
             if hasattr(self, 'tree_registros'):
@@ -1099,12 +3507,11 @@ class VerificadorCables:
 
     def mostrar_vista_registros(self):
         """Muestra la ventana para que un ingeniero visualice los registros de cables."""
-        registros_window = tk.Toplevel(self.root)
-        registros_window.title("Vista de Registros de Cables")
-        registros_window.geometry("1000x700")
-        registros_window.transient(self.root)
-        registros_window.grab_set()
+        self._ventana_reutilizable('registros', "Vista de Registros de Cables", "1000x700", self._construir_vista_registros)
+        self.cargar_registros()
 
+    def _construir_vista_registros(self, registros_window):
+        """Arma la vista de registros (una sola vez); al reabrirla solo se recargan los registros."""
         main_frame = ttk.Frame(registros_window, padding=(20, 20), style="TFrame")
         main_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -1121,21 +3528,74 @@ class VerificadorCables:
         btn_aplicar_filtro.pack(side=tk.LEFT, padx=(0, 10))
 
         btn_limpiar_filtro = ttk.Button(filter_frame, text="Limpiar Filtro", command=self.limpiar_filtro_registros, style="TButton")
-        btn_limpiar_filtro.pack(side=tk.LEFT, padx=(0, 20))
+        btn_limpiar_filtro.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.solo_ultimo_var = tk.BooleanVar(value=False)
+        chk_solo_ultimo = ttk.Checkbutton(filter_frame, text="Solo último estado por serie", 
+                                          variable=self.solo_ultimo_var, command=self.aplicar_filtro_registros)
+        chk_solo_ultimo.pack(side=tk.LEFT, padx=(0, 10))
+
+        self.incluir_archivo_var = tk.BooleanVar(value=False)
+        chk_archivo = ttk.Checkbutton(filter_frame, text="Buscar también en archivo", 
+                                      variable=self.incluir_archivo_var, command=self.aplicar_filtro_registros)
+        chk_archivo.pack(side=tk.LEFT, padx=(0, 10))
+
+        btn_exportar = ttk.Button(filter_frame, text="📤 Exportar", 
+                                  command=lambda: self.mostrar_dialogo_exportacion(registros_window), style="Secondary.TButton")
+        btn_exportar.pack(side=tk.LEFT, padx=(0, 10))
+
+        btn_estadisticas = ttk.Button(filter_frame, text="📈 Estadísticas", 
+                                      command=lambda: self.mostrar_estadisticas(registros_window), style="Secondary.TButton")
+        btn_estadisticas.pack(side=tk.LEFT, padx=(0, 10))
+
+        btn_archivar = ttk.Button(filter_frame, text="🗄️ Archivar", 
+                                  command=lambda: self.mostrar_dialogo_archivo(registros_window), style="Secondary.TButton")
+        btn_archivar.pack(side=tk.LEFT, padx=(0, 10))
+
+        btn_reevaluar = ttk.Button(filter_frame, text="♻️ Reevaluar", 
+                                   command=lambda: self.solicitar_contrasena_reevaluar(registros_window), style="Secondary.TButton")
+        btn_reevaluar.pack(side=tk.LEFT, padx=(0, 20))
 
         # Nuevo botón para borrar todos los datos
         btn_borrar_todos = ttk.Button(filter_frame, text="🗑️ Borrar Todos los Registros", 
                                       command=self.solicitar_contrasena_borrar_datos, style="Danger.TButton")
         btn_borrar_todos.pack(side=tk.RIGHT)
 
+        # Segunda fila: estado y rango de fechas (se resuelven en SQL sobre columnas indexadas)
+        filter_frame2 = ttk.Frame(main_frame, style="TFrame")
+        filter_frame2.pack(fill=tk.X, pady=(0, 10))
+
+        ttk.Label(filter_frame2, text="Estado:", font=("Arial", 10, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(side=tk.LEFT, padx=(0, 5))
+        self.estado_filtro_combo = ttk.Combobox(filter_frame2, values=ESTADOS_FILTRO_REGISTROS, state="readonly", width=16)
+        self.estado_filtro_combo.set(ESTADOS_FILTRO_REGISTROS[0])
+        self.estado_filtro_combo.pack(side=tk.LEFT, padx=(0, 10))
+        self.estado_filtro_combo.bind("<<ComboboxSelected>>", self.aplicar_filtro_registros)
+
+        ttk.Label(filter_frame2, text="Desde (AAAA-MM-DD):", font=("Arial", 10, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(side=tk.LEFT, padx=(0, 5))
+        self.desde_filtro_entry = ttk.Entry(filter_frame2, width=12, font=("Arial", 10), style="TEntry")
+        self.desde_filtro_entry.pack(side=tk.LEFT, padx=(0, 10))
+        self.desde_filtro_entry.bind("<Return>", self.aplicar_filtro_registros)
+
+        ttk.Label(filter_frame2, text="Hasta:", font=("Arial", 10, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(side=tk.LEFT, padx=(0, 5))
+        self.hasta_filtro_entry = ttk.Entry(filter_frame2, width=12, font=("Arial", 10), style="TEntry")
+        self.hasta_filtro_entry.pack(side=tk.LEFT, padx=(0, 10))
+        self.hasta_filtro_entry.bind("<Return>", self.aplicar_filtro_registros)
+
+        self.total_registros_label = ttk.Label(filter_frame2, font=("Arial", 9), foreground="#6C757D", background="#F0F4F8")
+        self.total_registros_label.pack(side=tk.RIGHT)
+
         # Treeview para mostrar los registros
         columns = ("ID", "Fecha Entrada", "Número Serie", "Número OT", "Estado General", 
                    "ILRL Estatus", "ILRL Fecha", "Geo Estatus", "Geo Fecha")
         self.tree_registros = ttk.Treeview(main_frame, columns=columns, show="headings")
+        self.orden_registros = ("Fecha Entrada", True) # (columna, descendente)
         
         for col in columns:
-            self.tree_registros.heading(col, text=col, anchor=tk.W)
+            # Solo las columnas con índice se pueden ordenar (el orden lo resuelve la base)
+            comando = (lambda c=col: self._ordenar_registros(c)) if col in ORDEN_REGISTROS else ""
+            self.tree_registros.heading(col, text=col, anchor=tk.W, command=comando)
             self.tree_registros.column(col, width=100, anchor=tk.W)
+        self._marcar_orden_registros()
 
         self.tree_registros.column("ID", width=50, stretch=tk.NO)
         self.tree_registros.column("Fecha Entrada", width=140, stretch=tk.NO)
@@ -1161,106 +3621,182 @@ class VerificadorCables:
 
         # Asociar evento de clic a las filas para mostrar detalles
         self.tree_registros.bind("<Double-1>", self.mostrar_detalles_registro_bd)
-
-        self.cargar_registros()
-        registros_window.mainloop()
+        return {}
 
     def cargar_registros(self):
-        """Carga los registros de la base de datos en el Treeview."""
+        """Carga en el Treeview una página de registros con los filtros y el orden actuales de la vista."""
+        filtros = self._filtros_registros()
+        if filtros is None:
+            return
+
         for item in self.tree_registros.get_children():
             self.tree_registros.delete(item)
-        
         self.item_data_cache = {}
 
+        columna, descendente = self.orden_registros
         conn = None
         try:
             conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM cable_verifications ORDER BY entry_date DESC")
-            registros = cursor.fetchall()
-
-            for i, row in enumerate(registros):
-                ilrl_details = json.loads(row[9]) if row[9] else None
-                geo_details = json.loads(row[10]) if row[10] else None
-
-                self.item_data_cache[row[0]] = {
-                    "id": row[0],
-                    "entry_date": row[1],
-                    "serial_number": row[2],
-                    "ot_number": row[3],
-                    "overall_status": row[4],
-                    "ilrl_status": row[5],
-                    "ilrl_date": row[6],
-                    "geo_status": row[7],
-                    "geo_date": row[8],
-                    "ilrl_details": ilrl_details,
-                    "geo_details": geo_details
-                }
+            sql, parametros = self._consulta_registros(*filtros, columna, descendente, self._solo_ultimo_estado())
+            registros = conn.execute(sql, parametros).fetchall()
+
+            # El archivo histórico solo se consulta con un filtro (no se cargan meses completos a la vista)
+            if filtros[0] and not self._solo_ultimo_estado() and self.incluir_archivo_var.get():
+                condicion, parametros_archivo = self._condiciones_registros(*filtros)
+                registros += self._consultar_archivo(condicion, parametros_archivo,
+                                                     self._orden_sql(columna, descendente), LIMITE_VISTA_REGISTROS)
+                # Cada base ya viene ordenada y recortada: solo se combinan las primeras páginas
+                indices = [COLUMNAS_EXPORTACION.index(c) for c in ORDEN_REGISTROS[columna]]
+                registros.sort(key=lambda fila: [fila[i] for i in indices], reverse=descendente)
+                del registros[LIMITE_VISTA_REGISTROS:]
+
+            for row in registros:
+                # Se guarda la fila tal cual; los detalles se decodifican solo al abrir el registro
+                self.item_data_cache[row[0]] = row
 
                 self.tree_registros.insert("", tk.END, iid=row[0], values=(
                     row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8]
                 ), tags=(row[4],))
+
+            limite = " (límite alcanzado: refine los filtros)" if len(registros) >= LIMITE_VISTA_REGISTROS else ""
+            self.total_registros_label.config(text=f"Mostrando {len(registros)} registros{limite}")
         except sqlite3.Error as e:
             messagebox.showerror("Error de Base de Datos", f"No se pudieron cargar los registros: {e}")
         finally:
             if conn:
                 conn.close()
 
-    def aplicar_filtro_registros(self, event=None):
-        """Aplica un filtro a los registros mostrados en el Treeview."""
+    def _solo_ultimo_estado(self):
+        return bool(getattr(self, 'solo_ultimo_var', None) and self.solo_ultimo_var.get())
+
+    def _filtros_registros(self):
+        """
+        Lee los filtros de la vista: (texto OT/serie, estado, desde, hasta). Las fechas se validan
+        y se convierten al formato de entry_date. Retorna None si alguna fecha no es válida.
+        """
         filtro = self.filtro_entry.get().strip().upper()
-        
-        for item in self.tree_registros.get_children():
-            self.tree_registros.delete(item)
-            
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            if filtro:
-                cursor.execute("""
-                    SELECT * FROM cable_verifications 
-                    WHERE UPPER(ot_number) LIKE ? OR serial_number LIKE ?
-                    ORDER BY entry_date DESC
-                """, (f"%{filtro}%", f"%{filtro}%"))
-            else:
-                cursor.execute("SELECT * FROM cable_verifications ORDER BY entry_date DESC")
-                
-            registros = cursor.fetchall()
-
-            for i, row in enumerate(registros):
-                ilrl_details = json.loads(row[9]) if row[9] else None
-                geo_details = json.loads(row[10]) if row[10] else None
-
-                self.item_data_cache[row[0]] = {
-                    "id": row[0],
-                    "entry_date": row[1],
-                    "serial_number": row[2],
-                    "ot_number": row[3],
-                    "overall_status": row[4],
-                    "ilrl_status": row[5],
-                    "ilrl_date": row[6],
-                    "geo_status": row[7],
-                    "geo_date": row[8],
-                    "ilrl_details": ilrl_details,
-                    "geo_details": geo_details
-                }
-                
-                self.tree_registros.insert("", tk.END, iid=row[0], values=(
-                    row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8]
-                ), tags=(row[4],))
-        except sqlite3.Error as e:
-            messagebox.showerror("Error de Base de Datos", f"No se pudieron cargar los registros filtrados: {e}")
-        finally:
-            if conn:
-                conn.close()
+        estado = self.estado_filtro_combo.get()
+        estado = "" if estado == ESTADOS_FILTRO_REGISTROS[0] else estado
+        rango = []
+        for entry, hora in ((self.desde_filtro_entry, "00:00:00"), (self.hasta_filtro_entry, "23:59:59")):
+            texto = entry.get().strip()
+            if texto:
+                try:
+                    texto = f"{datetime.strptime(texto, '%Y-%m-%d'):%Y-%m-%d} {hora}"
+                except ValueError:
+                    messagebox.showwarning("Fecha Inválida", f"'{texto}' no es una fecha válida (AAAA-MM-DD).")
+                    return None
+            rango.append(texto)
+        return filtro, estado, rango[0], rango[1]
+
+    def _condiciones_registros(self, filtro="", estado="", desde="", hasta="", prefijo=""):
+        """
+        WHERE de la vista de registros como (condición, parámetros). Cada criterio usa una columna indexada:
+        una serie o una OT completas van por igualdad, el estado con el rango de fechas por (overall_status, entry_date).
+        """
+        condiciones, parametros = [], []
+        if re.match(r'^\d{13}$', filtro):
+            condiciones.append(f"{prefijo}serial_number = ?")
+            parametros.append(filtro)
+        elif re.match(r'^[A-Z]+-\d{9}$', filtro): # OT completa (las OTs se registran en mayúsculas)
+            condiciones.append(f"{prefijo}ot_number = ?")
+            parametros.append(filtro)
+        elif filtro:
+            condiciones.append(f"({prefijo}ot_number = ? OR UPPER({prefijo}ot_number) LIKE ? OR {prefijo}serial_number LIKE ?)")
+            parametros += [filtro, f"%{filtro}%", f"%{filtro}%"]
+        if estado:
+            condiciones.append(f"{prefijo}overall_status = ?")
+            parametros.append(estado)
+        if desde:
+            condiciones.append(f"{prefijo}entry_date >= ?")
+            parametros.append(desde)
+        if hasta:
+            condiciones.append(f"{prefijo}entry_date <= ?")
+            parametros.append(hasta)
+        return " AND ".join(condiciones) or "1", parametros
+
+    def _orden_sql(self, columna, descendente, prefijo=""):
+        """ORDER BY de una columna de la vista (ver ORDEN_REGISTROS), en la misma dirección para el desempate."""
+        direccion = "DESC" if descendente else "ASC"
+        columnas = ORDEN_REGISTROS[columna]
+        if prefijo: # cable_latest_status: el id es last_entry_id y el desempate, la serie (clave de la tabla)
+            columnas = [("last_entry_id" if i == 0 else "serial_number") if c == "id" else c for i, c in enumerate(columnas)]
+            columnas = list(dict.fromkeys(columnas))
+        return ", ".join(f"{prefijo}{c} {direccion}" for c in columnas)
+
+    def _consulta_registros(self, filtro="", estado="", desde="", hasta="", columna="Fecha Entrada",
+                            descendente=True, solo_ultimo=False, limite=LIMITE_VISTA_REGISTROS):
+        """
+        Consulta (sql, parámetros) de la vista de registros: filtros, orden y LIMIT se resuelven en la base,
+        así la vista sigue siendo ágil con cientos de miles de registros. En "solo último estado" se parte
+        de cable_latest_status y se trae el registro completo por su id.
+        """
+        prefijo = "ls." if solo_ultimo else ""
+        condicion, parametros = self._condiciones_registros(filtro, estado, desde, hasta, prefijo)
+        columnas = ", ".join(f"cv.{c}" if solo_ultimo else c for c in COLUMNAS_EXPORTACION)
+        origen = ("cable_latest_status ls JOIN cable_verifications cv ON cv.id = ls.last_entry_id"
+                  if solo_ultimo else "cable_verifications")
+        sql = f"SELECT {columnas} FROM {origen} WHERE {condicion} ORDER BY {self._orden_sql(columna, descendente, prefijo)} LIMIT ?"
+        return sql, (*parametros, limite)
+
+    def _ordenar_registros(self, columna):
+        """Clic en un encabezado: ordena por esa columna (un segundo clic invierte el sentido)."""
+        actual, descendente = self.orden_registros
+        self.orden_registros = (columna, not descendente if columna == actual else columna in ("ID", "Fecha Entrada"))
+        self._marcar_orden_registros()
+        self.cargar_registros()
+
+    def _marcar_orden_registros(self):
+        """Muestra ▲/▼ en el encabezado de la columna por la que se ordena."""
+        columna, descendente = self.orden_registros
+        for col in ORDEN_REGISTROS:
+            flecha = (" ▼" if descendente else " ▲") if col == columna else ""
+            self.tree_registros.heading(col, text=f"{col}{flecha}")
+
+    def aplicar_filtro_registros(self, event=None):
+        """Aplica los filtros de la vista (OT/serie, estado, fechas) a los registros mostrados."""
+        self.cargar_registros()
 
     def limpiar_filtro_registros(self):
         """Limpia el campo de filtro y recarga todos los registros."""
         self.filtro_entry.delete(0, tk.END)
+        self.estado_filtro_combo.set(ESTADOS_FILTRO_REGISTROS[0])
+        self.desde_filtro_entry.delete(0, tk.END)
+        self.hasta_filtro_entry.delete(0, tk.END)
         self.cargar_registros()
 
+    def _construir_detalles_registro_bd(self, detalles_window):
+        """Arma la ventana de detalles de un registro (una sola vez); el contenido lo completa mostrar_detalles_registro_bd."""
+        frame = ttk.Frame(detalles_window, padding=(20, 20), style="TFrame")
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        w = {}
+        ttk.Label(frame, text="📋 Información General:", font=("Arial", 12, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(anchor="w", pady=(0, 10))
+        w['info_general'] = ttk.Label(frame, justify=tk.LEFT, font=("Arial", 10), foreground="#6C757D", background="#F0F4F8")
+        w['info_general'].pack(anchor="w")
+
+        # Estado general
+        ttk.Label(frame, text="🏁 Estado General:", font=("Arial", 12, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(anchor="w", pady=(10, 5))
+        w['estado_general'] = ttk.Label(frame, font=("Arial", 10, "bold"), background="#F0F4F8")
+        w['estado_general'].pack(anchor="w")
+
+        # Detalles ILRL y Geometría: estado, fecha y una sección que cambia según haya detalles o no
+        for clave, titulo, boton in (('ilrl', "📊 Detalles ILRL:", "Ver Detalles ILRL (Ventana Completa)"),
+                                     ('geo', "📐 Detalles Geometría:", "Ver Detalles Geometría (Ventana Completa)")):
+            ttk.Label(frame, text=titulo, font=("Arial", 12, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(anchor="w", pady=(10, 5))
+            w[f'{clave}_estado'] = ttk.Label(frame, font=("Arial", 10, "bold"), background="#F0F4F8")
+            w[f'{clave}_estado'].pack(anchor="w")
+            w[f'{clave}_fecha'] = ttk.Label(frame, font=("Arial", 10), foreground="#6C757D", background="#F0F4F8")
+            w[f'{clave}_fecha'].pack(anchor="w")
+
+            seccion = ttk.Frame(frame, style="TFrame")
+            seccion.pack(fill=tk.X, anchor="w")
+            w[f'{clave}_seccion'] = seccion
+            w[f'{clave}_archivos'] = ttk.Label(seccion, justify=tk.LEFT, font=("Arial", 9), foreground="#6C757D", background="#F0F4F8", wraplength=700)
+            w[f'{clave}_boton'] = ttk.Button(seccion, text=boton, style="Secondary.TButton")
+            w[f'{clave}_sin_datos'] = ttk.Label(seccion, font=("Arial", 10), foreground="#999999", background="#F0F4F8")
+        return w
+
     def mostrar_detalles_registro_bd(self, event):
         """Muestra una ventana de detalles para el registro seleccionado en la base de datos."""
         selected_item_id = self.tree_registros.focus()
@@ -1268,77 +3804,339 @@ class VerificadorCables:
             return
 
         record_id = int(selected_item_id)
-        record_data = self.item_data_cache.get(record_id)
+        fila = self.item_data_cache.get(record_id)
 
-        if not record_data:
+        if not fila:
             messagebox.showerror("Error", "No se encontraron los detalles del registro.")
             return
+        record_data = dict(zip(COLUMNAS_EXPORTACION[:9], fila[:9]))
+        record_data['ilrl_details'] = decodificar_detalles(fila[9])
+        record_data['geo_details'] = decodificar_detalles(fila[10])
 
-        detalles_window = tk.Toplevel(self.root)
-        detalles_window.title(f"Detalles del Registro #{record_data['id']}")
-        detalles_window.geometry("800x600")
-        detalles_window.transient(self.root)
-        detalles_window.grab_set()
+        w = self._ventana_reutilizable('detalles_registro', f"Detalles del Registro #{record_data['id']}", "800x600",
+                                       self._construir_detalles_registro_bd)
 
-        frame = ttk.Frame(detalles_window, padding=(20, 20), style="TFrame")
-        frame.pack(fill=tk.BOTH, expand=True)
+        def color_estado(estado):
+            return "green" if estado == "APROBADO" else "red" if estado == "RECHAZADO" else "orange"
 
-        ttk.Label(frame, text="📋 Información General:", font=("Arial", 12, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(anchor="w", pady=(0, 10))
-        
-        info_general_text = (
+        w['info_general'].config(text=(
             f"   • ID de Registro: {record_data['id']}\n"
             f"   • Fecha de Entrada: {record_data['entry_date']}\n"
             f"   • Número de Serie: {record_data['serial_number']}\n"
             f"   • Número de OT: {record_data['ot_number']}\n"
-        )
-        ttk.Label(frame, text=info_general_text, justify=tk.LEFT, font=("Arial", 10), foreground="#6C757D", background="#F0F4F8").pack(anchor="w")
-
-        # Estado general
-        ttk.Label(frame, text="🏁 Estado General:", font=("Arial", 12, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(anchor="w", pady=(10, 5))
-        overall_status_color = "green" if record_data['overall_status'] == "APROBADO" else "red" if record_data['overall_status'] == "RECHAZADO" else "orange"
-        ttk.Label(frame, text=f"   • {record_data['overall_status']}", font=("Arial", 10, "bold"), foreground=overall_status_color, background="#F0F4F8").pack(anchor="w")
+        ))
+        w['estado_general'].config(text=f"   • {record_data['overall_status']}", foreground=color_estado(record_data['overall_status']))
 
         # Detalles ILRL
-        ttk.Label(frame, text="📊 Detalles ILRL:", font=("Arial", 12, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(anchor="w", pady=(10, 5))
-        ilrl_status_color = "green" if record_data['ilrl_status'] == "APROBADO" else "red" if record_data['ilrl_status'] == "RECHAZADO" else "orange"
-        ttk.Label(frame, text=f"   • Estado: {record_data['ilrl_status']}", font=("Arial", 10, "bold"), foreground=ilrl_status_color, background="#F0F4F8").pack(anchor="w")
-        ttk.Label(frame, text=f"   • Fecha: {record_data['ilrl_date'] if record_data['ilrl_date'] else 'N/A'}", font=("Arial", 10), foreground="#6C757D", background="#F0F4F8").pack(anchor="w")
-        
+        w['ilrl_estado'].config(text=f"   • Estado: {record_data['ilrl_status']}", foreground=color_estado(record_data['ilrl_status']))
+        w['ilrl_fecha'].config(text=f"   • Fecha: {record_data['ilrl_date'] if record_data['ilrl_date'] else 'N/A'}")
+
         ilrl_details_from_db = record_data['ilrl_details']
+        lineas_archivos = []
         if ilrl_details_from_db:
-            # Ahora mostramos los archivos que contribuyeron a la verificación ILRL
-            processed_files_display = details_to_show.get('ilrl_analizado_paths', [])
+            # Archivos que contribuyeron a la verificación ILRL
+            processed_files_display = sorted({p.origen_archivo for p in ilrl_details_from_db.puntas})
             if processed_files_display:
-                ttk.Label(frame, text="   • Archivos procesados:", font=("Arial", 9, "bold"), foreground="#6C757D", background="#F0F4F8").pack(anchor="w")
+                lineas_archivos.append("   • Archivos procesados:")
                 for file_path in processed_files_display:
                     origen = "(Subcarpeta F)" if "\\F\\" in file_path else "(Carpeta principal)"
-                    ttk.Label(frame, text=f"     - {os.path.basename(file_path)} {origen}", font=("Arial", 9), foreground="#6C757D", background="#F0F4F8", wraplength=700).pack(anchor="w")
-            
-            btn_ver_detalles_ilrl = ttk.Button(frame, text="Ver Detalles ILRL (Ventana Completa)", 
-                                            command=lambda: self.mostrar_detalles_ilrl(ilrl_details_from_db), 
-                                            style="Secondary.TButton")
-            btn_ver_detalles_ilrl.pack(anchor="w", pady=(5, 5))
-        else:
-            ttk.Label(frame, text="   • No hay detalles ILRL disponibles.", font=("Arial", 10), foreground="#999999", background="#F0F4F8").pack(anchor="w")
+                    lineas_archivos.append(f"     - {os.path.basename(file_path)} {origen}")
+        self._mostrar_seccion_detalle(w, 'ilrl', "\n".join(lineas_archivos),
+                                      (lambda: self.mostrar_detalles_ilrl(ilrl_details_from_db)) if ilrl_details_from_db else None,
+                                      "   • No hay detalles ILRL disponibles.")
 
         # Detalles Geometría
-        ttk.Label(frame, text="📐 Detalles Geometría:", font=("Arial", 12, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(anchor="w", pady=(10, 5))
-        geo_status_color = "green" if record_data['geo_status'] == "APROBADO" else "red" if record_data['geo_status'] == "RECHAZADO" else "orange"
-        ttk.Label(frame, text=f"   • Estado: {record_data['geo_status']}", font=("Arial", 10, "bold"), foreground=geo_status_color, background="#F0F4F8").pack(anchor="w")
-        geo_date_str = record_data['geo_date'] if record_data['geo_date'] else 'N/A'
-        ttk.Label(frame, text=f"   • Fecha: {geo_date_str}", font=("Arial", 10), foreground="#6C757D", background="#F0F4F8").pack(anchor="w")
-
-        if record_data['geo_details'] and record_data['geo_details'].get('file_path'):
-            origen = "(Subcarpeta F)" if "\\F\\" in record_data['geo_details']['file_path'] else "(Carpeta principal)"
-            ttk.Label(frame, text=f"   • Archivo: {record_data['geo_details']['file_path']} {origen}", font=("Arial", 9), foreground="#6C757D", background="#F0F4F8", wraplength=700).pack(anchor="w")
-            btn_ver_detalles_geo = ttk.Button(frame, text="Ver Detalles Geometría (Ventana Completa)", 
-                                              command=lambda: self.mostrar_detalles_geo(record_data['geo_details']), 
-                                              style="Secondary.TButton")
-            btn_ver_detalles_geo.pack(anchor="w", pady=(5, 5))
+        w['geo_estado'].config(text=f"   • Estado: {record_data['geo_status']}", foreground=color_estado(record_data['geo_status']))
+        w['geo_fecha'].config(text=f"   • Fecha: {record_data['geo_date'] if record_data['geo_date'] else 'N/A'}")
+
+        geo_details = record_data['geo_details']
+        if geo_details and geo_details.archivo:
+            origen = "(Subcarpeta F)" if "\\F\\" in geo_details.archivo else "(Carpeta principal)"
+            self._mostrar_seccion_detalle(w, 'geo', f"   • Archivo: {geo_details.archivo} {origen}",
+                                          lambda: self.mostrar_detalles_geo(geo_details), None)
         else:
-            ttk.Label(frame, text="   • No hay detalles de Geometría disponibles.", font=("Arial", 10), foreground="#999999", background="#F0F4F8").pack(anchor="w")
-        
-        detalles_window.mainloop()
+            self._mostrar_seccion_detalle(w, 'geo', "", None, "   • No hay detalles de Geometría disponibles.")
+
+    def _mostrar_seccion_detalle(self, w, clave, texto_archivos, accion_boton, texto_sin_datos):
+        """Rearma (sin recrear widgets) la sección ILRL o Geometría de la ventana de detalles de un registro."""
+        for widget in w[f'{clave}_seccion'].winfo_children():
+            widget.pack_forget()
+        if texto_archivos:
+            w[f'{clave}_archivos'].config(text=texto_archivos)
+            w[f'{clave}_archivos'].pack(anchor="w")
+        if accion_boton:
+            w[f'{clave}_boton'].config(command=accion_boton)
+            w[f'{clave}_boton'].pack(anchor="w", pady=(5, 5))
+        if texto_sin_datos:
+            w[f'{clave}_sin_datos'].config(text=texto_sin_datos)
+            w[f'{clave}_sin_datos'].pack(anchor="w")
+
+    def _consultar_rollups(self, dias, ot=None):
+        """
+        Lee los acumulados de los últimos `dias` días de producción desde rollup_produccion.
+        Retorna: dict con totales y agrupaciones por día, OT, turno y causa de falla.
+        """
+        desde = (datetime.now() - timedelta(days=dias - 1)).strftime("%Y-%m-%d")
+        condicion = "WHERE dia >= ?"
+        parametros = [desde]
+        if ot:
+            condicion += " AND ot_number = ?"
+            parametros.append(ot.strip().upper())
+        sumas = ", ".join(f"SUM({c})" for c in COLUMNAS_ROLLUP)
+
+        conn = sqlite3.connect(self.db_name, check_same_thread=False)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {sumas} FROM rollup_produccion {condicion}", parametros)
+            totales = dict(zip(COLUMNAS_ROLLUP, (v or 0 for v in cursor.fetchone())))
+            agrupaciones = {}
+            for campo in ("dia", "ot_number", "turno"):
+                cursor.execute(f"SELECT {campo}, {sumas} FROM rollup_produccion {condicion} GROUP BY {campo} ORDER BY {campo}", parametros)
+                agrupaciones[campo] = [(fila[0], dict(zip(COLUMNAS_ROLLUP, fila[1:]))) for fila in cursor.fetchall()]
+            return totales, agrupaciones
+        finally:
+            conn.close()
+
+    def mostrar_estadisticas(self, parent=None):
+        """Ventana de estadísticas de producción (rendimiento por día, OT, turno y causa de falla)."""
+        stats_window = tk.Toplevel(parent or self.root)
+        stats_window.title("Estadísticas de Producción")
+        stats_window.geometry("900x600")
+        stats_window.transient(parent or self.root)
+
+        main_frame = ttk.Frame(stats_window, padding=(20, 20), style="TFrame")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        filter_frame = ttk.Frame(main_frame, style="TFrame")
+        filter_frame.pack(fill=tk.X, pady=(0, 10))
+
+        ttk.Label(filter_frame, text="Últimos días:", font=("Arial", 10, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(side=tk.LEFT, padx=(0, 5))
+        dias_combo = ttk.Combobox(filter_frame, values=("1", "7", "30", "90", "365"), state="readonly", width=6)
+        dias_combo.set("7")
+        dias_combo.pack(side=tk.LEFT, padx=(0, 10))
+
+        ttk.Label(filter_frame, text="OT (opcional):", font=("Arial", 10, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(side=tk.LEFT, padx=(0, 5))
+        ot_entry = ttk.Entry(filter_frame, width=20, font=("Arial", 10), style="TEntry")
+        ot_entry.pack(side=tk.LEFT, padx=(0, 10))
+
+        resumen_label = ttk.Label(main_frame, text="", font=("Arial", 11, "bold"), foreground="#2C3E50", background="#F0F4F8")
+        resumen_label.pack(anchor="w", pady=(0, 10))
+
+        notebook = ttk.Notebook(main_frame)
+        notebook.pack(fill=tk.BOTH, expand=True)
+
+        # Pestaña 1: gráfico de barras por día
+        grafico = tk.Canvas(notebook, background="#FFFFFF", highlightthickness=0)
+        notebook.add(grafico, text="Por día")
+
+        def crear_tabla(titulo_primera_columna):
+            columnas = (titulo_primera_columna, "Total", "Aprobados", "Rechazados", "No encontrados", "Rendimiento")
+            tabla = ttk.Treeview(notebook, columns=columnas, show="headings")
+            for col in columnas:
+                tabla.heading(col, text=col, anchor=tk.W)
+                tabla.column(col, width=120, anchor=tk.W)
+            return tabla
+
+        tabla_ot = crear_tabla("OT")
+        notebook.add(tabla_ot, text="Por OT")
+        tabla_turno = crear_tabla("Turno")
+        notebook.add(tabla_turno, text="Por turno")
+
+        tabla_causas = ttk.Treeview(notebook, columns=("Causa", "Cables"), show="headings")
+        tabla_causas.heading("Causa", text="Causa", anchor=tk.W)
+        tabla_causas.heading("Cables", text="Cables", anchor=tk.W)
+        tabla_causas.column("Causa", width=300, anchor=tk.W)
+        notebook.add(tabla_causas, text="Causas de falla")
+
+        ultimo_por_dia = []
+
+        def rendimiento(c):
+            return f"{c['aprobados'] / c['total'] * 100:.1f}%" if c['total'] else "N/A"
+
+        def dibujar_grafico(por_dia):
+            grafico.delete("all")
+            ancho = max(grafico.winfo_width(), 400)
+            alto = max(grafico.winfo_height(), 300)
+            if not por_dia:
+                grafico.create_text(ancho // 2, alto // 2, text="Sin datos en el período seleccionado", fill="#6C757D")
+                return
+            margen = 40
+            maximo = max(c['total'] for _, c in por_dia) or 1
+            ancho_barra = max((ancho - 2 * margen) / len(por_dia), 2)
+            for i, (dia, c) in enumerate(por_dia):
+                x0 = margen + i * ancho_barra
+                y_base = alto - margen
+                # Barra apilada: aprobados (verde), rechazados (rojo), no encontrados (naranja)
+                for campo, color in (("aprobados", "#28A745"), ("rechazados", "#DC3545"), ("no_encontrados", "#FFC107")):
+                    altura = c[campo] / maximo * (alto - 2 * margen)
+                    grafico.create_rectangle(x0 + 2, y_base - altura, x0 + ancho_barra - 2, y_base, fill=color, outline="")
+                    y_base -= altura
+                if len(por_dia) <= 31:
+                    grafico.create_text(x0 + ancho_barra / 2, alto - margen + 12, text=dia[5:], font=("Arial", 7), fill="#333333")
+            grafico.create_text(margen, margen / 2, text=f"Máximo diario: {maximo} cables", anchor="w", font=("Arial", 8), fill="#6C757D")
+
+        def actualizar(event=None):
+            try:
+                totales, agrupaciones = self._consultar_rollups(int(dias_combo.get()), ot_entry.get().strip() or None)
+            except sqlite3.Error as e:
+                messagebox.showerror("Error de Base de Datos", f"No se pudieron cargar las estadísticas: {e}", parent=stats_window)
+                return
+
+            resumen_label.config(text=(f"Total: {totales['total']}   ✅ Aprobados: {totales['aprobados']}   "
+                                       f"❌ Rechazados: {totales['rechazados']}   ⚠️ No encontrados: {totales['no_encontrados']}   "
+                                       f"Rendimiento: {rendimiento(totales)}"))
+
+            for tabla, clave in ((tabla_ot, "ot_number"), (tabla_turno, "turno")):
+                tabla.delete(*tabla.get_children())
+                for nombre, c in agrupaciones[clave]:
+                    tabla.insert("", tk.END, values=(nombre, c['total'], c['aprobados'], c['rechazados'], c['no_encontrados'], rendimiento(c)))
+
+            tabla_causas.delete(*tabla_causas.get_children())
+            for texto, campo in (("ILRL rechazado", "ilrl_rechazado"), ("ILRL no encontrado", "ilrl_no_encontrado"),
+                                 ("Geometría rechazada", "geo_rechazado"), ("Geometría no encontrada", "geo_no_encontrado")):
+                tabla_causas.insert("", tk.END, values=(texto, totales[campo]))
+
+            ultimo_por_dia[:] = agrupaciones["dia"]
+            dibujar_grafico(ultimo_por_dia)
+
+        dias_combo.bind("<<ComboboxSelected>>", actualizar)
+        ot_entry.bind("<Return>", actualizar)
+        ttk.Button(filter_frame, text="Actualizar", command=actualizar, style="TButton").pack(side=tk.LEFT)
+        grafico.bind("<Configure>", lambda e: dibujar_grafico(ultimo_por_dia)) # Redibujar sin volver a consultar
+
+        actualizar()
+
+    def mostrar_cuarentena(self):
+        """Lista de diagnóstico de los libros en cuarentena (no se pudieron interpretar y no cambiaron desde entonces)."""
+        widgets = self._ventana_reutilizable('cuarentena', "Libros Ilegibles en Cuarentena", "1000x400",
+                                             self._construir_cuarentena)
+        widgets['actualizar']()
+
+    def _construir_cuarentena(self, ventana):
+        """Arma la ventana de cuarentena (una sola vez); el contenido lo recarga 'actualizar'."""
+        main_frame = ttk.Frame(ventana, padding=(20, 20), style="TFrame")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        resumen_label = ttk.Label(main_frame, text="", font=("Arial", 11, "bold"), foreground="#2C3E50", background="#F0F4F8")
+        resumen_label.pack(anchor="w", pady=(0, 10))
+
+        columnas = ("Libro", "Tipo", "Motivo", "Desde", "Carpeta")
+        tabla = ttk.Treeview(main_frame, columns=columnas, show="headings")
+        for col, ancho in zip(columnas, (220, 50, 320, 130, 260)):
+            tabla.heading(col, text=col, anchor=tk.W, command=lambda c=col: self._ordenar_treeview(tabla, c))
+            tabla.column(col, width=ancho, anchor=tk.W)
+        tabla.pack(fill=tk.BOTH, expand=True)
+
+        def actualizar():
+            tabla.delete(*tabla.get_children())
+            libros = self.libros_en_cuarentena()
+            for ruta, libro in libros:
+                tabla.insert("", tk.END, iid=ruta, values=(os.path.basename(ruta), libro.tipo.upper(), libro.motivo,
+                                                          libro.desde, os.path.dirname(ruta)))
+            resumen_label.config(text=f"Libros en cuarentena: {len(libros)} (se vuelven a leer solos cuando cambian)")
+
+        def reintentar():
+            self.liberar_cuarentena(tabla.selection() or None)
+            actualizar()
+
+        button_frame = ttk.Frame(main_frame, style="TFrame")
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(button_frame, text="Actualizar", command=actualizar, style="TButton").pack(side=tk.LEFT)
+        ttk.Button(button_frame, text="♻️ Reintentar (selección o todos)", command=reintentar,
+                   style="TButton").pack(side=tk.LEFT, padx=10)
+        return {'actualizar': actualizar}
+
+    def _ordenar_treeview(self, tree, columna, descendente=False):
+        """Ordena las filas de un Treeview por columna (numérica si los valores lo permiten); alterna el sentido."""
+        filas = [(tree.set(item, columna), item) for item in tree.get_children("")]
+        try:
+            filas.sort(key=lambda f: float(str(f[0]).split('/')[0]), reverse=descendente)
+        except ValueError:
+            filas.sort(key=lambda f: str(f[0]), reverse=descendente)
+        for indice, (_, item) in enumerate(filas):
+            tree.move(item, "", indice)
+        tree.heading(columna, command=lambda: self._ordenar_treeview(tree, columna, not descendente))
+
+    def mostrar_reporte_ot(self):
+        """Ventana del reporte de completitud de una OT (qué series aún no tienen ILRL o Geometría completos)."""
+        reporte_window = tk.Toplevel(self.root)
+        reporte_window.title("Reporte de Completitud de OT")
+        reporte_window.geometry("1000x650")
+        reporte_window.transient(self.root)
+
+        main_frame = ttk.Frame(reporte_window, padding=(20, 20), style="TFrame")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        filter_frame = ttk.Frame(main_frame, style="TFrame")
+        filter_frame.pack(fill=tk.X, pady=(0, 10))
+
+        ttk.Label(filter_frame, text="Número de OT:", font=("Arial", 10, "bold"), foreground="#2C3E50", background="#F0F4F8").pack(side=tk.LEFT, padx=(0, 5))
+        ot_entry = ttk.Entry(filter_frame, width=25, font=("Arial", 10), style="TEntry")
+        ot_entry.insert(0, self.ot_entry.get().strip().upper() if self.ot_entry else "")
+        ot_entry.pack(side=tk.LEFT, padx=(0, 10))
+
+        solo_incompletos_var = tk.BooleanVar(value=False)
+
+        resumen_label = ttk.Label(main_frame, text="Ingrese una OT y presione 'Generar Reporte'.", font=("Arial", 10, "bold"),
+                                  foreground="#2C3E50", background="#F0F4F8")
+        resumen_label.pack(anchor="w", pady=(0, 10))
+
+        columnas = ("Serie", "ILRL", "Puntas ILRL PASS", "Geometría", "Puntas Geo", "Libro Geometría", "Último Escaneo", "Falta")
+        tree = ttk.Treeview(main_frame, columns=columnas, show="headings")
+        for col in columnas:
+            tree.heading(col, text=col, anchor=tk.W, command=lambda c=col: self._ordenar_treeview(tree, c))
+            tree.column(col, width=110, anchor=tk.W)
+        tree.column("Serie", width=130, stretch=tk.NO)
+        tree.column("Libro Geometría", width=200)
+        tree.tag_configure('COMPLETO', foreground='green')
+        tree.tag_configure('INCOMPLETO', foreground='red')
+
+        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(fill=tk.BOTH, expand=True)
+
+        ultimo_reporte = []
+
+        def mostrar(reporte):
+            ultimo_reporte[:] = reporte
+            tree.delete(*tree.get_children())
+            for fila in reporte:
+                if solo_incompletos_var.get() and fila['falta'] == "COMPLETO":
+                    continue
+                tree.insert("", tk.END, values=(
+                    fila['serie'], fila['ilrl_estado'], f"{fila['ilrl_puntas_pass']}/4",
+                    fila['geo_estado'], f"{fila['geo_puntas']}/4", fila['geo_archivo'] or "N/A",
+                    fila['ultimo_escaneo'], fila['falta']
+                ), tags=('COMPLETO' if fila['falta'] == "COMPLETO" else 'INCOMPLETO',))
+            completos = sum(1 for f in reporte if f['falta'] == "COMPLETO")
+            sin_ilrl = sum(1 for f in reporte if "ILRL" in f['falta'])
+            sin_geo = sum(1 for f in reporte if "Geometría" in f['falta'])
+            resumen_label.config(text=(f"Cables: {len(reporte)}   ✅ Completos: {completos}   "
+                                       f"❌ Falta ILRL: {sin_ilrl}   ❌ Falta Geometría: {sin_geo}"))
+
+        def generar():
+            ot = ot_entry.get().strip().upper()
+            if not ot:
+                messagebox.showwarning("OT Requerida", "Ingrese el número de OT.", parent=reporte_window)
+                return
+            resumen_label.config(text=f"⏳ Leyendo archivos de la OT {ot}...")
+            btn_generar.config(state=tk.DISABLED)
+
+            # La lectura de libros corre en segundo plano; la tabla se llena desde el hilo de Tk
+            def tarea():
+                try:
+                    reporte = self.generar_reporte_ot(ot)
+                    self._en_hilo_ui(lambda: (mostrar(reporte), btn_generar.config(state=tk.NORMAL)))
+                except Exception as e:
+                    self._en_hilo_ui(lambda e=e: (resumen_label.config(text=f"Error generando el reporte: {e}"),
+                                                     btn_generar.config(state=tk.NORMAL)))
+            threading.Thread(target=tarea, name="reporte-ot", daemon=True).start()
+
+        btn_generar = ttk.Button(filter_frame, text="📋 Generar Reporte", command=generar, style="Primary.TButton")
+        btn_generar.pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Checkbutton(filter_frame, text="Solo incompletos", variable=solo_incompletos_var,
+                        command=lambda: mostrar(list(ultimo_reporte))).pack(side=tk.LEFT)
 
     def create_main_window(self):
         self.root = tk.Tk()
@@ -1368,6 +4166,13 @@ class VerificadorCables:
         style.configure("Danger.TButton", background="#DC3545", foreground="#FFFFFF")
         style.map("Danger.TButton", background=[('active', '#C82333')])
 
+        # Estilos de las ventanas de detalle (se configuran una sola vez)
+        style.configure("Detalles.TFrame", background="#F0F4F8")
+        style.configure("Detalles.TLabel", background="#F0F4F8", foreground="#2C3E50")
+        style.configure("Detalles.Treeview", background="#FFFFFF", fieldbackground="#FFFFFF")
+        style.configure("Detalles.Treeview.Heading", background="#E9ECEF", foreground="#2C3E50", font=('Arial', 9, 'bold'))
+        style.map("Detalles.Treeview", background=[('selected', '#007BFF')])
+
         # Create a Canvas and a Scrollbar
         canvas = tk.Canvas(self.root, background="#F0F4F8")
         scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=canvas.yview)
@@ -1385,9 +4190,17 @@ class VerificadorCables:
             canvas.configure(scrollregion=canvas.bbox("all"))
         scrollable_content_frame.bind("<Configure>", on_frame_configure)
         
-        # Make the scrollbar work with mouse wheel
+        # Make the scrollbar work with mouse wheel: un único manejador global que desplaza
+        # el canvas de la ventana bajo el puntero (las ventanas de detalle se registran en _canvas_por_ventana)
+        self._canvas_por_ventana[self.root] = canvas
+
         def _on_mouse_wheel(event):
-            canvas.yview_scroll(-1 * int((event.delta / 120)), "units")
+            try:
+                destino = self._canvas_por_ventana.get(event.widget.winfo_toplevel())
+            except (AttributeError, KeyError, tk.TclError): # Widgets internos de Tk (p. ej. listas de Combobox)
+                return
+            if destino is not None and destino.winfo_exists():
+                destino.yview_scroll(-1 * int((event.delta / 120)), "units")
         
         canvas.bind_all("<MouseWheel>", _on_mouse_wheel)
 
@@ -1411,6 +4224,10 @@ class VerificadorCables:
         self.serie_entry.grid(row=1, column=1, pady=5, padx=10, sticky="ew")
         self.serie_entry.bind("<KeyRelease>", self.verificar_cable_automatico)
 
+        self.modo_cola_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(input_frame, text="📥 Modo cola de escaneo (escaneos continuos, resultados en lista)", 
+                        variable=self.modo_cola_var, command=self._alternar_modo_cola).grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=5)
+
         # Botones de Acción
         button_frame = ttk.Frame(scrollable_content_frame, padding=10, style="TFrame")
         button_frame.grid(row=2, column=0, columnspan=2, pady=10)
@@ -1433,6 +4250,12 @@ class VerificadorCables:
     )
         btn_diagnostico_db.pack(side=tk.LEFT, padx=10, ipadx=10, ipady=5)
 
+        btn_cuarentena = ttk.Button(button_frame, text="🚧 Libros Ilegibles", command=self.mostrar_cuarentena, style="TButton")
+        btn_cuarentena.pack(side=tk.LEFT, padx=10, ipadx=10, ipady=5)
+
+        btn_reporte_ot = ttk.Button(button_frame, text="📋 Reporte OT", command=self.mostrar_reporte_ot, style="TButton")
+        btn_reporte_ot.pack(side=tk.LEFT, padx=10, ipadx=10, ipady=5)
+
         # --- Nuevo diseño para rutas e instrucciones ---
         info_area_frame = ttk.Frame(scrollable_content_frame, style="TFrame")
         info_area_frame.grid(row=3, column=0, columnspan=2, pady=10, sticky="ew")
@@ -1441,10 +4264,10 @@ class VerificadorCables:
         rutas_frame = ttk.Frame(info_area_frame, padding=10, style="TFrame")
         rutas_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
         
-        self.ruta_ilrl_label = ttk.Label(rutas_frame, text=f"📂 Ruta ILRL: {self.ruta_base_ilrl}", font=("Arial", 9), foreground="#666666")
+        self.ruta_ilrl_label = ttk.Label(rutas_frame, text=f"📂 Ruta ILRL: {'; '.join(self.rutas_ilrl)}", font=("Arial", 9), foreground="#666666")
         self.ruta_ilrl_label.pack(anchor="w")
 
-        self.ruta_geo_label = ttk.Label(rutas_frame, text=f"📂 Ruta Geometría: {self.ruta_base_geo}", font=("Arial", 9), foreground="#666666")
+        self.ruta_geo_label = ttk.Label(rutas_frame, text=f"📂 Ruta Geometría: {'; '.join(self.rutas_geo)}", font=("Arial", 9), foreground="#666666")
         self.ruta_geo_label.pack(anchor="w")
 
         # Sub-frame para las Instrucciones (a la derecha de las rutas)
@@ -1484,6 +4307,30 @@ class VerificadorCables:
         self.resultado_text.tag_configure("verde", foreground="#28A745")
         self.resultado_text.tag_configure("rojo", foreground="#DC3545")
         self.resultado_text.tag_configure("orange", foreground="#FFC107")
+
+        # Lista de la cola de escaneo (visible solo en modo cola)
+        self.cola_frame = ttk.Frame(resultado_frame, style="TFrame")
+        self.cola_resumen_label = ttk.Label(self.cola_frame, text="", font=("Arial", 9, "bold"), foreground="#2C3E50")
+        self.cola_resumen_label.pack(anchor="w")
+        columnas_cola = ("#", "Hora", "Serie", "Estado", "ILRL", "Geometría")
+        self.cola_tree = ttk.Treeview(self.cola_frame, columns=columnas_cola, show="headings", height=8)
+        for col in columnas_cola:
+            self.cola_tree.heading(col, text=col, anchor=tk.W)
+            self.cola_tree.column(col, width=110, anchor=tk.W)
+        self.cola_tree.column("#", width=50, stretch=tk.NO)
+        self.cola_tree.column("Hora", width=70, stretch=tk.NO)
+        self.cola_tree.column("Serie", width=120, stretch=tk.NO)
+        self.cola_tree.tag_configure('APROBADO', foreground='green')
+        self.cola_tree.tag_configure('RECHAZADO', foreground='red')
+        self.cola_tree.tag_configure('NO ENCONTRADO', foreground='orange')
+        self.cola_tree.tag_configure('ERROR', foreground='red')
+        self.cola_tree.tag_configure('EN COLA', foreground='#6C757D')
+        cola_scroll = ttk.Scrollbar(self.cola_frame, orient="vertical", command=self.cola_tree.yview)
+        self.cola_tree.configure(yscrollcommand=cola_scroll.set)
+        cola_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.cola_tree.pack(fill=tk.BOTH, expand=True)
+        self.cola_tree.bind("<Double-1>", self._mostrar_item_cola)
+        self._actualizar_resumen_cola()
         
         button_exit_frame = ttk.Frame(scrollable_content_frame, style="TFrame")
         button_exit_frame.grid(row=5, column=0, columnspan=2, pady=(15, 5))
@@ -1507,8 +4354,652 @@ class VerificadorCables:
         scrollable_content_frame.grid_columnconfigure(0, weight=1)
         scrollable_content_frame.grid_columnconfigure(1, weight=1)
 
+        self.root.after(INTERVALO_COLA_UI_MS, self._procesar_cola_ui)
+        self._archivar_al_inicio() # Solo si hay meses de retención configurados
+        self.root.after(RETARDO_PRECALENTAMIENTO_MS, self._precalentar_al_inicio) # Ya con la ventana en pantalla
+        self._iniciar_api() # Solo si hay puerto de API configurado
+        self._iniciar_metricas() # Solo si hay archivo de métricas configurado
         self.root.mainloop()
 
-if __name__ == "__main__":
+
+def _inicializar_db_servidor(db_path):
+    """Crea la base central del servidor de línea (mismo esquema + estación de origen)."""
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL") # Lecturas de supervisores sin bloquear las escrituras
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cable_verifications (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                entry_date TEXT NOT NULL,
+                serial_number TEXT NOT NULL,
+                ot_number TEXT NOT NULL,
+                overall_status TEXT NOT NULL,
+                ilrl_status TEXT,
+                ilrl_date TEXT,
+                geo_status TEXT,
+                geo_date TEXT,
+                ilrl_details_json TEXT,
+                geo_details_json TEXT,
+                estacion TEXT NOT NULL,
+                id_origen INTEGER NOT NULL,
+                UNIQUE (estacion, id_origen)
+            )
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+class _ManejadorJson(http.server.BaseHTTPRequestHandler):
+    """Base de los servidores HTTP de la aplicación: respuestas JSON y conexiones keep-alive."""
+    protocol_version = "HTTP/1.1" # Keep-alive: los clientes reutilizan la conexión entre solicitudes
+
+    def _responder_json(self, estado, datos, encabezados=None):
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode('utf-8')
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        for nombre, valor in (encabezados or {}).items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _leer_json(self):
+        longitud = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(longitud).decode('utf-8'))
+
+    def log_message(self, format, *args):
+        pass # Sin ruido en consola por cada solicitud
+
+
+class ManejadorServidorVerificaciones(_ManejadorJson):
+    """Recibe lotes de verificaciones de las estaciones y los guarda en la base central."""
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/verificaciones":
+            self._responder_json(404, {'error': 'ruta no encontrada'})
+            return
+        try:
+            datos = self._leer_json()
+            estacion = str(datos['estacion'])
+            filas = [(
+                r['entry_date'], r['serial_number'], r['ot_number'], r['overall_status'],
+                r.get('ilrl_status'), r.get('ilrl_date'),
+                codificar_detalles(detalles_desde_dict(r.get('ilrl_details'))),
+                r.get('geo_status'), r.get('geo_date'),
+                codificar_detalles(detalles_desde_dict(r.get('geo_details'))),
+                estacion, int(r['id_origen'])
+            ) for r in datos['registros']]
+        except (ValueError, KeyError, TypeError) as e:
+            self._responder_json(400, {'error': f'lote inválido: {e}'})
+            return
+
+        conn = None
+        try:
+            conn = sqlite3.connect(self.server.db_path, timeout=30)
+            cursor = conn.cursor()
+            antes = conn.total_changes
+            # Un lote = una transacción; los reenvíos tras un corte se ignoran por (estacion, id_origen)
+            cursor.executemany("""
+                INSERT OR IGNORE INTO cable_verifications (
+                    entry_date, serial_number, ot_number, overall_status,
+                    ilrl_status, ilrl_date, ilrl_details_json,
+                    geo_status, geo_date, geo_details_json,
+                    estacion, id_origen
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, filas)
+            conn.commit()
+            self._responder_json(200, {'recibidos': len(filas), 'insertados': conn.total_changes - antes})
+        except sqlite3.Error as e:
+            self._responder_json(500, {'error': str(e)})
+        finally:
+            if conn:
+                conn.close()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path not in ("/estado", "/resumen"):
+            self._responder_json(404, {'error': 'ruta no encontrada'})
+            return
+        conn = None
+        try:
+            conn = sqlite3.connect(self.server.db_path, timeout=30)
+            if url.path == "/estado":
+                total = conn.execute("SELECT COUNT(*) FROM cable_verifications").fetchone()[0]
+                self._responder_json(200, {'ok': True, 'registros': total})
+                return
+            # Resumen de producción de la línea por estación y estado (por defecto, el día de hoy)
+            desde = parse_qs(url.query).get('desde', [datetime.now().strftime("%Y-%m-%d")])[0]
+            resumen = defaultdict(dict)
+            for estacion, estado, cantidad in conn.execute("""
+                SELECT estacion, overall_status, COUNT(*) FROM cable_verifications
+                WHERE entry_date >= ? GROUP BY estacion, overall_status
+            """, (desde,)):
+                resumen[estacion][estado] = cantidad
+            self._responder_json(200, {'desde': desde, 'estaciones': resumen})
+        except sqlite3.Error as e:
+            self._responder_json(500, {'error': str(e)})
+        finally:
+            if conn:
+                conn.close()
+
+
+def crear_servidor_verificaciones(db_path, host="0.0.0.0", puerto=PUERTO_SERVIDOR_DEFECTO):
+    """Crea (sin arrancar) el servidor de línea; puerto=0 elige uno libre, útil para pruebas."""
+    _inicializar_db_servidor(db_path)
+    servidor = http.server.ThreadingHTTPServer((host, puerto), ManejadorServidorVerificaciones)
+    servidor.daemon_threads = True
+    servidor.db_path = db_path
+    return servidor
+
+
+class ManejadorApiVerificacion(_ManejadorJson):
+    """
+    API local de verificación sobre el mismo motor (evaluar_cable) y las mismas cachés que la interfaz:
+      GET  /api/verificar?ot=...&serie=...     POST /api/verificar {"ot", "serie", "registrar"} (registrar solo por POST)
+      POST /api/verificar/lote {"ot", "series": [...], "registrar"}
+      GET  /api/estado/<serie>        último veredicto registrado
+      GET  /api/ot/<ot>/estado        último veredicto de cada serie de la OT
+      GET  /api/ot/<ot>/completitud   reporte de completitud (ILRL/Geometría por serie)
+      GET  /api/salud                 tiempos por ruta y estadísticas de caché
+    Cada respuesta lleva su duración (campo duracion_ms y encabezado X-Duracion-Ms).
+    """
+
+    def do_GET(self):
+        self._atender("GET")
+
+    def do_POST(self):
+        self._atender("POST")
+
+    def _atender(self, metodo):
+        inicio = time.perf_counter()
+        url = urlparse(self.path)
+        partes = [p for p in url.path.split('/') if p]
+        ruta = "/" + "/".join(partes[:2]) # Métrica por recurso (sin series ni OTs), salvo que el despacho la precise
+        if not self.server.cupos.acquire(blocking=False):
+            estado, datos = 503, {'error': 'API ocupada, reintente en unos segundos'}
+        else:
+            try:
+                ruta, estado, datos = self._despachar(metodo, partes, {k: v[0] for k, v in parse_qs(url.query).items()})
+            except (ValueError, KeyError, TypeError) as e:
+                estado, datos = 400, {'error': f'solicitud inválida: {e}'}
+            except TiempoAgotadoError:
+                estado, datos = 504, {'error': 'la verificación excedió el tiempo máximo'}
+            except sqlite3.Error as e:
+                estado, datos = 500, {'error': str(e)}
+            except OSError as e: # Carpeta de estación inaccesible (p. ej. raíz de Geometría caída)
+                estado, datos = 503, {'error': f'carpetas de estación no disponibles: {e}'}
+            except Exception as e: # Nunca cerrar la conexión sin respuesta
+                estado, datos = 500, {'error': f'error interno: {type(e).__name__}: {e}'}
+            finally:
+                self.server.cupos.release()
+
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+        self.server.registrar_tiempo(ruta, estado, duracion_ms)
+        datos['duracion_ms'] = round(duracion_ms, 1)
+        self._responder_json(estado, datos, {"X-Duracion-Ms": f"{duracion_ms:.1f}"})
+
+    def _despachar(self, metodo, partes, consulta):
+        """Retorna: (ruta para métricas, estado HTTP, datos)."""
+        app = self.server.app
+        if partes[:1] != ['api'] or len(partes) < 2:
+            return "/otra", 404, {'error': 'ruta no encontrada'}
+        recurso = partes[1:]
+
+        if metodo == "GET" and recurso == ['salud']:
+            return "/api/salud", 200, {'ok': True, 'rutas': self.server.resumen_tiempos(),
+                                       'cache': dict(app.estadisticas_cache)}
+
+        if recurso == ['verificar']:
+            datos = consulta if metodo == "GET" else self._leer_objeto_json()
+            registrar = str(datos.get('registrar', '')).lower() in ('1', 'true', 'si', 'sí')
+            if registrar and metodo == "GET":
+                return "/api/verificar", 405, {'error': 'para registrar la verificación use POST'}
+            estado, resultado = self._verificar_series(str(datos['ot']), [str(datos['serie'])], registrar)[0]
+            return "/api/verificar", estado, resultado
+
+        if metodo == "POST" and recurso == ['verificar', 'lote']:
+            datos = self._leer_objeto_json()
+            series = [str(s) for s in datos['series']]
+            if len(series) > MAX_LOTE_API:
+                return "/api/verificar/lote", 413, {'error': f'máximo {MAX_LOTE_API} series por lote'}
+            resultados = self._verificar_series(str(datos['ot']), series, bool(datos.get('registrar')))
+            return "/api/verificar/lote", 200, {'resultados': [r for _, r in resultados]}
+
+        if metodo == "GET" and len(recurso) == 2 and recurso[0] == 'estado':
+            ultimo = app.consultar_estado_actual(recurso[1])
+            if not ultimo:
+                return "/api/estado", 404, {'error': 'serie sin verificaciones registradas', 'serie': recurso[1]}
+            return "/api/estado", 200, ultimo
+
+        if metodo == "GET" and len(recurso) == 3 and recurso[0] == 'ot':
+            ot = recurso[1].upper()
+            if recurso[2] == 'estado':
+                return "/api/ot/estado", 200, {'ot': ot, 'series': app.consultar_estado_ot(ot)}
+            if recurso[2] == 'completitud':
+                reporte = self.server.pool.submit(app.generar_reporte_ot, ot).result(timeout=TIMEOUT_API_SEG)
+                return "/api/ot/completitud", 200, {
+                    'ot': ot, 'series': reporte,
+                    'completas': sum(1 for r in reporte if r['falta'] == "COMPLETO"), 'total': len(reporte)
+                }
+
+        return "/otra", 404, {'error': 'ruta no encontrada'}
+
+    def _leer_objeto_json(self):
+        datos = self._leer_json()
+        if not isinstance(datos, dict):
+            raise ValueError("el cuerpo debe ser un objeto JSON")
+        return datos
+
+    def _verificar_series(self, ot, series, registrar):
+        """
+        Verifica las series en el pool de la API. Si se agota el tiempo, las pendientes se cancelan y las que
+        sigan en curso ya no se registran: el cliente recibe 504 y la base no queda con registros a medias.
+        Retorna: [(estado HTTP, datos)] en el orden de las series.
+        """
+        control = {'lock': threading.Lock(), 'vigente': True}
+        futuros = [self.server.pool.submit(self._verificar_en_pool, ot, serie, registrar, control) for serie in series]
+        try:
+            return [f.result(timeout=TIMEOUT_API_SEG) for f in futuros]
+        except TiempoAgotadoError:
+            with control['lock']:
+                control['vigente'] = False
+            for f in futuros:
+                f.cancel()
+            raise
+
+    def _verificar_en_pool(self, ot, serie, registrar, control):
+        """Verifica una serie en el pool de la API. Retorna: (estado HTTP, datos)."""
+        app = self.server.app
+        ot, serie = ot.strip().upper(), serie.strip()
+        error = app._validar_ot_serie(ot, serie)
+        if error:
+            return 400, {'ot': ot, 'serie': serie, 'error': error[1], 'codigo': error[0]}
+        resultado = app.evaluar_cable(ot, serie)
+        if registrar:
+            with control['lock']: # Tras un 504 la solicitud ya no es vigente: no se registra
+                registrar = control['vigente']
+                if registrar:
+                    app._registrar_evaluacion(resultado)
+        fecha_geo = resultado['fecha_geo']
+        return 200, {
+            'ot': ot,
+            'serie': serie,
+            'estado_general': resultado['estado_general'],
+            'registrado': registrar,
+            'ilrl': {
+                'estado': resultado['resultado_ilrl'],
+                'fecha': resultado['fecha_ilrl'],
+                'detalles': detalles_a_dict(resultado['ilrl_detalles'])
+            },
+            'geometria': {
+                'estado': resultado['resultado_geo'],
+                'fecha': fecha_geo.strftime(FECHA_DETALLE_GEO) if fecha_geo else None,
+                'detalles': detalles_a_dict(resultado['geo_detalles'])
+            }
+        }
+
+
+class ServidorApiVerificacion(http.server.ThreadingHTTPServer):
+    """Servidor de la API: un hilo por conexión, pero las verificaciones pasan por un pool acotado."""
+    daemon_threads = True
+
+    def __init__(self, direccion, app):
+        super().__init__(direccion, ManejadorApiVerificacion)
+        self.app = app
+        self.pool = ThreadPoolExecutor(max_workers=HILOS_API, thread_name_prefix="api")
+        self.cupos = threading.BoundedSemaphore(MAX_PENDIENTES_API)
+        self._tiempos = defaultdict(lambda: {'solicitudes': 0, 'errores': 0, 'ms_total': 0.0, 'ms_max': 0.0})
+        self._lock_tiempos = threading.Lock()
+
+    def registrar_tiempo(self, ruta, estado, duracion_ms):
+        with self._lock_tiempos:
+            t = self._tiempos[ruta]
+            t['solicitudes'] += 1
+            t['errores'] += estado >= 400
+            t['ms_total'] += duracion_ms
+            t['ms_max'] = max(t['ms_max'], duracion_ms)
+
+    def resumen_tiempos(self):
+        with self._lock_tiempos:
+            return {ruta: {'solicitudes': t['solicitudes'], 'errores': t['errores'],
+                           'ms_promedio': round(t['ms_total'] / t['solicitudes'], 1), 'ms_max': round(t['ms_max'], 1)}
+                    for ruta, t in self._tiempos.items()}
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False)
+
+
+def crear_api_verificacion(app, host="127.0.0.1", puerto=PUERTO_API_DEFECTO):
+    """Crea (sin arrancar) la API de verificación sobre una instancia de VerificadorCables; puerto=0 elige uno libre."""
+    return ServidorApiVerificacion((host, puerto), app)
+
+
+_app_importacion = None # Instancia sin interfaz de cada proceso del pool de importación
+
+
+def _iniciar_proceso_importacion(db_name, cache_compartida):
+    """Inicializador de los procesos de importación: una instancia por proceso para usar sus lectores."""
+    global _app_importacion
+    _app_importacion = VerificadorCables(interactivo=False, db_name=db_name, cargar_configuracion=False)
+    _app_importacion.cache_compartida = cache_compartida
+
+
+def _fecha_iso(texto, formato):
+    """Fecha de un detalle ('dd/mm/aaaa ...') en formato ISO para poder filtrar por rango en SQL, o None."""
+    try:
+        return datetime.strptime(texto, formato).strftime("%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return None
+
+
+def _interpretar_para_importacion(tarea):
+    """
+    Interpreta un archivo del histórico en un proceso del pool. tarea: (tipo, ruta, ot, retrabajo, firma).
+    Retorna: dict con tipo, ruta, firma y las filas de mediciones listas para executemany.
+    """
+    tipo, ruta, ot, retrabajo, firma = tarea
+    mediciones = []
+    if tipo == 'ilrl':
+        _, _, puntas = _app_importacion.leer_resultado_ilrl(ruta)
+        clave = _app_importacion.extraer_clave_ilrl(ruta) # "<OT numérica>-<terminación>" = la serie del cable
+        serie = clave.replace('-', '') if clave else None
+        for p in puntas or ():
+            mediciones.append((ruta, ot, serie, p.linea, p.resultado, _fecha_iso(p.fecha, FECHA_DETALLE_ILRL),
+                               p.tipo_archivo, retrabajo))
+    else:
+        _, _, detalles = _app_importacion.leer_resultado_geo(ruta)
+        for serie, puntas in (detalles or {}).items():
+            for m in puntas:
+                mediciones.append((ruta, serie, m.punta, m.resultado, _fecha_iso(m.timestamp, FECHA_DETALLE_GEO)))
+    return {'tipo': tipo, 'ruta': ruta, 'firma': firma, 'mediciones': mediciones}
+
+
+def _percentiles(valores):
+    """p50/p90/p99/máximo (en ms) de una lista de duraciones en segundos."""
+    if not valores:
+        return {'p50': None, 'p90': None, 'p99': None, 'max': None}
+    ordenados = sorted(valores)
+    def p(q):
+        return round(ordenados[min(len(ordenados) - 1, int(q * len(ordenados)))] * 1000, 1)
+    return {'p50': p(0.50), 'p90': p(0.90), 'p99': p(0.99), 'max': round(ordenados[-1] * 1000, 1)}
+
+
+def _leer_historial(db_path, desde=None, hasta=None, limite=None):
+    """
+    Secuencia de escaneos registrada: [(fecha, OT, serie, estado ILRL, estado Geometría)] ordenada por fecha.
+    Sin rango, toma las últimas HORAS_TURNO_REPRODUCCION horas del historial.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        if not desde:
+            ultima = conn.execute("SELECT MAX(entry_date) FROM cable_verifications").fetchone()[0]
+            if not ultima:
+                return []
+            desde = (datetime.strptime(ultima, "%Y-%m-%d %H:%M:%S") - timedelta(hours=HORAS_TURNO_REPRODUCCION)).strftime("%Y-%m-%d %H:%M:%S")
+        sql = """SELECT entry_date, ot_number, serial_number, ilrl_status, geo_status FROM cable_verifications
+                 WHERE entry_date >= ?""" + (" AND entry_date <= ?" if hasta else "") + " ORDER BY entry_date, id"
+        parametros = [desde] + ([f"{hasta} 23:59:59" if len(hasta) == 10 else hasta] if hasta else [])
+        if limite:
+            sql += " LIMIT ?"
+            parametros.append(limite)
+        return [(datetime.strptime(f[0], "%Y-%m-%d %H:%M:%S"), *f[1:]) for f in conn.execute(sql, parametros)]
+    finally:
+        conn.close()
+
+
+def _generar_libros_sinteticos(historial, ruta_ilrl, ruta_geo):
+    """
+    Crea libros con el diseño de las estaciones para cada serie del historial: un archivo ILRL por serie
+    (<OT>/JMO-<9 primeros dígitos de la serie>-LC-<terminación>.xlsx, el nombre que reconoce extraer_clave_ilrl
+    aunque la OT se haya escaneado sin prefijo) y un libro de Geometría por OT. Reproducen el veredicto registrado:
+    RECHAZADO -> una punta FAIL, NO ENCONTRADO -> sin datos de esa prueba.
+    """
+    from openpyxl import Workbook # Solo se necesita para generar los libros
+    encabezado = [[f"Encabezado {i + 1}"] for i in range(FILAS_ENCABEZADO)]
+    inicio = datetime(2025, 1, 1, 8, 0)
+    series_por_ot = defaultdict(dict)
+    for _, ot, serie, ilrl, geo in historial:
+        series_por_ot[ot][serie] = (ilrl, geo) # Queda el último veredicto de cada serie
+
+    for ot, series in series_por_ot.items():
+        os.makedirs(os.path.join(ruta_ilrl, ot), exist_ok=True)
+        libro_geo = Workbook(write_only=True)
+        hoja_geo = libro_geo.create_sheet()
+        for fila in encabezado:
+            hoja_geo.append(fila)
+        for serie, (ilrl, geo) in series.items():
+            if ilrl != "NO ENCONTRADO":
+                libro = Workbook(write_only=True)
+                hoja = libro.create_sheet()
+                for fila in encabezado:
+                    hoja.append(fila)
+                for punta in range(4):
+                    resultado = "FAIL" if ilrl == "RECHAZADO" and punta == 3 else "PASS"
+                    hoja.append([punta + 1, None, None, None, None, None, None, None, resultado, None,
+                                 inicio + timedelta(minutes=punta)])
+                libro.save(os.path.join(ruta_ilrl, ot, f"JMO-{serie[:9]}-LC-{serie[-4:]}.xlsx"))
+            if geo != "NO ENCONTRADO":
+                for punta in range(4):
+                    resultado = "FAIL" if geo == "RECHAZADO" and punta == 3 else "PASS"
+                    hoja_geo.append([f"JMO-{serie}-{punta + 1}", None, None, inicio,
+                                     (inicio + timedelta(minutes=punta)).time(), None, resultado])
+        libro_geo.save(os.path.join(ruta_geo, f"{ot} SIMULACION.xlsx"))
+
+
+def reproducir_turno(db_historial, velocidad=1.0, desde=None, hasta=None, limite=None,
+                     ruta_ilrl=None, ruta_geo=None, hilos=HILOS_COLA_ESCANEO, directorio=None):
+    """
+    Reproduce la secuencia de escaneos del historial contra el motor de verificación, respetando los intervalos
+    originales divididos por `velocidad` (None = lo más rápido posible). Cada escaneo se evalúa y se registra,
+    como en el modo cola, en una base descartable dentro de `directorio` (la base de producción no se toca).
+    Sin ruta_ilrl/ruta_geo (copias de las carpetas reales) se generan libros sintéticos.
+    Cada veredicto reproducido se compara con el registrado (con libros sintéticos, con el último de la serie,
+    que es el que reproducen): las discrepancias delatan diferencias entre el motor y el historial.
+    Retorna: dict con rendimiento, latencias por etapa, discrepancias, estadísticas de caché y de escritura en la base.
+    """
+    historial = _leer_historial(db_historial, desde, hasta, limite)
+    if not historial:
+        raise ValueError("No hay escaneos en el historial para el período indicado")
+
+    directorio = directorio or tempfile.mkdtemp(prefix="reproduccion_turno_")
+    app = VerificadorCables(interactivo=False, db_name=os.path.join(directorio, "reproduccion.db"), cargar_configuracion=False)
+    ultimo_por_serie = {(ot, serie): (ilrl, geo) for _, ot, serie, ilrl, geo in historial}
+    if ruta_ilrl and ruta_geo:
+        app.ruta_base_ilrl, app.ruta_base_geo = ruta_ilrl, ruta_geo
+        ultimo_por_serie = None # Libros reales: cada escaneo se compara con su propio registro
+    else:
+        app.ruta_base_ilrl, app.ruta_base_geo = os.path.join(directorio, "ilrl"), os.path.join(directorio, "geo")
+        os.makedirs(app.ruta_base_geo, exist_ok=True)
+        _generar_libros_sinteticos(historial, app.ruta_base_ilrl, app.ruta_base_geo)
+
+    tiempos = defaultdict(list) # etapa -> [segundos]
+    discrepancias = []
+    lock = threading.Lock()
+    primera = historial[0][0]
+
+    def escanear(ot, serie, programado, esperado):
+        inicio = time.perf_counter()
+        resultado = app.evaluar_cable(ot, serie)
+        evaluado = time.perf_counter()
+        app._registrar_evaluacion(resultado)
+        fin = time.perf_counter()
+        obtenido = (resultado['resultado_ilrl'], resultado['resultado_geo'])
+        with lock:
+            if obtenido != esperado:
+                discrepancias.append({'ot': ot, 'serie': serie, 'registrado': "/".join(esperado),
+                                      'reproducido': "/".join(obtenido)})
+            tiempos['espera'].append(inicio - programado)
+            tiempos['evaluacion'].append(evaluado - inicio)
+            tiempos['registro'].append(fin - evaluado)
+            tiempos['total'].append(fin - programado)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="reproduccion") as pool:
+        for fecha, ot, serie, ilrl, geo in historial:
+            programado = t0 + ((fecha - primera).total_seconds() / velocidad if velocidad else 0)
+            demora = programado - time.perf_counter()
+            if demora > 0:
+                time.sleep(demora)
+            esperado = ultimo_por_serie[(ot, serie)] if ultimo_por_serie else (ilrl, geo)
+            pool.submit(escanear, ot, serie, max(programado, t0), esperado)
+    duracion = time.perf_counter() - t0
+
+    conn = sqlite3.connect(app.db_name)
+    try:
+        registrados = conn.execute("SELECT COUNT(*) FROM cable_verifications").fetchone()[0]
+    finally:
+        conn.close()
+
+    cache = dict(app.estadisticas_cache)
+    def tasa(prefijo):
+        aciertos, fallos = cache.get(f"{prefijo}_aciertos", 0), cache.get(f"{prefijo}_fallos", 0)
+        return round(aciertos / (aciertos + fallos), 3) if aciertos + fallos else None
+
+    return {
+        'escaneos': len(historial),
+        'periodo_original_seg': round((historial[-1][0] - primera).total_seconds(), 1),
+        'duracion_seg': round(duracion, 2),
+        'escaneos_por_minuto': round(len(historial) / duracion * 60, 1) if duracion else None,
+        'latencia_ms': {etapa: _percentiles(valores) for etapa, valores in tiempos.items()},
+        'discrepancias': {'total': len(discrepancias), 'ejemplos': discrepancias[:20]},
+        'cache': cache,
+        'tasa_aciertos': {'indice_ilrl': tasa('ilrl_indice'), 'geo_ot': tasa('geo_ot'), 'geo_libro': tasa('geo_libro')},
+        'base': {'registrados': registrados, 'fallidos': len(historial) - registrados,
+                 'escritura_ms': _percentiles(tiempos['registro'])},
+        'directorio': directorio
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sistema de Verificación de Cables")
+    subparsers = parser.add_subparsers(dest="comando")
+
+    p_servidor = subparsers.add_parser("servidor", help="Ejecuta el servidor de verificaciones compartido de la línea")
+    p_servidor.add_argument("--db", default="verificaciones_linea.db", help="Base SQLite central")
+    p_servidor.add_argument("--host", default="0.0.0.0")
+    p_servidor.add_argument("--puerto", type=int, default=PUERTO_SERVIDOR_DEFECTO)
+
+    p_exportar = subparsers.add_parser("exportar", help="Exporta los registros a CSV, XLSX o JSON Lines")
+    p_exportar.add_argument("salida", help="Archivo de salida (.csv, .xlsx o .jsonl)")
+    p_exportar.add_argument("--formato", choices=FORMATOS_EXPORTACION, help="Por defecto, según la extensión")
+    p_exportar.add_argument("--desde", help="Fecha inicial AAAA-MM-DD (inclusive)")
+    p_exportar.add_argument("--hasta", help="Fecha final AAAA-MM-DD (inclusive)")
+    p_exportar.add_argument("--ot", help="Solo registros de esta OT")
+    p_exportar.add_argument("--db", help="Base de datos a exportar (por defecto, la de la aplicación)")
+    p_exportar.add_argument("--incluir-archivo", action="store_true", help="Incluye las bases mensuales del archivo histórico")
+
+    p_archivar = subparsers.add_parser("archivar", help="Mueve los registros antiguos al archivo histórico mensual")
+    p_archivar.add_argument("--meses", type=int, required=True, help="Meses completos a conservar en la base activa (incluye el actual)")
+    p_archivar.add_argument("--db", help="Base de datos a archivar (por defecto, la de la aplicación)")
+
+    p_api = subparsers.add_parser("api", help="Ejecuta la API HTTP de verificación (sin interfaz)")
+    p_api.add_argument("--host", default="127.0.0.1")
+    p_api.add_argument("--puerto", type=int, default=PUERTO_API_DEFECTO)
+    p_api.add_argument("--db", help="Base de datos de la aplicación (por defecto, la de la aplicación)")
+
+    p_reproducir = subparsers.add_parser("reproducir-turno", help="Reproduce un turno del historial como prueba de carga")
+    p_reproducir.add_argument("--velocidad", default="10", help="Factor de velocidad (1, 10, ...) o 'max' (sin esperas)")
+    p_reproducir.add_argument("--desde", help="Inicio AAAA-MM-DD [HH:MM:SS] (por defecto, las últimas 8 horas del historial)")
+    p_reproducir.add_argument("--hasta", help="Fin AAAA-MM-DD [HH:MM:SS]")
+    p_reproducir.add_argument("--limite", type=int, help="Máximo de escaneos a reproducir")
+    p_reproducir.add_argument("--ruta-ilrl", help="Copia de la carpeta ILRL (por defecto, libros sintéticos)")
+    p_reproducir.add_argument("--ruta-geo", help="Copia de la carpeta de Geometría (por defecto, libros sintéticos)")
+    p_reproducir.add_argument("--hilos", type=int, default=HILOS_COLA_ESCANEO, help="Escaneos procesados en paralelo")
+    p_reproducir.add_argument("--directorio", help="Carpeta de trabajo (por defecto, una temporal)")
+    p_reproducir.add_argument("--db", help="Base con el historial (por defecto, la de la aplicación)")
+
+    p_importar = subparsers.add_parser("importar-historico", help="Carga en la base las mediciones de todos los libros históricos")
+    p_importar.add_argument("--procesos", type=int, help="Procesos en paralelo (por defecto, uno por núcleo)")
+    p_importar.add_argument("--solo", choices=("ilrl", "geo"), help="Importar solo una de las fuentes")
+    p_importar.add_argument("--db", help="Base de datos destino (por defecto, la de la aplicación)")
+
+    p_reevaluar = subparsers.add_parser("reevaluar", help="Recalcula los veredictos guardados con las reglas actuales")
+    p_reevaluar.add_argument("--simular", action="store_true", help="Solo informa cuántos veredictos cambiarían")
+    p_reevaluar.add_argument("--db", help="Base de datos a reevaluar (por defecto, la de la aplicación)")
+
+    args = parser.parse_args(argv)
+
+    if args.comando == "servidor":
+        servidor = crear_servidor_verificaciones(args.db, args.host, args.puerto)
+        print(f"Servidor de verificaciones escuchando en {args.host}:{servidor.server_address[1]} (DB: {os.path.abspath(args.db)})")
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.server_close()
+        return
+
+    if args.comando == "exportar":
+        app = VerificadorCables(interactivo=False, db_name=args.db)
+        total = app.exportar_registros(args.salida, args.formato, args.desde, args.hasta, args.ot, args.incluir_archivo)
+        print(f"Se exportaron {total} registros a {os.path.abspath(args.salida)}")
+        return
+
+    if args.comando == "archivar":
+        app = VerificadorCables(interactivo=False, db_name=args.db)
+        archivados = app.archivar_registros(args.meses, convertir_base=True)
+        for mes, cantidad in archivados.items():
+            print(f"{mes}: {cantidad} registros archivados")
+        print(f"Total: {sum(archivados.values())} registros en {app.carpeta_archivo}")
+        return
+
+    if args.comando == "api":
+        app = VerificadorCables(interactivo=False, db_name=args.db)
+        servidor = crear_api_verificacion(app, args.host, args.puerto)
+        app._iniciar_metricas() # Solo si hay archivo de métricas configurado
+        app._precalentar_al_inicio()
+        print(f"API de verificación escuchando en http://{args.host}:{servidor.server_address[1]}/api/")
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.server_close()
+        return
+
+    if args.comando == "reproducir-turno":
+        db_historial = VerificadorCables(interactivo=False, db_name=args.db, cargar_configuracion=False).db_name
+        velocidad = None if args.velocidad.lower() == "max" else float(args.velocidad)
+        reporte = reproducir_turno(db_historial, velocidad, args.desde, args.hasta, args.limite,
+                                   args.ruta_ilrl, args.ruta_geo, args.hilos, args.directorio)
+        print(f"Escaneos: {reporte['escaneos']} (período original {reporte['periodo_original_seg']} s, "
+              f"reproducido en {reporte['duracion_seg']} s a velocidad {args.velocidad})")
+        print(f"Rendimiento: {reporte['escaneos_por_minuto']} escaneos/min")
+        for etapa, p in reporte['latencia_ms'].items():
+            print(f"  {etapa:<11} p50 {p['p50']} ms  p90 {p['p90']} ms  p99 {p['p99']} ms  máx {p['max']} ms")
+        print(f"Tasa de aciertos de caché: {reporte['tasa_aciertos']}")
+        print(f"Veredictos distintos al registrado (ILRL/Geometría): {reporte['discrepancias']['total']}")
+        for d in reporte['discrepancias']['ejemplos']:
+            print(f"  {d['ot']} {d['serie']}: registrado {d['registrado']}, reproducido {d['reproducido']}")
+        print(f"Base: {reporte['base']['registrados']} registrados, {reporte['base']['fallidos']} fallidos")
+        print(f"Carpeta de trabajo: {reporte['directorio']}")
+        return
+
+    if args.comando == "importar-historico":
+        app = VerificadorCables(interactivo=False, db_name=args.db)
+        inicio = time.perf_counter()
+        resumen = app.importar_historico(args.procesos, (args.solo,) if args.solo else ('ilrl', 'geo'),
+                                         progreso=lambda hechos, total: print(f"  {hechos}/{total} archivos"))
+        print(f"Archivos encontrados: {resumen['archivos']} (ya importados: {resumen['omitidos']})")
+        print(f"Importados: {resumen['importados']}, sin datos legibles: {resumen['sin_datos']}")
+        print(f"Mediciones cargadas: {resumen['mediciones']} en {time.perf_counter() - inicio:.1f} s")
+        return
+
+    if args.comando == "reevaluar":
+        app = VerificadorCables(interactivo=False, db_name=args.db)
+        resumen = app.reevaluar_registros(simular=args.simular)
+        print(f"Registros revisados: {resumen['revisados']}")
+        print(f"Veredictos {'que cambiarían' if args.simular else 'cambiados'}: {resumen['cambiados']}")
+        for (anterior, nuevo), cantidad in sorted(resumen['transiciones'].items()):
+            print(f"  {anterior} -> {nuevo}: {cantidad}")
+        return
+
     app = VerificadorCables()
     app.create_main_window()
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support() # Ejecutable de PyInstaller: los procesos de importación no vuelven a abrir la app
+    main()